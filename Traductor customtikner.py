@@ -1,16 +1,35 @@
 import customtkinter as ctk
 from tkinter import ttk, filedialog, messagebox
 import tkinter as tk
+import tkinter.font as tkfont
 import os
 import xml.etree.ElementTree as ET
-import threading
-from deep_translator import GoogleTranslator
 import re
-import time
 import shutil
 import sys
 import json
 from datetime import datetime
+from traductor.motor import HILOS_POR_DEFECTO, crear_motor
+from traductor.enrutador import crear_backends
+from traductor.limitador import configurar_limitador
+from traductor.cache import CacheTraducciones
+from traductor.idiomas import idioma_destino_carpeta, nombre_legible_idioma
+from traductor.extraccion import guardar_traducciones_xml
+from traductor.escaneo import (escanear_idioma, describir_proyecto, actualizar_archivo_proyecto,
+                               encontrar_carpeta_languages, listar_idiomas, archivos_idioma)
+from traductor.pipeline import traducir_textos
+from traductor.resiliencia import describir_estadisticas
+from traductor.placeholders import PATRON_PLACEHOLDER
+from traductor.indice import abrir_indice, leer_por_bloques
+from traductor.modelo import ModeloTextos, filas_de_registros
+from traductor.tabla_virtual import TablaVirtual
+from traductor.busqueda import (IndiceBusqueda, buscar_en_proyecto, titulo_grupo, resumir_resultados,
+                                describir_error_busqueda)
+from traductor.cola_ui import ColaUI, en_hilo_principal
+from traductor.trabajos import GestorTrabajos, trabajo_actual, filas_panel, COLUMNAS_PANEL
+
+INTERVALO_PANEL_TRABAJOS_MS = 500
+RETARDO_BUSQUEDA_MS = 150  # Espera tras la última tecla antes de filtrar
 
 try:
     from PIL import Image, ImageTk, ImageDraw, ImageFont
@@ -41,14 +60,28 @@ class EditorTematico:
         self.archivo_actual = ""
         self.textos_actuales = []
         self.traducciones = {}
+        self.modelo_proyecto = None  # Resumen por archivo de la carpeta de idioma
+        self.indice_proyecto = None  # Índice persistente del mod abierto
+        self._filtro_programado = None
+        self._id_pendiente = None  # Fila a seleccionar cuando termine de cargarse el archivo
+        
+        # Los hilos de trabajo actualizan la interfaz solo a través de esta cola
+        self.cola_ui = ColaUI(self.ventana, self._aplicar_fila, self._mostrar_status,
+                              generacion_actual=lambda: self.modelo_textos.generacion)
+        self.gestor_trabajos = GestorTrabajos()
         
         # Variables para edición
         self.celda_editando = None
         self.entry_edicion = None
         
         # Variables para cache
-        self.cache_traducciones = {}
-        self.cache_placeholders = {}
+        self.cargar_cache_traducciones()
+        
+        # Variables para traducción concurrente
+        self.hilos_traduccion = HILOS_POR_DEFECTO
+        self.servicios = []  # [{'servicio', 'url', 'api_key'...}]; vacío, Google
+        self.motor_traduccion = self._crear_motor_traduccion()
+        self.limites_tasa = {}  # servicio -> [peticiones/s, ráfaga]
         
         # Lista de idiomas actual
         self.lista_idiomas_actual = []
@@ -65,8 +98,15 @@ class EditorTematico:
         
         # Cargar configuración DESPUÉS de crear la interfaz
         self.cargar_configuracion()
-        self.cargar_cache_traducciones()
     
+    def _crear_motor_traduccion(self):
+        """Motor con los servicios de config.json ('servicios'), repartiendo si hay varios; si no, Google"""
+        try:
+            return crear_motor(crear_backends(self.servicios), max_hilos=self.hilos_traduccion)
+        except Exception as e:
+            print(f"Servicios de traducción no válidos en la configuración: {e}")
+            return crear_motor(max_hilos=self.hilos_traduccion)
+
     def configurar_ventana_principal(self):
         """Configura el tamaño y posición de la ventana principal de forma segura"""
         try:
@@ -267,7 +307,7 @@ class EditorTematico:
                                     width=200,
                                     placeholder_text="Buscar textos...")
         self.entry_buscar.grid(row=2, column=4, padx=(0, 15), pady=3, sticky='w')
-        self.entry_buscar.bind('<KeyRelease>', self.filtrar_textos)
+        self.entry_buscar.bind('<KeyRelease>', self._programar_filtro)
         
         # Botones de acción
         frame_botones_fila1 = ctk.CTkFrame(self.frame_superior, fg_color="transparent")
@@ -299,7 +339,15 @@ class EditorTematico:
         self.btn_editar_about = ctk.CTkButton(frame_botones_fila2, text="EDITAR ABOUT", 
                                 command=self.editar_about, width=120,
                                 fg_color='#f39c12', hover_color='#e08e0b')
-        self.btn_editar_about.pack(side='left')
+        self.btn_editar_about.pack(side='left', padx=(0, 5))
+        
+        self.btn_buscar_mod = ctk.CTkButton(frame_botones_fila2, text="BUSCAR EN MOD", 
+                                command=self.buscar_en_mod, width=120)
+        self.btn_buscar_mod.pack(side='left', padx=(0, 5))
+        
+        self.btn_trabajos = ctk.CTkButton(frame_botones_fila2, text="TRABAJOS", 
+                                command=self.mostrar_trabajos, width=100)
+        self.btn_trabajos.pack(side='left')
         
         # Fila 3: Filtros
         self.crear_filtros_busqueda()
@@ -312,12 +360,16 @@ class EditorTematico:
         
         self.actualizar_estilo_tabla()
         
-        # Crear Treeview
-        self.tree_textos = ttk.Treeview(frame_tabla, 
-                                      columns=('id', 'original', 'traducido', 'estado'), 
-                                      show='headings',
-                                      style="Tema.Treeview",
-                                      selectmode='extended')
+        # Crear Treeview; es virtual: solo se materializan las filas visibles del modelo
+        self.modelo_textos = ModeloTextos()
+        self.indice_busqueda = IndiceBusqueda(self.modelo_textos)
+        self.tree_textos = TablaVirtual(ttk.Treeview(frame_tabla, 
+                                                     columns=('id', 'original', 'traducido', 'estado'), 
+                                                     show='headings',
+                                                     style="Tema.Treeview",
+                                                     selectmode='extended'),
+                                        self.modelo_textos,
+                                        etiquetas_fila=lambda posicion: ('even',) if posicion % 2 == 0 else ('odd',))
         
         # Configurar columnas
         self.tree_textos.heading('id', text='ID', anchor='w')
@@ -463,36 +515,27 @@ class EditorTematico:
         )
 
     def guardar_cache_traducciones(self):
-        """Guarda el cache de traducciones en un archivo"""
+        """Escribe en disco solo las traducciones nuevas del cache"""
         try:
-            cache_dir = os.path.join(os.path.expanduser("~"), ".rimworld_editor")
-            os.makedirs(cache_dir, exist_ok=True)
-            
-            cache_file = os.path.join(cache_dir, "cache_traducciones.json")
-            
-            # Limpiar cache viejo (más de 1000 entradas)
-            if len(self.cache_traducciones) > 1000:
-                items = list(self.cache_traducciones.items())[-800:]
-                self.cache_traducciones = dict(items)
-            
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump({
-                    'traducciones': self.cache_traducciones,
-                    'placeholders': self.cache_placeholders,
-                    'timestamp': datetime.now().isoformat()
-                }, f, ensure_ascii=False, indent=2)
+            self.cache_traducciones.guardar()
         except Exception as e:
             print(f"Error guardando cache: {e}")
 
     def cargar_cache_traducciones(self):
-        """Carga el cache de traducciones desde archivo"""
+        """Abre el cache de traducciones e importa el antiguo JSON si existe"""
+        cache_dir = os.path.join(os.path.expanduser("~"), ".rimworld_editor")
+        try:
+            self.cache_traducciones = CacheTraducciones(os.path.join(cache_dir, "cache_traducciones.sqlite3"))
+        except Exception as e:
+            print(f"Error abriendo cache: {e}")
+            # Sin el archivo se sigue traduciendo con un cache que solo dura la sesión
+            self.cache_traducciones = CacheTraducciones(':memory:')
+            return
+        
         try:
-            cache_file = os.path.join(os.path.expanduser("~"), ".rimworld_editor", "cache_traducciones.json")
-            if os.path.exists(cache_file):
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    cache_data = json.load(f)
-                    self.cache_traducciones = cache_data.get('traducciones', {})
-                    self.cache_placeholders = cache_data.get('placeholders', {})
+            cache_json = os.path.join(cache_dir, "cache_traducciones.json")
+            if os.path.exists(cache_json):
+                self.cache_traducciones.migrar_json(cache_json)
         except Exception as e:
             print(f"Error cargando cache: {e}")
 
@@ -506,6 +549,9 @@ class EditorTematico:
             config = {
                 'tema_oscuro': self.tema_oscuro,
                 'carpeta_mod_reciente': self.carpeta_mod if self.carpeta_mod else "",
+                'hilos_traduccion': self.hilos_traduccion,
+                'limites_tasa': self.limites_tasa,
+                'servicios': self.servicios,
                 'timestamp': datetime.now().isoformat()
             }
             
@@ -522,13 +568,25 @@ class EditorTematico:
                 with open(config_file, 'r', encoding='utf-8') as f:
                     config = json.load(f)
                     self.tema_oscuro = config.get('tema_oscuro', True)
+                    self.hilos_traduccion = config.get('hilos_traduccion', HILOS_POR_DEFECTO)
+                    
+                    # Ajustar los limitadores a la cuota de cada proveedor
+                    self.limites_tasa = config.get('limites_tasa', {})
+                    for servicio, (tasa, rafaga) in self.limites_tasa.items():
+                        configurar_limitador(servicio, tasa, rafaga)
+                    
+                    # Servicios entre los que repartir la traducción
+                    self.servicios = config.get('servicios', [])
+                    if self.servicios:
+                        self.motor_traduccion.cerrar()
+                        self.motor_traduccion = self._crear_motor_traduccion()
                     carpeta_reciente = config.get('carpeta_mod_reciente', "")
                     
                     if carpeta_reciente and os.path.exists(carpeta_reciente):
                         self.carpeta_mod = carpeta_reciente
                         if hasattr(self, 'entry_ruta'):  # ✅ VERIFICAR QUE EXISTE
                             self.entry_ruta.insert(0, carpeta_reciente)
-                            threading.Thread(target=self._cargar_idiomas, daemon=True).start()
+                            self.gestor_trabajos.lanzar('idiomas', "Cargar idiomas del mod", self._cargar_idiomas)
                         
         except Exception as e:
             print(f"Error cargando configuración: {e}")
@@ -543,7 +601,7 @@ class EditorTematico:
             self.entry_ruta.insert(0, carpeta)
             self.actualizar_status("Cargando idiomas...")
             self.guardar_configuracion()
-            threading.Thread(target=self._cargar_idiomas, daemon=True).start()
+            self.gestor_trabajos.lanzar('idiomas', "Cargar idiomas del mod", self._cargar_idiomas)
 
     def limpiar_datos_anteriores(self):
         """Limpia todos los datos del mod anterior"""
@@ -553,6 +611,7 @@ class EditorTematico:
         self.textos_actuales = []
         self.traducciones = {}
         self.lista_idiomas_actual = []
+        self.modelo_proyecto = None
         
         # Limpiar comboboxes
         if hasattr(self, 'combo_idiomas'):
@@ -566,9 +625,18 @@ class EditorTematico:
         self._limpiar_tabla()
 
     def actualizar_status(self, mensaje):
-        """Actualiza la barra de estado"""
+        """Actualiza la barra de estado; desde un hilo de trabajo pasa por la cola de la interfaz"""
+        if en_hilo_principal():
+            self._mostrar_status(mensaje)
+        else:
+            self.cola_ui.estado(mensaje)
+
+    def _mostrar_status(self, mensaje):
         self.status_bar.configure(text=mensaje)
 
+    def _aplicar_fila(self, item, valores, generacion=None):
+        self.tree_textos.item(item, values=valores, generacion=generacion)
+
     def recargar_idiomas(self):
         """Recarga la lista de idiomas manualmente"""
         if not self.carpeta_mod:
@@ -576,7 +644,7 @@ class EditorTematico:
             return
         
         self.actualizar_status("Recargando idiomas...")
-        threading.Thread(target=self._cargar_idiomas, daemon=True).start()
+        self.gestor_trabajos.lanzar('idiomas', "Cargar idiomas del mod", self._cargar_idiomas)
 
     def _cargar_idiomas(self):
         """Carga automáticamente los idiomas de forma más inteligente"""
@@ -588,81 +656,28 @@ class EditorTematico:
             carpeta_languages = self._encontrar_carpeta_languages()
             
             if not carpeta_languages:
-                self.ventana.after(0, lambda: self.actualizar_status("No se encontró carpeta 'Languages'"))
+                self.actualizar_status("No se encontró carpeta 'Languages'")
                 return
 
             # Buscar idiomas
-            idiomas_encontrados = []
             try:
-                for item in os.listdir(carpeta_languages):
-                    ruta_item = os.path.join(carpeta_languages, item)
-                    if os.path.isdir(ruta_item) and self._tiene_archivos_xml(ruta_item):
-                        nombre_legible = self._obtener_nombre_legible_idioma(item)
-                        idiomas_encontrados.append({
-                            'carpeta': item,
-                            'ruta': ruta_item,
-                            'nombre_legible': nombre_legible
-                        })
+                idiomas_encontrados = [{
+                    'carpeta': item,
+                    'ruta': os.path.join(carpeta_languages, item),
+                    'nombre_legible': nombre_legible_idioma(item)
+                } for item in listar_idiomas(carpeta_languages)]
             except Exception as e:
-                self.ventana.after(0, lambda: self.actualizar_status(f"Error escaneando idiomas: {str(e)}"))
+                self.actualizar_status(f"Error escaneando idiomas: {str(e)}")
                 return
             
-            self.ventana.after(0, self._actualizar_combobox_idiomas, idiomas_encontrados)
+            self.cola_ui.llamar(self._actualizar_combobox_idiomas, idiomas_encontrados)
             
         except Exception as e:
-            self.ventana.after(0, lambda: self.actualizar_status(f"Error cargando idiomas: {str(e)}"))
+            self.actualizar_status(f"Error cargando idiomas: {str(e)}")
 
     def _encontrar_carpeta_languages(self):
         """Encuentra la carpeta Languages"""
-        if not self.carpeta_mod:
-            return None
-            
-        posibles_rutas = [
-            os.path.join(self.carpeta_mod, "Languages"),
-            os.path.join(self.carpeta_mod, "1.4", "Languages"),
-            os.path.join(self.carpeta_mod, "1.3", "Languages"),
-            os.path.join(self.carpeta_mod, "Common", "Languages"),
-        ]
-        
-        for ruta in posibles_rutas:
-            if os.path.exists(ruta):
-                return ruta
-        
-        # Búsqueda recursiva como fallback
-        for root, dirs, files in os.walk(self.carpeta_mod):
-            if 'Languages' in dirs:
-                return os.path.join(root, 'Languages')
-        return None
-
-    def _tiene_archivos_xml(self, carpeta):
-        """Verifica si una carpeta tiene archivos XML"""
-        try:
-            for root, dirs, files in os.walk(carpeta):
-                for file in files:
-                    if file.lower().endswith('.xml'):
-                        return True
-            return False
-        except:
-            return False
-
-    def _obtener_nombre_legible_idioma(self, nombre_carpeta):
-        """Convierte el nombre de carpeta a un nombre legible"""
-        mapeo_idiomas = {
-            'english': 'English',
-            'spanish': 'Spanish (Español)',
-            'french': 'French (Français)', 
-            'german': 'German (Deutsch)',
-            'italian': 'Italian (Italiano)',
-            'portuguese': 'Portuguese (Português)',
-            'russian': 'Russian (Русский)',
-            'chinesesimplified': 'Chinese Simplified (简体中文)',
-            'chinesetraditional': 'Chinese Traditional (繁體中文)',
-            'japanese': 'Japanese (日本語)',
-            'korean': 'Korean (한국어)',
-        }
-        
-        nombre_limpio = nombre_carpeta.lower().replace('_', '').replace('-', '')
-        return mapeo_idiomas.get(nombre_limpio, nombre_carpeta.title())
+        return encontrar_carpeta_languages(self.carpeta_mod)
 
     def _actualizar_combobox_idiomas(self, idiomas_encontrados):
         """Actualiza el combobox de idiomas"""
@@ -676,7 +691,7 @@ class EditorTematico:
             self.actualizar_status(f"{len(idiomas_encontrados)} idiomas cargados")
             
             # Cargar archivos del idioma seleccionado
-            threading.Thread(target=self._cargar_archivos_idioma, daemon=True).start()
+            self._lanzar_carga_idioma()
         else:
             self.combo_idiomas.configure(values=[])
             self.combo_idiomas.set('')
@@ -693,7 +708,12 @@ class EditorTematico:
                     break
             
             self.actualizar_status(f"Cargando archivos de {self.idioma_cargado['nombre_legible']}...")
-            threading.Thread(target=self._cargar_archivos_idioma, daemon=True).start()
+            self._lanzar_carga_idioma()
+
+    def _lanzar_carga_idioma(self):
+        # Una carga nueva sustituye a la anterior, que se cancela antes de tocar self.archivos_xml
+        self.gestor_trabajos.lanzar('idioma', f"Cargar archivos de {self.idioma_cargado['nombre_legible']}",
+                                    self._cargar_archivos_idioma)
 
     def _cargar_archivos_idioma(self):
         """Carga todos los archivos XML del idioma seleccionado"""
@@ -702,32 +722,47 @@ class EditorTematico:
                 return
                 
             carpeta_idioma = self.idioma_cargado['ruta']
+            self.motor_traduccion.configurar_idiomas(destino=idioma_destino_carpeta(self.idioma_cargado['carpeta']))
             
             if not os.path.exists(carpeta_idioma):
-                self.ventana.after(0, lambda: self.actualizar_status(f"No existe la carpeta {self.idioma_cargado['carpeta']}"))
+                self.actualizar_status(f"No existe la carpeta {self.idioma_cargado['carpeta']}")
                 return
             
-            self.archivos_xml = []
+            archivos_xml = archivos_idioma(carpeta_idioma)
             
-            for root, dirs, files in os.walk(carpeta_idioma):
-                for file in files:
-                    if file.lower().endswith('.xml'):
-                        ruta_completa = os.path.join(root, file)
-                        ruta_relativa = os.path.relpath(ruta_completa, carpeta_idioma)
-                        self.archivos_xml.append({
-                            'ruta_completa': ruta_completa,
-                            'ruta_relativa': ruta_relativa,
-                            'nombre_archivo': file,
-                            'carpeta': os.path.basename(os.path.dirname(ruta_completa))
-                        })
+            trabajo = trabajo_actual()
+            if trabajo and trabajo.cancelado:
+                return
             
-            self.archivos_xml.sort(key=lambda x: x['ruta_relativa'].lower())
+            self.archivos_xml = archivos_xml
             archivos_display = [f"{archivo['carpeta']}/{archivo['ruta_relativa']}" if archivo['carpeta'] != self.idioma_cargado['carpeta'] else archivo['ruta_relativa'] for archivo in self.archivos_xml]
             
-            self.ventana.after(0, self._actualizar_combobox_archivos, archivos_display)
+            self.cola_ui.llamar(self._actualizar_combobox_archivos, archivos_display)
+            self._escanear_proyecto(carpeta_idioma)
             
         except Exception as e:
-            self.ventana.after(0, lambda: self.actualizar_status(f"Error cargando archivos: {str(e)}"))
+            self.actualizar_status(f"Error cargando archivos: {str(e)}")
+
+    def _obtener_indice(self):
+        """Abre (o reutiliza) el índice persistente del mod actual"""
+        self.indice_proyecto = abrir_indice(self.carpeta_mod, self.indice_proyecto)
+        return self.indice_proyecto
+
+    def _escanear_proyecto(self, carpeta_idioma):
+        """Analiza todos los archivos de la carpeta de idioma en paralelo"""
+        trabajo = trabajo_actual()
+        
+        def al_progresar(completados, total):
+            if trabajo:
+                trabajo.progresar(completados, total)
+            mensaje = f"Analizando proyecto... {completados}/{total} archivos"
+            self.actualizar_status(mensaje)
+        
+        modelo = escanear_idioma(self.archivos_xml, carpeta_idioma, al_progresar, self._obtener_indice())
+        if trabajo and trabajo.cancelado:
+            return
+        self.modelo_proyecto = modelo
+        self.actualizar_status(describir_proyecto(modelo))
 
     def _actualizar_combobox_archivos(self, archivos_display):
         if archivos_display:
@@ -765,97 +800,61 @@ class EditorTematico:
                 
             self.archivo_actual = archivo_encontrado['ruta_completa']
             self.actualizar_status(f"Cargando {os.path.basename(self.archivo_actual)}...")
-            threading.Thread(target=self._cargar_textos_archivo, daemon=True).start()
+            self.gestor_trabajos.lanzar('archivo', f"Cargar {archivo_relativo}", self._cargar_textos_archivo)
             
         except Exception as e:
             messagebox.showerror("Error", f"Error al cargar archivo: {str(e)}")
 
     def _cargar_textos_archivo(self):
         try:
-            self.ventana.after(0, self._limpiar_tabla)
-            self.textos_actuales = self.extraer_textos_xml(self.archivo_actual)
+            # Lo que se estaba traduciendo o corrigiendo era del archivo anterior
+            self.gestor_trabajos.cancelar_tipos('traduccion', 'correccion')
+            self.cola_ui.llamar(self._limpiar_tabla)
+            self.textos_actuales = []
             self.traducciones = {}
-            self.ventana.after(0, self._llenar_tabla)
             
+            # La tabla se llena por bloques mientras el archivo se sigue leyendo (o sale del índice)
+            trabajo = trabajo_actual()
+            for bloque in leer_por_bloques(self.archivo_actual, self._obtener_indice()):
+                if trabajo and trabajo.cancelado:
+                    return
+                self.textos_actuales.extend(bloque)
+                self.cola_ui.llamar(self._agregar_filas, bloque)
+            
+            self.cola_ui.llamar(self._finalizar_carga)
+            
+        except ET.ParseError as e:
+            self.actualizar_status(f"Error en XML: {str(e)}")
         except Exception as e:
-            self.ventana.after(0, lambda: self.actualizar_status(f"Error cargando archivo: {str(e)}"))
+            self.actualizar_status(f"Error cargando archivo: {str(e)}")
 
     def _limpiar_tabla(self):
-        for item in self.tree_textos.get_children():
-            self.tree_textos.delete(item)
+        self.tree_textos.limpiar()
 
-    def _llenar_tabla(self):
-        for i, texto_info in enumerate(self.textos_actuales):
-            tags = ('even',) if i % 2 == 0 else ('odd',)
-            self.tree_textos.insert('', 'end', 
-                                  values=(texto_info['id'], texto_info['texto'], "", "Pendiente"),
-                                  tags=tags)
+    def _agregar_filas(self, textos):
+        self.modelo_textos.agregar(filas_de_registros(textos, "Pendiente"))
         
+        if textos:
+            self.actualizar_status(f"{len(self.modelo_textos)} textos leídos...")
+
+    def _finalizar_carga(self):
         # Configurar colores alternos
         self.tree_textos.tag_configure('even', background=self.colores['fondo_terciario'])
         self.tree_textos.tag_configure('odd', background=self.colores['fila_alterna'])
         
         self.actualizar_status(f"{len(self.textos_actuales)} textos cargados")
         self.auto_ajustar_columnas()
+        
+        if self._id_pendiente:
+            self._seleccionar_id(self._id_pendiente)
+            self._id_pendiente = None
 
     def auto_ajustar_columnas(self):
-        """Auto-ajusta el ancho de las columnas basado en el contenido"""
-        for col in self.tree_textos['columns']:
-            max_width = 200
-            for item in self.tree_textos.get_children():
-                valor = self.tree_textos.set(item, col)
-                if valor:
-                    ancho_texto = len(str(valor)) * 8
-                    max_width = max(max_width, min(ancho_texto, 800))
-            
-            self.tree_textos.column(col, width=max_width)
-
-    def extraer_textos_xml(self, ruta_archivo):
-        textos = []
-        try:
-            tree = ET.parse(ruta_archivo)
-            root = tree.getroot()
-            
-            if root.tag == "LanguageData":
-                for elem in root:
-                    if elem.text and elem.text.strip():
-                        textos.append({
-                            'id': elem.tag,
-                            'texto': elem.text.strip(),
-                            'elemento': elem,
-                            'tipo': 'keyed'
-                        })
-            else:
-                def extraer_recursivo(elemento, ruta_padre=""):
-                    id_actual = f"{ruta_padre}/{elemento.tag}" if ruta_padre else elemento.tag
-                    
-                    if elemento.text and elemento.text.strip():
-                        textos.append({
-                            'id': id_actual,
-                            'texto': elemento.text.strip(),
-                            'elemento': elemento,
-                            'tipo': 'elemento'
-                        })
-                    
-                    for attr, valor in elemento.attrib.items():
-                        if valor and valor.strip() and len(valor.strip()) > 1:
-                            textos.append({
-                                'id': f"{id_actual}@{attr}",
-                                'texto': valor.strip(),
-                                'elemento': elemento,
-                                'atributo': attr,
-                                'tipo': 'atributo'
-                            })
-                    
-                    for hijo in elemento:
-                        extraer_recursivo(hijo, id_actual)
-                
-                extraer_recursivo(root)
-                
-        except Exception as e:
-            self.actualizar_status(f"Error en XML: {str(e)}")
-        
-        return textos
+        """Auto-ajusta el ancho de las columnas midiendo el texto más largo que el modelo lleva al día"""
+        fuente = ttk.Style().lookup("Tema.Treeview", "font")
+        fuente = tkfont.Font(font=fuente) if fuente else tkfont.nametofont('TkDefaultFont')
+        for indice, col in enumerate(self.tree_textos['columns']):
+            self.tree_textos.column(col, width=self.modelo_textos.ancho_sugerido(indice, fuente.measure))
 
     def traducir_seleccion(self):
         seleccionados = self.tree_textos.selection()
@@ -863,135 +862,97 @@ class EditorTematico:
             messagebox.showwarning("Advertencia", "Selecciona textos para traducir")
             return
         
-        threading.Thread(target=self._traducir_seleccion, args=(seleccionados,), daemon=True).start()
+        self.gestor_trabajos.lanzar('traduccion', f"Traducir {len(seleccionados)} textos", self._traducir_seleccion,
+                                    seleccionados, self.modelo_textos.generacion, unico=False)
 
-    def _traducir_seleccion(self, seleccionados):
-        """Traduce los textos seleccionados usando cache"""
+    def _traducir_seleccion(self, seleccionados, generacion):
+        """Traduce los textos seleccionados usando cache y el motor concurrente"""
         try:
+            # Si entretanto se carga otro archivo, sus filas y traducciones ya no son estas
+            traducciones = self.traducciones
             total = len(seleccionados)
             exitosos = 0
             fallidos = 0
-            self.ventana.after(0, lambda: self.actualizar_status(f"Traduciendo {total} textos..."))
-            
-            for i, item in enumerate(seleccionados):
+            velocidad = 0.0
+            trabajo = trabajo_actual()
+            self.actualizar_status(f"Traduciendo {total} textos...")
+            
+            # Leer la selección en orden; los textos vacíos o de un carácter no se traducen
+            pendientes = []
+            for item in seleccionados:
+                if trabajo and trabajo.cancelado:
+                    return
                 try:
                     valores = self.tree_textos.item(item, 'values')
-                    id_texto = valores[0]
                     texto_original = valores[1]
-                    
                     if texto_original and len(texto_original.strip()) > 1:
-                        # Verificar cache primero
-                        cache_key = texto_original.strip().lower()
-                        if cache_key in self.cache_traducciones:
-                            texto_traducido = self.cache_traducciones[cache_key]
-                            nuevos_valores = (valores[0], valores[1], texto_traducido, "Traducido (Cache)")
-                            self.tree_textos.item(item, values=nuevos_valores)
-                            self.traducciones[id_texto] = texto_traducido
-                            exitosos += 1
-                            continue
-                        
-                        # Extraer placeholders (usar cache si existe)
-                        if cache_key in self.cache_placeholders:
-                            placeholders = self.cache_placeholders[cache_key]
-                        else:
-                            placeholders = self._extraer_placeholders(texto_original)
-                            self.cache_placeholders[cache_key] = placeholders
-                        
-                        # Crear texto temporal para traducción
-                        texto_para_traducir = self._reemplazar_placeholders_para_traduccion(texto_original)
-                        
-                        if len(texto_para_traducir) > 4900:
-                            texto_para_traducir = texto_para_traducir[:4900]
-                        
-                        texto_traducido_temp = GoogleTranslator(source='auto', target='es').translate(texto_para_traducir)
-                        
-                        if texto_traducido_temp:
-                            # Restaurar placeholders en la traducción
-                            texto_traducido = self._restaurar_placeholders(texto_traducido_temp, placeholders)
-                            
-                            # Guardar en cache
-                            self.cache_traducciones[cache_key] = texto_traducido
-                            
-                            nuevos_valores = (valores[0], valores[1], texto_traducido, "Traducido")
-                            self.tree_textos.item(item, values=nuevos_valores)
-                            self.traducciones[id_texto] = texto_traducido
-                            exitosos += 1
-                        
-                        time.sleep(0.2)  # Rate limiting
+                        pendientes.append((item, valores))
                     else:
                         fallidos += 1
                         
                 except Exception as e:
-                    print(f"Error traduciendo {id_texto}: {str(e)}")
+                    print(f"Error preparando {item}: {str(e)}")
+                    fallidos += 1
+            
+            def al_progresar(completados, total_lote, textos_por_segundo):
+                nonlocal velocidad
+                velocidad = textos_por_segundo
+                if trabajo:
+                    trabajo.progresar(completados, total_lote)
+                mensaje = f"Traduciendo... {completados}/{total_lote} ({textos_por_segundo:.1f} textos/s)"
+                self.actualizar_status(mensaje)
+            
+            self.motor_traduccion.configurar_hilos(self.hilos_traduccion)
+            espera_inicial = self.motor_traduccion.limitador.tiempo_espera
+            peticiones_iniciales = self.motor_traduccion.limitador.peticiones
+            # Lo que está en cache llega primero; el resto, en el orden de la selección
+            resultados = traducir_textos([valores[1] for _, valores in pendientes], self.motor_traduccion,
+                                         self.cache_traducciones, al_progresar)
+            
+            en_motor = 0
+            for indice, texto_traducido, error, de_cache in resultados:
+                if trabajo and trabajo.cancelado or self.modelo_textos.generacion != generacion:
+                    # Al dejar de consumir resultados el motor deja de enviar peticiones
+                    resultados.close()
+                    break
+                item, valores = pendientes[indice]
+                id_texto = valores[0]
+                en_motor += 0 if de_cache else 1
+                
+                if error or not texto_traducido:
+                    if error:
+                        print(f"Error traduciendo {id_texto}: {str(error)}")
                     fallidos += 1
                     continue
+                
+                estado = "Traducido (Cache)" if de_cache else "Traducido"
+                self.cola_ui.fila(item, (valores[0], valores[1], texto_traducido, estado), generacion)
+                traducciones[id_texto] = texto_traducido
+                exitosos += 1
             
             mensaje_final = f"{exitosos}/{total} textos traducidos"
+            if trabajo and trabajo.cancelado:
+                mensaje_final = "Traducción cancelada: " + mensaje_final
+            if en_motor:
+                espera = self.motor_traduccion.limitador.tiempo_espera - espera_inicial
+                peticiones = self.motor_traduccion.limitador.peticiones - peticiones_iniciales
+                resumen = resultados.resumen
+                duplicados = resumen['textos'] - resumen['unicos']
+                mensaje_final += f" en {peticiones} peticiones a {velocidad:.1f} textos/s ({espera:.1f} s esperando cuota)"
+                mensaje_final += f", {duplicados} duplicados ({100 * duplicados / resumen['textos']:.0f}%)"
+                incidencias = describir_estadisticas(resumen['resiliencia'])
+                if incidencias:
+                    mensaje_final += f", {incidencias}"
             if fallidos > 0:
                 mensaje_final += f" ({fallidos} fallos)"
-            self.ventana.after(0, lambda: self.actualizar_status(mensaje_final))
+            self.actualizar_status(mensaje_final)
             
             # Guardar cache
             self.guardar_cache_traducciones()
+            self.cola_ui.llamar(self.auto_ajustar_columnas)
             
         except Exception as e:
-            self.ventana.after(0, lambda: self.actualizar_status(f"Error en traducción: {str(e)}"))
-
-    def _extraer_placeholders(self, texto):
-        """Extrae placeholders como {0}, {1}, {name}, etc."""
-        placeholders = re.findall(r'\{[^}]+\}', texto)
-        return list(set(placeholders))
-
-    def _reemplazar_placeholders_para_traduccion(self, texto):
-        """Reemplaza placeholders con texto descriptivo para mejor traducción"""
-        replacements = {
-            r'\{0\}': ' PRIMER_ELEMENTO ',
-            r'\{1\}': ' SEGUNDO_ELEMENTO ',
-            r'\{2\}': ' TERCER_ELEMENTO ',
-            r'\{3\}': ' CUARTO_ELEMENTO ',
-            r'\{name\}': ' NOMBRE ',
-            r'\{pawn\}': ' PERSONAJE ',
-            r'\{item\}': ' OBJETO ',
-            r'\{number\}': ' NUMERO ',
-            r'\{amount\}': ' CANTIDAD ',
-            r'\{gender\}': ' GENERO ',
-            r'\{faction\}': ' FACCIÓN ',
-            r'\{location\}': ' UBICACIÓN ',
-            r'\{time\}': ' TIEMPO ',
-        }
-        
-        texto_limpio = texto
-        for patron, reemplazo in replacements.items():
-            texto_limpio = re.sub(patron, reemplazo, texto_limpio)
-        
-        texto_limpio = re.sub(r'\{[^}]+\}', ' ELEMENTO ', texto_limpio)
-        return texto_limpio
-
-    def _restaurar_placeholders(self, texto_traducido, placeholders):
-        """Restaura los placeholders originales en el texto traducido"""
-        texto_con_placeholders = texto_traducido
-        
-        replacements_inversos = {
-            'PRIMER_ELEMENTO': '{0}',
-            'SEGUNDO_ELEMENTO': '{1}', 
-            'TERCER_ELEMENTO': '{2}',
-            'CUARTO_ELEMENTO': '{3}',
-            'NOMBRE': '{name}',
-            'PERSONAJE': '{pawn}',
-            'OBJETO': '{item}',
-            'NUMERO': '{number}',
-            'CANTIDAD': '{amount}',
-            'GENERO': '{gender}',
-            'FACCIÓN': '{faction}',
-            'UBICACIÓN': '{location}',
-            'TIEMPO': '{time}',
-            'ELEMENTO': placeholders[0] if placeholders else '{}'
-        }
-        
-        for temporal, original in replacements_inversos.items():
-            texto_con_placeholders = texto_con_placeholders.replace(temporal, original)
-        
-        return texto_con_placeholders
+            self.actualizar_status(f"Error en traducción: {str(e)}")
 
     def aplicar_filtros(self, event=None):
         """Aplica todos los filtros de búsqueda combinados"""
@@ -1004,38 +965,29 @@ class EditorTematico:
         self.entry_buscar.delete(0, ctk.END)
         self.filtrar_textos()
 
+    def _programar_filtro(self, event=None):
+        """Filtra cuando se deja de teclear, no en cada pulsación"""
+        if self._filtro_programado:
+            self.ventana.after_cancel(self._filtro_programado)
+        self._filtro_programado = self.ventana.after(RETARDO_BUSQUEDA_MS, self.filtrar_textos)
+
     def filtrar_textos(self, event=None):
         """Búsqueda inteligente con filtros combinados"""
+        self._filtro_programado = None
         texto_buscar = self.entry_buscar.get().lower().strip()
         filtro_estado = self.combo_filtro_estado.get()
         filtro_tipo = self.combo_filtro_tipo.get()
         
-        # Ocultar todos los items primero
-        for item in self.tree_textos.get_children():
-            self.tree_textos.detach(item)
-        
-        # Aplicar filtros
-        items_filtrados = 0
-        for item in self.tree_textos.get_children(''):
-            valores = self.tree_textos.item(item, 'values')
-            
-            # Aplicar filtro de estado
-            if not self._cumple_filtro_estado(valores, filtro_estado):
-                continue
-                
-            # Aplicar filtro de tipo
-            if not self._cumple_filtro_tipo(valores, filtro_tipo):
-                continue
-                
-            # Aplicar filtro de búsqueda de texto
-            if not self._cumple_busqueda_texto(valores, texto_buscar):
-                continue
-            
-            # Si pasa todos los filtros, mostrar el item
-            self.tree_textos.attach(item, '', 'end')
-            items_filtrados += 1
+        # El índice de búsqueda da las filas con el texto; sobre ellas se aplican el resto de filtros
+        coincidencias = self.indice_busqueda.buscar(texto_buscar)
+        if filtro_estado != "Todos" or filtro_tipo != "Todos":
+            filas = self.modelo_textos.filas
+            coincidencias = [indice for indice in coincidencias
+                             if self._cumple_filtro_estado(filas[indice], filtro_estado)
+                             and self._cumple_filtro_tipo(filas[indice], filtro_tipo)]
         
-        self.actualizar_status(f"Mostrando {items_filtrados} textos filtrados")
+        self.modelo_textos.mostrar(coincidencias)
+        self.actualizar_status(f"Mostrando {len(coincidencias)} textos filtrados")
 
     def _cumple_filtro_estado(self, valores, filtro_estado):
         """Verifica si el texto cumple con el filtro de estado"""
@@ -1061,30 +1013,195 @@ class EditorTematico:
         texto_original = valores[1] if len(valores) > 1 else ""
         
         if filtro_tipo == "Con Placeholders":
-            return bool(re.search(r'\{[^}]+\}', texto_original))
+            return bool(PATRON_PLACEHOLDER.search(texto_original))
         elif filtro_tipo == "Sin Placeholders":
-            return not bool(re.search(r'\{[^}]+\}', texto_original))
+            return not PATRON_PLACEHOLDER.search(texto_original)
             
         return True
 
-    def _cumple_busqueda_texto(self, valores, texto_buscar):
-        """Verifica si el texto cumple con la búsqueda de texto"""
-        if not texto_buscar:
-            return True
+    def mostrar_trabajos(self):
+        """Panel con los trabajos en curso y en cola, su progreso y tiempo restante"""
+        dialogo = ctk.CTkToplevel(self.ventana)
+        dialogo.title("Trabajos en segundo plano")
+        dialogo.geometry("700x300")
+        dialogo.transient(self.ventana)
+        
+        frame_principal = ctk.CTkFrame(dialogo)
+        frame_principal.pack(fill='both', expand=True, padx=20, pady=20)
+        
+        lista = ttk.Treeview(frame_principal, columns=[columna for columna, _, _ in COLUMNAS_PANEL],
+                             show='headings', style="Tema.Treeview", height=8)
+        for columna, titulo, ancho in COLUMNAS_PANEL:
+            lista.heading(columna, text=titulo)
+            lista.column(columna, width=ancho)
+        lista.pack(fill='both', expand=True)
+        
+        def cancelar():
+            for item in lista.selection():
+                self.gestor_trabajos.cancelar(int(item))
+        
+        ctk.CTkButton(frame_principal, text="CANCELAR", command=cancelar, width=120,
+                      fg_color='#e74c3c', hover_color='#c0392b').pack(anchor='e', pady=(10, 0))
+        
+        def refrescar():
+            if not dialogo.winfo_exists():
+                return
+            seleccion = lista.selection()
+            lista.delete(*lista.get_children())
+            for iid, valores in filas_panel(self.gestor_trabajos):
+                lista.insert('', 'end', iid=iid, values=valores)
+            lista.selection_set([item for item in seleccion if lista.exists(item)])
+            dialogo.after(INTERVALO_PANEL_TRABAJOS_MS, refrescar)
+        
+        refrescar()
+
+    def buscar_en_mod(self):
+        """Busca un texto o una expresión regular en todos los idiomas y archivos del mod"""
+        carpeta_languages = self._encontrar_carpeta_languages()
+        if not carpeta_languages:
+            messagebox.showwarning("Advertencia", "Primero selecciona una carpeta de mod con carpeta 'Languages'")
+            return
+        
+        dialogo = ctk.CTkToplevel(self.ventana)
+        dialogo.title("Buscar en todo el mod")
+        dialogo.geometry("900x600")
+        dialogo.transient(self.ventana)
+        
+        frame_principal = ctk.CTkFrame(dialogo)
+        frame_principal.pack(fill='both', expand=True, padx=20, pady=20)
+        
+        frame_consulta = ctk.CTkFrame(frame_principal, fg_color="transparent")
+        frame_consulta.pack(fill='x', pady=(0, 10))
+        
+        entry_consulta = ctk.CTkEntry(frame_consulta, font=('Segoe UI', 10),
+                                      placeholder_text="Texto, clave o placeholder a buscar...")
+        entry_consulta.pack(side='left', fill='x', expand=True, padx=(0, 10))
+        
+        var_regex = tk.BooleanVar(value=False)
+        ctk.CTkCheckBox(frame_consulta, text="Expresión regular", variable=var_regex,
+                        font=('Segoe UI', 9)).pack(side='left', padx=(0, 10))
+        
+        btn_buscar = ctk.CTkButton(frame_consulta, text="BUSCAR", width=100)
+        btn_buscar.pack(side='left')
+        
+        # Resultados agrupados por archivo; cada hijo es una clave con su texto
+        frame_resultados = ctk.CTkFrame(frame_principal, fg_color="transparent")
+        frame_resultados.pack(fill='both', expand=True)
+        
+        arbol = ttk.Treeview(frame_resultados, columns=('texto',), style="Tema.Treeview")
+        arbol.heading('#0', text='Archivo / Clave')
+        arbol.heading('texto', text='Texto')
+        arbol.column('#0', width=350)
+        arbol.column('texto', width=500)
+        scroll = ctk.CTkScrollbar(frame_resultados, command=arbol.yview)
+        arbol.configure(yscrollcommand=scroll.set)
+        arbol.pack(side='left', fill='both', expand=True)
+        scroll.pack(side='right', fill='y')
+        
+        label_resumen = ctk.CTkLabel(frame_principal, text="Escribe un texto y pulsa Enter; clic en un resultado para abrirlo",
+                                     font=('Segoe UI', 9))
+        label_resumen.pack(anchor='w', pady=(10, 0))
+        
+        resultados = {}  # iid del árbol -> registro
+        
+        def mostrar_resultados(agrupados):
+            if not dialogo.winfo_exists():
+                return
+            arbol.delete(*arbol.get_children())
+            resultados.clear()
+            for registros in agrupados.values():
+                padre = arbol.insert('', 'end', text=titulo_grupo(registros), open=True)
+                for registro in registros:
+                    resultados[arbol.insert(padre, 'end', text=registro['id'], values=(registro['texto'],))] = registro
+            label_resumen.configure(text=resumir_resultados(agrupados))
+        
+        def mostrar_error(mensaje):
+            if dialogo.winfo_exists():
+                label_resumen.configure(text=mensaje)
+        
+        def buscar(event=None):
+            consulta = entry_consulta.get().strip()
+            indice = self._obtener_indice()
+            if not consulta or not indice:
+                return
+            regex = var_regex.get()
+            label_resumen.configure(text="Buscando...")
             
-        # Buscar en todas las columnas
-        for valor in valores:
-            if valor and texto_buscar in str(valor).lower():
-                return True
-                
-        # Búsqueda parcial en palabras
-        for valor in valores:
-            if valor:
-                palabras = str(valor).lower().split()
-                for palabra in palabras:
-                    if texto_buscar in palabra:
-                        return True
-        return False
+            def al_progresar(completados, total):
+                self.actualizar_status(f"Indexando mod... {completados}/{total} archivos")
+            
+            def trabajo():
+                try:
+                    agrupados = buscar_en_proyecto(indice, carpeta_languages, consulta, regex, al_progresar)
+                    self.cola_ui.llamar(mostrar_resultados, agrupados)
+                except Exception as e:
+                    self.cola_ui.llamar(mostrar_error, describir_error_busqueda(e))
+            
+            self.gestor_trabajos.lanzar('busqueda', f"Buscar \"{consulta}\" en el mod", trabajo)
+        
+        def abrir(event=None):
+            seleccion = arbol.selection()
+            if seleccion and seleccion[0] in resultados:
+                registro = resultados[seleccion[0]]
+                self.abrir_registro(registro['ruta'], registro['id'])
+        
+        btn_buscar.configure(command=buscar)
+        entry_consulta.bind('<Return>', buscar)
+        arbol.bind('<ButtonRelease-1>', abrir)
+        arbol.bind('<Return>', abrir)
+        entry_consulta.focus()
+
+    def abrir_registro(self, ruta, id_texto):
+        """Carga el archivo de un resultado, cambiando de idioma si hace falta, y selecciona su fila"""
+        def misma_ruta(otra):
+            return os.path.normcase(os.path.abspath(ruta)) == os.path.normcase(os.path.abspath(otra))
+        
+        if self.archivo_actual and misma_ruta(self.archivo_actual):
+            self._seleccionar_id(id_texto)
+            return
+        
+        idioma = os.path.relpath(ruta, self._encontrar_carpeta_languages()).split(os.sep)[0]
+        idioma_info = next((info for info in self.lista_idiomas_actual if info['carpeta'] == idioma), None)
+        self._id_pendiente = id_texto
+        
+        # El estado de la ventana solo se cambia en el hilo principal
+        def elegir_idioma():
+            if not idioma_info or (self.idioma_cargado and self.idioma_cargado['carpeta'] == idioma):
+                return False
+            self.idioma_cargado = idioma_info
+            self.combo_idiomas.set(f"{idioma_info['nombre_legible']} ({idioma_info['carpeta']})")
+            return True
+        
+        def elegir_archivo():
+            self.archivo_actual = ruta
+            archivo_info = next((info for info in self.archivos_xml if misma_ruta(info['ruta_completa'])), None)
+            if archivo_info:
+                display_text = f"{archivo_info['carpeta']}/{archivo_info['ruta_relativa']}" if archivo_info['carpeta'] != self.idioma_cargado['carpeta'] else archivo_info['ruta_relativa']
+                self.combo_archivos.set(display_text)
+        
+        def cargar():
+            if self.cola_ui.ejecutar(elegir_idioma):
+                self._lanzar_carga_idioma()
+            # La carga del idioma va con su propia clave, así sustituye o es sustituida por la del
+            # combo; el archivo se abre cuando termine la última
+            if not self.gestor_trabajos.esperar('idioma', trabajo_actual()):
+                return
+            self.cola_ui.ejecutar(elegir_archivo)
+            self.actualizar_status(f"Cargando {os.path.basename(ruta)}...")
+            self._cargar_textos_archivo()
+        
+        self.gestor_trabajos.lanzar('archivo', f"Abrir {os.path.basename(ruta)}", cargar)
+
+    def _seleccionar_id(self, id_texto):
+        """Selecciona y muestra la fila con ese id en el archivo cargado"""
+        for indice, fila in enumerate(self.modelo_textos.filas):
+            if fila[0] == id_texto:
+                if self.modelo_textos.posicion(indice) is None:
+                    # Los filtros actuales ocultaban la fila
+                    self.limpiar_filtros()
+                self.tree_textos.selection_set(str(indice))
+                self.tree_textos.ver(indice)
+                return
 
     def crear_nuevo_idioma(self):
         """Crea un nuevo idioma basado en uno existente"""
@@ -1182,9 +1299,8 @@ class EditorTematico:
                 return
             
             dialogo.destroy()
-            threading.Thread(target=self._crear_idioma_completo, 
-                           args=(carpeta_languages, nombre_nuevo, idioma_base), 
-                           daemon=True).start()
+            self.gestor_trabajos.lanzar('crear_idioma', f"Crear idioma {nombre_nuevo}", self._crear_idioma_completo,
+                                        carpeta_languages, nombre_nuevo, idioma_base, unico=False)
         
         # Botones
         frame_botones = ctk.CTkFrame(frame_principal, fg_color="transparent")
@@ -1202,15 +1318,10 @@ class EditorTematico:
 
     def _obtener_idiomas_base(self, carpeta_languages):
         """Obtiene idiomas existentes"""
-        idiomas = []
         try:
-            for item in os.listdir(carpeta_languages):
-                ruta_item = os.path.join(carpeta_languages, item)
-                if os.path.isdir(ruta_item) and self._tiene_archivos_xml(ruta_item):
-                    idiomas.append(item)
-        except:
-            pass
-        return idiomas
+            return listar_idiomas(carpeta_languages)
+        except OSError:
+            return []
 
     def _crear_idioma_completo(self, carpeta_languages, nombre_idioma, idioma_base):
         """Crea un nuevo idioma copiando la estructura completa"""
@@ -1219,7 +1330,7 @@ class EditorTematico:
             ruta_base = os.path.join(carpeta_languages, idioma_base)
             
             if os.path.exists(ruta_nuevo):
-                self.ventana.after(0, lambda: messagebox.showerror("Error", f"El idioma '{nombre_idioma}' ya existe"))
+                self.cola_ui.llamar(messagebox.showerror, "Error", f"El idioma '{nombre_idioma}' ya existe")
                 return
             
             os.makedirs(ruta_nuevo, exist_ok=True)
@@ -1243,7 +1354,7 @@ class EditorTematico:
                         shutil.copy2(archivo_origen, archivo_destino)
                         archivos_copiados += 1
             
-            self.ventana.after(0, lambda: messagebox.showinfo(
+            self.cola_ui.llamar(lambda: messagebox.showinfo(
                 "Éxito", 
                 f"Idioma '{nombre_idioma}' creado exitosamente!\n\n"
                 f"• Copiado de: {idioma_base}\n"
@@ -1254,7 +1365,7 @@ class EditorTematico:
             self.recargar_idiomas()
             
         except Exception as e:
-            self.ventana.after(0, lambda: messagebox.showerror("Error", f"No se pudo crear: {str(e)}"))
+            self.cola_ui.llamar(messagebox.showerror, "Error", f"No se pudo crear: {str(e)}")
 
     def editar_defs(self):
         """Abre el editor para modificar Defs.xml con interfaz mejorada"""
@@ -2074,15 +2185,11 @@ class EditorTematico:
             messagebox.showwarning("Advertencia", "No hay texto para traducir")
             return
         
-        try:
-            texto_traducido = GoogleTranslator(source='auto', target='es').translate(texto_actual)
-            if texto_traducido:
-                text_widget.delete('1.0', ctk.END)
-                text_widget.insert('1.0', texto_traducido)
-            else:
-                messagebox.showerror("Error", "No se pudo traducir el texto")
-        except Exception as e:
-            messagebox.showerror("Error", f"Error en traducción: {str(e)}")
+        def aplicar(texto_traducido):
+            text_widget.delete('1.0', ctk.END)
+            text_widget.insert('1.0', texto_traducido)
+        
+        self._traducir_en_segundo_plano(texto_actual, aplicar)
 
     def _buscar_icono_defs(self, entry_widget, nombre_def, campo, def_data):
         """Busca iconos PNG en todo el mod"""
@@ -2376,11 +2483,10 @@ class EditorTematico:
                         texto_original = campo_elem.text.strip()
                         if len(texto_original) > 1:
                             try:
-                                texto_traducido = GoogleTranslator(source='auto', target='es').translate(texto_original)
+                                texto_traducido = self.motor_traduccion.traducir_texto(texto_original)
                                 if texto_traducido and texto_traducido != texto_original:
                                     campo_elem.text = texto_traducido
                                     cambios = True
-                                time.sleep(0.1)  # Rate limiting
                             except:
                                 continue
             
@@ -2393,11 +2499,10 @@ class EditorTematico:
                         texto_original = campo_elem.text.strip()
                         if len(texto_original) > 1:
                             try:
-                                texto_traducido = GoogleTranslator(source='auto', target='es').translate(texto_original)
+                                texto_traducido = self.motor_traduccion.traducir_texto(texto_original)
                                 if texto_traducido and texto_traducido != texto_original:
                                     campo_elem.text = texto_traducido
                                     cambios = True
-                                time.sleep(0.1)  # Rate limiting
                             except:
                                 continue
             
@@ -2650,15 +2755,11 @@ class EditorTematico:
             messagebox.showwarning("Advertencia", "No hay texto para traducir")
             return
         
-        try:
-            texto_traducido = GoogleTranslator(source='auto', target='es').translate(texto_actual)
-            if texto_traducido:
-                text_widget.delete('1.0', ctk.END)
-                text_widget.insert('1.0', texto_traducido)
-            else:
-                messagebox.showerror("Error", "No se pudo traducir el texto")
-        except Exception as e:
-            messagebox.showerror("Error", f"Error en traducción: {str(e)}")
+        def aplicar(texto_traducido):
+            text_widget.delete('1.0', ctk.END)
+            text_widget.insert('1.0', texto_traducido)
+        
+        self._traducir_en_segundo_plano(texto_actual, aplicar)
 
     def _traducir_entry_about(self, entry_widget):
         """Traduce el contenido de un campo Entry en About"""
@@ -2667,15 +2768,35 @@ class EditorTematico:
             messagebox.showwarning("Advertencia", "No hay texto para traducir")
             return
         
-        try:
-            texto_traducido = GoogleTranslator(source='auto', target='es').translate(texto_actual)
-            if texto_traducido:
-                entry_widget.delete(0, ctk.END)
-                entry_widget.insert(0, texto_traducido)
+        def aplicar(texto_traducido):
+            entry_widget.delete(0, ctk.END)
+            entry_widget.insert(0, texto_traducido)
+        
+        self._traducir_en_segundo_plano(texto_actual, aplicar)
+
+    def _traducir_en_segundo_plano(self, texto, aplicar, exito=None, fallo="No se pudo traducir el texto"):
+        """Traduce un texto suelto en un trabajo y aplica el resultado en el hilo principal
+
+        Con reintentos y esperas de cuota una traducción puede tardar decenas
+        de segundos; así la ventana sigue respondiendo mientras tanto.
+        """
+        def terminar(texto_traducido, error):
+            if error is not None:
+                messagebox.showerror("Error", f"Error en traducción: {str(error)}")
+            elif not texto_traducido:
+                messagebox.showerror("Error", fallo)
             else:
-                messagebox.showerror("Error", "No se pudo traducir el texto")
-        except Exception as e:
-            messagebox.showerror("Error", f"Error en traducción: {str(e)}")
+                aplicar(texto_traducido)
+                if exito:
+                    messagebox.showinfo("Éxito", exito)
+        
+        def traducir():
+            try:
+                self.cola_ui.llamar(terminar, self.motor_traduccion.traducir_texto(texto), None)
+            except Exception as e:
+                self.cola_ui.llamar(terminar, None, e)
+        
+        self.gestor_trabajos.lanzar('texto', "Traducir un texto", traducir, unico=False)
 
     def _buscar_icono_mod(self):
         """Busca el icono del mod en About/Preview con diferentes extensiones"""
@@ -2724,30 +2845,9 @@ class EditorTematico:
             return
         
         try:
-            tree = ET.parse(self.archivo_actual)
-            root = tree.getroot()
-            
-            textos_guardados = 0
-            
-            for texto_info in self.textos_actuales:
-                id_texto = texto_info['id']
-                if id_texto in self.traducciones and self.traducciones[id_texto]:
-                    texto_traducido = self.traducciones[id_texto]
-                    
-                    if texto_info['tipo'] == 'keyed':
-                        for elem in root:
-                            if elem.tag == texto_info['id']:
-                                elem.text = texto_traducido
-                                textos_guardados += 1
-                                break
-                    elif texto_info['tipo'] == 'elemento':
-                        texto_info['elemento'].text = texto_traducido
-                        textos_guardados += 1
-                    elif texto_info['tipo'] == 'atributo':
-                        texto_info['elemento'].set(texto_info['atributo'], texto_traducido)
-                        textos_guardados += 1
-            
-            tree.write(self.archivo_actual, encoding='utf-8', xml_declaration=True)
+            textos_guardados = guardar_traducciones_xml(self.archivo_actual, self.traducciones)
+            if self.modelo_proyecto:
+                actualizar_archivo_proyecto(self.modelo_proyecto, self.archivo_actual, self._obtener_indice())
             self.actualizar_status(f"{textos_guardados} traducciones guardadas")
             messagebox.showinfo("Éxito", f"Guardadas {textos_guardados} traducciones")
             
@@ -2787,7 +2887,7 @@ class EditorTematico:
             return
         
         self.celda_editando = (item, columna)
-        self.entry_edicion = ctk.CTkEntry(self.tree_textos, 
+        self.entry_edicion = ctk.CTkEntry(self.tree_textos.widget, 
                                         font=('Segoe UI', 10))
         
         self.entry_edicion.place(x=bbox[0], y=bbox[1], width=bbox[2], height=bbox[3])
@@ -2899,9 +2999,18 @@ class EditorTematico:
 
     def cerrar_aplicacion(self):
         """Cierra la aplicación limpiando recursos"""
+        # Se espera a los trabajos cancelados antes de cerrar el cache y el índice que usan;
+        # los que esperan un diálogo no lo tendrán y terminan en lugar de bloquear la espera
+        self.cola_ui.cerrar()
+        if not self.gestor_trabajos.cerrar():
+            print("Algunos trabajos no terminaron a tiempo; se cierra igualmente")
         self.limpiar_imagenes()
         self.guardar_configuracion()
         self.guardar_cache_traducciones()
+        self.cache_traducciones.cerrar()
+        if self.indice_proyecto:
+            self.indice_proyecto.cerrar()
+        self.motor_traduccion.cerrar()
         self.ventana.quit()
         self.ventana.destroy()
 
@@ -0,0 +1,5 @@
+"""Pruebas de rendimiento del núcleo del traductor sobre mods sintéticos
+
+    python -m benchmarks --salida resultados.json
+    python -m benchmarks --comparar resultados.json
+"""
@@ -0,0 +1,441 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from traductor.busqueda import IndiceBusqueda
+from traductor.cache import CacheTraducciones
+from traductor.enrutador import Backend, Enrutador
+from traductor.escaneo import archivos_idioma, escanear_proyecto, carpeta_referencia
+from traductor.extraccion import extraer_textos_xml, guardar_traducciones_xml
+from traductor.indice import IndiceProyecto
+from traductor.limitador import configurar_limitador
+from traductor.modelo import ModeloTextos
+from traductor.motor import MotorTraduccion
+from traductor.pipeline import traducir_textos
+from traductor.placeholders import proteger_placeholders, restaurar_placeholders
+from traductor.servicios import crear_fabrica
+from traductor.servidor_simulado import ServidorSimulado
+
+from . import referencia
+from .generador import generar_mod, generar_textos
+
+SERVICIO_SIMULADO = 'benchmark'
+# Lo que se teclea en el buscador: consultas que se amplían letra a letra y otras nuevas
+CONSULTAS = ("r", "ra", "rai", "raid", "raide", "raider", "mood", "{0}", "steel component", "zzz")
+
+
+class ClienteSimulado:
+    """Servicio de traducción de mentira: tarda latencia segundos por petición"""
+
+    def __init__(self, origen, destino, latencia=0.0):
+        self.latencia = latencia
+
+    def translate(self, texto):
+        if self.latencia:
+            time.sleep(self.latencia)
+        return "\n".join(f"[{linea}]" for linea in texto.split("\n"))
+
+
+def _medir(funcion, repeticiones, preparar=None):
+    """Ejecuta funcion varias veces y devuelve los segundos de cada ejecución y su último resultado"""
+    tiempos = []
+    resultado = None
+    for _ in range(repeticiones):
+        argumentos = preparar() if preparar else ()
+        inicio = time.perf_counter()
+        resultado = funcion(*argumentos)
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos, resultado
+
+
+def _registros_idioma(carpeta_idioma):
+    registros = []
+    for archivo in archivos_idioma(carpeta_idioma):
+        registros.extend(extraer_textos_xml(archivo['ruta_completa']))
+    return registros
+
+
+def escenario_cargar_idioma(mod, repeticiones, directorio):
+    """Lo que hace _cargar_archivos_idioma: listar los XML y escanear el proyecto"""
+    carpeta_idioma = os.path.join(mod['carpeta_languages'], mod['idiomas'][-1])
+
+    def cargar(indice=None):
+        rutas = [archivo['ruta_completa'] for archivo in archivos_idioma(carpeta_idioma)]
+        return escanear_proyecto(rutas, carpeta_idioma, carpeta_referencia(carpeta_idioma), indice=indice)
+
+    sin_indice, modelo = _medir(cargar, repeticiones)
+    indice = IndiceProyecto(os.path.dirname(mod['carpeta_languages']), os.path.join(directorio, "indices"))
+    try:
+        primera, _ = _medir(cargar, 1, lambda: (indice,))
+        con_indice, _ = _medir(cargar, repeticiones, lambda: (indice,))
+    finally:
+        indice.cerrar()
+    return {
+        'sin_indice': sin_indice,
+        'indice_en_frio': primera,
+        'indice_en_caliente': con_indice,
+        'archivos': modelo['totales']['archivos'],
+        'claves': modelo['totales']['claves'],
+    }
+
+
+def escenario_extraer(mod, repeticiones, directorio):
+    """extraer_textos_xml sobre todos los archivos de un idioma"""
+    carpeta_idioma = os.path.join(mod['carpeta_languages'], mod['idiomas'][0])
+    tiempos, registros = _medir(_registros_idioma, repeticiones, lambda: (carpeta_idioma,))
+    return {'extraer': tiempos, 'registros': len(registros)}
+
+
+def escenario_tabla(mod, repeticiones, directorio):
+    """Llenar el modelo de la tabla con todo el idioma y filtrarlo como en filtrar_textos"""
+    registros = _registros_idioma(os.path.join(mod['carpeta_languages'], mod['idiomas'][0]))
+    filas = [(registro['id'], registro['texto'], "", "") for registro in registros]
+
+    def llenar():
+        modelo = ModeloTextos()
+        indice = IndiceBusqueda(modelo)
+        for inicio in range(0, len(filas), 500):
+            modelo.agregar(filas[inicio:inicio + 500])
+        return modelo, indice
+
+    llenado, (modelo, indice) = _medir(llenar, repeticiones)
+
+    def filtrar():
+        for consulta in CONSULTAS:
+            modelo.mostrar(indice.buscar(consulta))
+        modelo.mostrar(None)
+
+    filtrado, _ = _medir(filtrar, repeticiones)
+    return {
+        'llenar': llenado,
+        'filtrar': filtrado,
+        'filas': len(filas),
+        'consultas_por_pasada': len(CONSULTAS),
+    }
+
+
+def escenario_guardar(mod, repeticiones, directorio):
+    """guardar_traducciones_xml de todos los textos de cada archivo de un idioma"""
+    carpeta_idioma = os.path.join(mod['carpeta_languages'], mod['idiomas'][0])
+    copia = os.path.join(directorio, "guardar")
+    archivos = []
+    for archivo in archivos_idioma(carpeta_idioma):
+        traducciones = {registro['id']: "ES " + registro['texto']
+                        for registro in extraer_textos_xml(archivo['ruta_completa'])}
+        archivos.append((archivo['ruta_completa'], os.path.join(copia, archivo['ruta_relativa']), traducciones))
+
+    def preparar():
+        shutil.rmtree(copia, ignore_errors=True)
+        for origen, destino, _ in archivos:
+            os.makedirs(os.path.dirname(destino), exist_ok=True)
+            shutil.copyfile(origen, destino)
+        return ()
+
+    def guardar():
+        return sum(guardar_traducciones_xml(destino, traducciones) for _, destino, traducciones in archivos)
+
+    tiempos, guardados = _medir(guardar, repeticiones, preparar)
+    return {'guardar': tiempos, 'textos_guardados': guardados}
+
+
+def escenario_traducir(mod, repeticiones, directorio, latencia=0.005, hilos=8):
+    """Traducir un idioma entero contra un servicio simulado, sin cache y con el cache ya lleno"""
+    registros = _registros_idioma(os.path.join(mod['carpeta_languages'], mod['idiomas'][0]))
+    textos = [registro['texto'] for registro in registros]
+    limitador = configurar_limitador(SERVICIO_SIMULADO, tasa=0)
+    motor = MotorTraduccion('en', 'es', max_hilos=hilos, servicio=SERVICIO_SIMULADO,
+                            fabrica_cliente=lambda origen, destino: ClienteSimulado(origen, destino, latencia))
+
+    resumenes = []
+
+    def traducir(cache):
+        resultados = traducir_textos(textos, motor, cache)
+        resumenes.append(resultados.resumen)
+        return sum(1 for _, traduccion, _, _ in resultados if traduccion)
+
+    try:
+        peticiones = limitador.peticiones
+        sin_cache, traducidos = _medir(traducir, repeticiones, lambda: (CacheTraducciones(':memory:'),))
+        peticiones = (limitador.peticiones - peticiones) // repeticiones
+        unicos = resumenes[-1]['unicos']
+        cache = CacheTraducciones(':memory:')
+        traducir(cache)
+        con_cache, _ = _medir(traducir, repeticiones, lambda: (cache,))
+    finally:
+        motor.cerrar()
+    return {
+        'sin_cache': sin_cache,
+        'con_cache': con_cache,
+        'textos': len(textos),
+        'unicos': unicos,
+        'traducidos': traducidos,
+        'peticiones': peticiones,
+        'latencia_ms': latencia * 1000,
+        'hilos': hilos,
+    }
+
+
+def escenario_traducir_http(mod, repeticiones, directorio, latencia=0.005, hilos=8, tasa_errores=0.0):
+    """Traducir un idioma entero por HTTP contra el servidor simulado, como con un servicio real"""
+    registros = _registros_idioma(os.path.join(mod['carpeta_languages'], mod['idiomas'][0]))
+    textos = [registro['texto'] for registro in registros]
+    configurar_limitador(SERVICIO_SIMULADO, tasa=0)
+
+    with ServidorSimulado(latencia_ms=latencia * 1000, tasa_errores=tasa_errores, semilla=1) as servidor:
+        motor = MotorTraduccion('en', 'es', max_hilos=hilos, servicio=SERVICIO_SIMULADO,
+                                fabrica_cliente=crear_fabrica('libretranslate', url=servidor.url))
+        resumenes = []
+
+        def traducir():
+            resultados = traducir_textos(textos, motor)
+            resumenes.append(resultados.resumen)
+            return sum(1 for _, traduccion, _, _ in resultados if traduccion)
+
+        try:
+            tiempos, traducidos = _medir(traducir, repeticiones)
+        finally:
+            motor.cerrar()
+        estadisticas = dict(servidor.estadisticas)
+        resiliencia = resumenes[-1]['resiliencia']
+    return {
+        'traducir': tiempos,
+        'textos': len(textos),
+        'traducidos': traducidos,
+        'peticiones': estadisticas['peticiones'] // repeticiones,
+        'errores_servidor': estadisticas['errores'] // repeticiones,
+        'reintentos': resiliencia['reintentos'],
+        'agotados': resiliencia['agotados'],
+        'latencia_ms': latencia * 1000,
+        'tasa_errores': tasa_errores,
+        'hilos': hilos,
+    }
+
+
+def escenario_traducir_enrutada(mod, repeticiones, directorio, latencia=0.005, hilos=8, tasa_errores=0.0,
+                                servidores=3, tasa_servicio=200.0):
+    """Traducir por HTTP con uno y con varios servidores simulados, cada uno con su cuota
+
+    El último servidor es más lento y falla más, como un servicio degradado:
+    el enrutador debe apartarlo sin que el total deje de crecer con los servidores.
+    """
+    registros = _registros_idioma(os.path.join(mod['carpeta_languages'], mod['idiomas'][0]))
+    textos = [registro['texto'] for registro in registros]
+    servidores = max(2, servidores)
+    simulados = [ServidorSimulado(latencia_ms=latencia * 1000, tasa_errores=tasa_errores, semilla=numero)
+                 for numero in range(servidores - 1)]
+    simulados.append(ServidorSimulado(latencia_ms=latencia * 4000, tasa_errores=max(0.2, tasa_errores * 4),
+                                      semilla=servidores))
+    for servidor in simulados:
+        servidor.iniciar()
+
+    def medir(cantidad):
+        backends = []
+        for numero, servidor in enumerate(simulados[:cantidad]):
+            nombre = f"{SERVICIO_SIMULADO}_{cantidad}_{numero}"
+            configurar_limitador(nombre, tasa=tasa_servicio, rafaga=5)
+            backends.append(Backend(nombre, crear_fabrica('libretranslate', url=servidor.url)))
+        enrutador = Enrutador(backends)
+        motor = MotorTraduccion('en', 'es', max_hilos=hilos, enrutador=enrutador)
+        try:
+            tiempos, traducidos = _medir(
+                lambda: sum(1 for _, traduccion, _, _ in traducir_textos(textos, motor) if traduccion), repeticiones)
+        finally:
+            motor.cerrar()
+        return tiempos, traducidos, enrutador
+
+    try:
+        uno, traducidos_uno, _ = medir(1)
+        todos, traducidos, enrutador = medir(servidores)
+    finally:
+        for servidor in simulados:
+            servidor.detener()
+    return {
+        'un_servidor': uno,
+        'todos': todos,
+        'textos': len(textos),
+        'traducidos_un_servidor': traducidos_uno,
+        'traducidos': traducidos,
+        'reparto': enrutador.estadisticas(),
+        'relevos': enrutador.relevos,
+        'servidores': servidores,
+        'tasa_servicio': tasa_servicio,
+        'latencia_ms': latencia * 1000,
+        'hilos': hilos,
+    }
+
+
+def escenario_placeholders(mod, repeticiones, directorio, cantidad=100000):
+    """Proteger y restaurar placeholders en textos sueltos, con el motor compilado y con el anterior
+
+    Entre medias el "servicio" devuelve el texto sin tocar, así cualquier
+    diferencia con el original es un texto estropeado por la protección.
+    """
+    textos = generar_textos(cantidad)
+
+    def ida_y_vuelta():
+        resultado = []
+        for texto in textos:
+            protegido, tokens = proteger_placeholders(texto)
+            resultado.append(restaurar_placeholders(protegido, tokens))
+        return resultado
+
+    def ida_y_vuelta_anterior():
+        resultado = []
+        for texto in textos:
+            placeholders = referencia.extraer_placeholders(texto)
+            resultado.append(referencia.restaurar_placeholders(referencia.proteger_placeholders(texto), placeholders))
+        return resultado
+
+    compilado, restaurados = _medir(ida_y_vuelta, repeticiones)
+    anterior, restaurados_anterior = _medir(ida_y_vuelta_anterior, repeticiones)
+    return {
+        'compilado': compilado,
+        'anterior': anterior,
+        'textos': len(textos),
+        'estropeados': sum(1 for original, final in zip(textos, restaurados) if original != final),
+        'estropeados_anterior': sum(1 for original, final in zip(textos, restaurados_anterior) if original != final),
+    }
+
+
+ESCENARIOS = {
+    'cargar_idioma': escenario_cargar_idioma,
+    'extraer_textos_xml': escenario_extraer,
+    'tabla_y_filtro': escenario_tabla,
+    'guardar_xml': escenario_guardar,
+    'traduccion': escenario_traducir,
+    'traduccion_http': escenario_traducir_http,
+    'traduccion_enrutada': escenario_traducir_enrutada,
+    'placeholders': escenario_placeholders,
+}
+
+
+def _version():
+    try:
+        salida = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10)
+        return salida.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _resumir(medidas):
+    """Sustituye cada lista de tiempos por su mediana y mínimo; el resto se deja igual"""
+    resumen = {}
+    for nombre, valor in medidas.items():
+        if isinstance(valor, list):
+            resumen[nombre] = {'mediana': statistics.median(valor), 'minimo': min(valor), 'tiempos': valor}
+        else:
+            resumen[nombre] = valor
+    return resumen
+
+
+def comparar(actual, anterior):
+    """Imprime la variación de cada mediana respecto a unos resultados anteriores"""
+    print(f"\nComparación con {anterior.get('version') or 'resultados anteriores'}:")
+    if anterior.get('parametros') != actual['parametros']:
+        print("  Aviso: los resultados anteriores se midieron con otros parámetros")
+    for escenario, medidas in actual['escenarios'].items():
+        previas = anterior.get('escenarios', {}).get(escenario, {})
+        for nombre, valor in medidas.items():
+            previo = previas.get(nombre)
+            if not isinstance(valor, dict) or not isinstance(previo, dict) or not previo.get('mediana'):
+                continue
+            cambio = 100 * (valor['mediana'] - previo['mediana']) / previo['mediana']
+            print(f"  {escenario}.{nombre}: {previo['mediana'] * 1000:.1f} ms -> "
+                  f"{valor['mediana'] * 1000:.1f} ms ({cambio:+.0f}%)")
+
+
+def _crear_parser():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description="Mide el núcleo del traductor sobre un mod sintético")
+    parser.add_argument('--keyed', type=int, default=20, help="Archivos Keyed por idioma")
+    parser.add_argument('--definjected', type=int, default=40, help="Archivos DefInjected por idioma")
+    parser.add_argument('--claves', type=int, default=100, help="Claves por archivo")
+    parser.add_argument('--placeholders', type=float, default=0.2,
+                        help="Proporción de textos con un placeholder (0-1)")
+    parser.add_argument('--idiomas', default="English,Spanish",
+                        help="Carpetas de idioma separadas por comas; la primera es el original")
+    parser.add_argument('--repeticiones', type=int, default=3)
+    parser.add_argument('--latencia-ms', type=float, default=5.0,
+                        help="Lo que tarda cada petición al servicio simulado")
+    parser.add_argument('--hilos', type=int, default=8, help="Hilos del motor de traducción")
+    parser.add_argument('--errores', type=float, default=0.0,
+                        help="Proporción de peticiones que fallan en el servidor simulado "
+                             "(traduccion_http y traduccion_enrutada)")
+    parser.add_argument('--servidores', type=int, default=3,
+                        help="Servidores simulados entre los que reparte traduccion_enrutada (mínimo 2)")
+    parser.add_argument('--tasa-servicio', type=float, default=200.0,
+                        help="Peticiones por segundo admitidas por cada servidor en traduccion_enrutada")
+    parser.add_argument('--escenarios', default=",".join(ESCENARIOS),
+                        help="Escenarios a ejecutar separados por comas")
+    parser.add_argument('--salida', help="Archivo JSON donde guardar los resultados")
+    parser.add_argument('--comparar', help="Resultados JSON anteriores con los que comparar")
+    return parser
+
+
+def main(argv=None):
+    argumentos = _crear_parser().parse_args(argv)
+    nombres = [nombre.strip() for nombre in argumentos.escenarios.split(',') if nombre.strip()]
+    desconocidos = [nombre for nombre in nombres if nombre not in ESCENARIOS]
+    if desconocidos:
+        print(f"Escenarios desconocidos: {', '.join(desconocidos)}", file=sys.stderr)
+        return 2
+
+    parametros = {
+        'keyed': argumentos.keyed,
+        'definjected': argumentos.definjected,
+        'claves': argumentos.claves,
+        'placeholders': argumentos.placeholders,
+        'idiomas': [idioma.strip() for idioma in argumentos.idiomas.split(',') if idioma.strip()],
+        'repeticiones': argumentos.repeticiones,
+    }
+    resultados = {
+        'version': _version(),
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'parametros': parametros,
+        'escenarios': {},
+    }
+
+    with tempfile.TemporaryDirectory(prefix="benchmark_mod_") as directorio:
+        mod = generar_mod(os.path.join(directorio, "mod"), argumentos.keyed, argumentos.definjected,
+                          argumentos.claves, argumentos.placeholders, parametros['idiomas'])
+        for nombre in nombres:
+            extra = {}
+            if nombre in ('traduccion', 'traduccion_http', 'traduccion_enrutada'):
+                extra = {'latencia': argumentos.latencia_ms / 1000, 'hilos': argumentos.hilos}
+            if nombre in ('traduccion_http', 'traduccion_enrutada'):
+                extra['tasa_errores'] = argumentos.errores
+            if nombre == 'traduccion_enrutada':
+                extra.update(servidores=argumentos.servidores, tasa_servicio=argumentos.tasa_servicio)
+            print(f"{nombre}...", file=sys.stderr, flush=True)
+            medidas = ESCENARIOS[nombre](mod, argumentos.repeticiones, directorio, **extra)
+            resultados['escenarios'][nombre] = _resumir(medidas)
+            for medida, valor in resultados['escenarios'][nombre].items():
+                if isinstance(valor, dict) and 'mediana' in valor:
+                    print(f"  {medida}: {valor['mediana'] * 1000:.1f} ms", file=sys.stderr)
+
+    texto = json.dumps(resultados, indent=2, ensure_ascii=False)
+    if argumentos.salida:
+        with open(argumentos.salida, 'w', encoding='utf-8') as f:
+            f.write(texto)
+    else:
+        print(texto)
+
+    if argumentos.comparar:
+        with open(argumentos.comparar, 'r', encoding='utf-8') as f:
+            comparar(resultados, json.load(f))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""Generador de mods sintéticos de RimWorld para las pruebas de rendimiento"""
+import os
+import random
+from xml.sax.saxutils import escape
+
+PALABRAS = (
+    "colonist pawn raider mechanoid weapon armor rifle plasma steel component medicine "
+    "research bench turret power battery cooler heater door wall floor crop harvest "
+    "animal tame hunt wound infection surgery prosthetic bionic trade caravan faction "
+    "quest reward psychic storm raid siege mood thought memory skill shooting melee "
+    "construction mining cooking plants social intellectual artistic crafting the a of "
+    "with and to in for on your this that is are be can will not"
+).split()
+
+PLACEHOLDERS = ("{0}", "{1}", "{PAWN_nameDef}", "{name}", "{amount}", "{faction}")
+
+# Todo lo que un texto de RimWorld lleva y el servicio no debe traducir
+TOKENS_RIMWORLD = PLACEHOLDERS + ("{PAWN_labelShort}", "{1_label}", "[PAWN_nameDef]", "[recipient_pronoun]",
+                                  "<color=#FF8080>", "</color>", "<b>", "</b>", "\\n")
+
+TIPOS_DEF = ("ThingDef", "ResearchProjectDef", "HediffDef", "RecipeDef", "TraitDef", "JobDef")
+CAMPOS_DEF = ("label", "description", "jobString", "reportString")
+
+
+def _frase(aleatorio, densidad_placeholders, min_palabras=2, max_palabras=14):
+    palabras = [aleatorio.choice(PALABRAS) for _ in range(aleatorio.randint(min_palabras, max_palabras))]
+    if aleatorio.random() < densidad_placeholders:
+        palabras.insert(aleatorio.randrange(len(palabras) + 1), aleatorio.choice(PLACEHOLDERS))
+    frase = " ".join(palabras)
+    return frase[0].upper() + frase[1:] + "."
+
+
+def generar_textos(cantidad, densidad_tokens=0.5, semilla=1):
+    """Textos sueltos con placeholders, etiquetas y \\n escritos, para medir su protección
+
+    Algunos llevan palabras en mayúsculas como ANIMAL o MATERIAL, que un
+    protector basado en palabras marcadoras confunde con sus marcadores.
+    """
+    aleatorio = random.Random(semilla)
+    textos = []
+    for _ in range(cantidad):
+        palabras = [aleatorio.choice(PALABRAS) for _ in range(aleatorio.randint(2, 20))]
+        while aleatorio.random() < densidad_tokens:
+            palabras.insert(aleatorio.randrange(len(palabras) + 1), aleatorio.choice(TOKENS_RIMWORLD))
+        if aleatorio.random() < 0.05:
+            palabras.insert(aleatorio.randrange(len(palabras) + 1), aleatorio.choice(("ANIMAL", "MATERIAL", "NOMBRE")))
+        textos.append(" ".join(palabras))
+    return textos
+
+
+def _escribir(ruta, lineas):
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    with open(ruta, 'w', encoding='utf-8') as f:
+        f.write('<?xml version="1.0" encoding="utf-8"?>\n<LanguageData>\n')
+        f.writelines(lineas)
+        f.write('</LanguageData>\n')
+
+
+def generar_mod(carpeta, archivos_keyed=20, archivos_definjected=40, claves_por_archivo=100,
+                densidad_placeholders=0.2, idiomas=("English", "Spanish"), proporcion_traducida=0.5,
+                semilla=1):
+    """Crea un mod en carpeta/Languages y devuelve un resumen de lo generado
+
+    El primer idioma es el original; en los demás una proporcion_traducida de
+    los textos difiere del original y el resto sigue en inglés o marcado con
+    TODO, como en un mod a medio traducir. Con la misma semilla se generan
+    siempre los mismos archivos.
+    """
+    aleatorio = random.Random(semilla)
+    carpeta_languages = os.path.join(carpeta, "Languages")
+    archivos = []  # (ruta relativa, [(clave, texto)])
+
+    for numero in range(archivos_keyed):
+        claves = [(f"Benchmark_Keyed_{numero}_{i}", _frase(aleatorio, densidad_placeholders))
+                  for i in range(claves_por_archivo)]
+        archivos.append((os.path.join("Keyed", f"Keyed_{numero}.xml"), claves))
+
+    for numero in range(archivos_definjected):
+        tipo = TIPOS_DEF[numero % len(TIPOS_DEF)]
+        claves = []
+        for i in range(claves_por_archivo):
+            campo = CAMPOS_DEF[i % len(CAMPOS_DEF)]
+            largo = campo == "description"
+            texto = _frase(aleatorio, densidad_placeholders, 10 if largo else 1, 60 if largo else 4)
+            claves.append((f"Benchmark_{numero}_{i // len(CAMPOS_DEF)}.{campo}", texto))
+        archivos.append((os.path.join("DefInjected", tipo, f"{tipo}_{numero}.xml"), claves))
+
+    claves_totales = 0
+    for indice_idioma, idioma in enumerate(idiomas):
+        for ruta_relativa, claves in archivos:
+            lineas = []
+            for clave, texto in claves:
+                if indice_idioma and aleatorio.random() < proporcion_traducida:
+                    texto = "ES " + texto
+                elif indice_idioma and aleatorio.random() < 0.1:
+                    texto = "TODO"
+                lineas.append(f"  <{clave}>{escape(texto)}</{clave}>\n")
+            _escribir(os.path.join(carpeta_languages, idioma, ruta_relativa), lineas)
+            claves_totales += len(claves)
+
+    return {
+        'carpeta_languages': carpeta_languages,
+        'idiomas': list(idiomas),
+        'archivos_por_idioma': len(archivos),
+        'claves': claves_totales,
+    }
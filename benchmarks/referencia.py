@@ -0,0 +1,44 @@
+"""Protección de placeholders anterior, para comparar con traductor.placeholders
+
+Son marcadores con palabras en mayúsculas: una pasada de str.replace por
+placeholder conocido y otra con re.sub para los demás.
+"""
+from traductor.placeholders import PATRON_PLACEHOLDER
+
+MARCADORES = {
+    '{0}': 'PRIMER_ELEMENTO',
+    '{1}': 'SEGUNDO_ELEMENTO',
+    '{2}': 'TERCER_ELEMENTO',
+    '{3}': 'CUARTO_ELEMENTO',
+    '{name}': 'NOMBRE',
+    '{pawn}': 'PERSONAJE',
+    '{item}': 'OBJETO',
+    '{number}': 'NUMERO',
+    '{amount}': 'CANTIDAD',
+    '{gender}': 'GENERO',
+    '{faction}': 'FACCIÓN',
+    '{location}': 'UBICACIÓN',
+    '{time}': 'TIEMPO',
+    '{skill}': 'HABILIDAD',
+    '{bodypart}': 'PARTE_CUERPO',
+    '{animal}': 'ANIMAL',
+    '{weapon}': 'ARMA',
+    '{material}': 'MATERIAL',
+}
+MARCADOR_GENERICO = 'ELEMENTO'
+
+
+def extraer_placeholders(texto):
+    return list(set(PATRON_PLACEHOLDER.findall(texto)))
+
+
+def proteger_placeholders(texto):
+    for placeholder, marcador in MARCADORES.items():
+        texto = texto.replace(placeholder, f' {marcador} ')
+    return PATRON_PLACEHOLDER.sub(f' {MARCADOR_GENERICO} ', texto)
+
+
+def restaurar_placeholders(texto_traducido, placeholders):
+    for placeholder, marcador in MARCADORES.items():
+        texto_traducido = texto_traducido.replace(marcador, placeholder)
+    return texto_traducido.replace(MARCADOR_GENERICO, placeholders[0] if placeholders else '{}')
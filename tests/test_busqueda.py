@@ -0,0 +1,71 @@
+import os
+import random
+
+from traductor.busqueda import IndiceBusqueda, buscar_en_proyecto, resumir_resultados, titulo_grupo
+from traductor.indice import IndiceProyecto
+from traductor.modelo import ModeloTextos
+
+PALABRAS = ["steel", "wall", "Colonist", "raid", "mental break", "{0}", "wood", "stone", "a", "de"]
+
+
+def buscar_recorriendo(modelo, consulta):
+    consulta = consulta.lower().strip()
+    return [indice for indice, fila in enumerate(modelo.filas)
+            if any(consulta in str(valor).lower() for valor in fila if valor)]
+
+
+def crear_modelo(filas=300, semilla=1):
+    aleatorio = random.Random(semilla)
+    modelo = ModeloTextos()
+    indice = IndiceBusqueda(modelo)
+    modelo.agregar([(f"Clave{numero}", " ".join(aleatorio.choices(PALABRAS, k=4)), "", "")
+                    for numero in range(filas)])
+    return modelo, indice
+
+
+def test_coincide_con_recorrer_todas_las_filas():
+    modelo, indice = crear_modelo()
+    for consulta in ["steel", "STE", "eel wa", "mental break", "{0} wood", "a", "clave1", "", "nada"]:
+        assert indice.buscar(consulta) == buscar_recorriendo(modelo, consulta), consulta
+
+
+def test_consultas_que_se_amplian_letra_a_letra():
+    modelo, indice = crear_modelo()
+    for longitud in range(1, len("colonist raid") + 1):
+        consulta = "colonist raid"[:longitud]
+        assert indice.buscar(consulta) == buscar_recorriendo(modelo, consulta), consulta
+
+
+def test_sigue_al_modelo_al_actualizar_y_limpiar():
+    modelo, indice = crear_modelo(filas=20)
+    modelo.actualizar(3, ("Clave3", "Texto", "muro de acero", ""))
+    assert 3 in indice.buscar("acero")
+    assert indice.buscar("acero") == buscar_recorriendo(modelo, "acero")
+    modelo.actualizar(3, ("Clave3", "Texto", "", ""))
+    assert indice.buscar("acero") == []
+    modelo.limpiar()
+    assert indice.buscar("steel") == []
+    modelo.agregar([("Nueva", "steel door", "", "")])
+    assert indice.buscar("steel") == [0]
+
+
+def test_buscar_en_proyecto_agrupa_por_archivo_en_todos_los_idiomas(tmp_path):
+    languages = tmp_path / "mod" / "Languages"
+    for idioma, texto in (("English", "Steel wall"), ("Spanish", "Muro de acero")):
+        keyed = languages / idioma / "Keyed"
+        keyed.mkdir(parents=True)
+        (keyed / "muros.xml").write_text(
+            f"<LanguageData><Muro>{texto}</Muro><Puerta>Door</Puerta></LanguageData>", encoding="utf-8")
+    indice = IndiceProyecto(str(tmp_path / "mod"), directorio=str(tmp_path / "indices"))
+    try:
+        agrupados = buscar_en_proyecto(indice, str(languages), "muro")
+        assert len(agrupados) == 2  # la clave Muro está en los dos idiomas
+        espanol = agrupados[str(languages / "Spanish" / "Keyed" / "muros.xml")]
+        assert titulo_grupo(espanol) == f"Spanish/{os.path.join('Keyed', 'muros.xml')} (1)"
+        assert resumir_resultados(agrupados) == "2 coincidencias en 2 archivos"
+
+        (languages / "English" / "Keyed" / "muros.xml").unlink()
+        assert list(buscar_en_proyecto(indice, str(languages), "door")) == [
+            str(languages / "Spanish" / "Keyed" / "muros.xml")]
+    finally:
+        indice.cerrar()
@@ -0,0 +1,82 @@
+import time
+
+from traductor.cache import CacheTraducciones, clave_cache
+
+
+def clave(numero):
+    return clave_cache('pruebas', 'en', 'es', f"texto {numero}")
+
+
+def test_lru_expulsa_lo_que_lleva_mas_tiempo_sin_usarse():
+    cache = CacheTraducciones(':memory:', max_entradas=10, escritura_diferida=False)
+    for numero in range(10):
+        cache[clave(numero)] = f"traducción {numero}"
+    cache.guardar()
+    time.sleep(0.01)
+    assert cache.get(clave(0)) == "traducción 0"
+    cache.guardar()
+    time.sleep(0.01)
+    for numero in range(10, 15):
+        cache[clave(numero)] = f"traducción {numero}"
+    cache.guardar()
+
+    assert len(cache) == 9
+    assert cache.expulsadas == 6
+    assert clave(0) in cache
+    assert all(clave(numero) in cache for numero in range(10, 15))
+    cache.cerrar()
+
+
+def test_lfu_conserva_lo_mas_usado():
+    cache = CacheTraducciones(':memory:', max_entradas=10, politica='lfu', escritura_diferida=False)
+    for numero in range(10):
+        cache[clave(numero)] = f"traducción {numero}"
+    for _ in range(3):
+        cache.get(clave(9))
+    cache.guardar()
+    for numero in range(10, 15):
+        cache[clave(numero)] = f"traducción {numero}"
+    cache.guardar()
+
+    assert len(cache) == 9
+    assert clave(9) in cache
+    cache.cerrar()
+
+
+def test_len_no_cuenta_dos_veces_lo_reasignado():
+    cache = CacheTraducciones(':memory:', escritura_diferida=False)
+    for numero in range(5):
+        cache[clave(numero)] = "a"
+    cache.guardar()
+    for numero in range(3, 8):
+        cache[clave(numero)] = "b"
+    assert len(cache) == 8
+    cache.guardar()
+    assert len(cache) == 8
+    cache.cerrar()
+
+
+def test_cerrar_escribe_lo_pendiente(tmp_path):
+    ruta = str(tmp_path / "cache.sqlite3")
+    # Con un intervalo tan largo el hilo de escritura no llega a escribir: lo hace cerrar()
+    cache = CacheTraducciones(ruta, intervalo_escritura=60, umbral_escritura=1000)
+    for numero in range(50):
+        cache[clave(numero)] = f"traducción {numero}"
+    cache.cerrar()
+
+    reabierta = CacheTraducciones(ruta, escritura_diferida=False)
+    assert len(reabierta) == 50
+    assert reabierta.get(clave(49)) == "traducción 49"
+    reabierta.cerrar()
+
+
+def test_escritura_en_segundo_plano_sin_guardar(tmp_path):
+    ruta = str(tmp_path / "cache.sqlite3")
+    cache = CacheTraducciones(ruta, intervalo_escritura=0.05)
+    cache[clave(1)] = "uno"
+    limite = time.monotonic() + 5
+    while cache.escrituras == 0 and time.monotonic() < limite:
+        time.sleep(0.01)
+    assert cache.escrituras >= 1
+    assert cache.estadisticas()['pendientes'] == 0
+    cache.cerrar()
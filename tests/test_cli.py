@@ -0,0 +1,60 @@
+import os
+
+import pytest
+
+from traductor.__main__ import main
+from traductor.servidor_simulado import ServidorSimulado
+
+XML = """<?xml version="1.0" encoding="utf-8"?>
+<LanguageData>
+  <Saludo>Hello {0}</Saludo>
+  <Despedida>Goodbye</Despedida>
+</LanguageData>
+"""
+
+
+def crear_mod(carpeta, roto=False):
+    keyed = os.path.join(carpeta, "Languages", "English", "Keyed")
+    os.makedirs(keyed)
+    with open(os.path.join(keyed, "textos.xml"), "w", encoding="utf-8") as f:
+        f.write(XML)
+    if roto:
+        with open(os.path.join(keyed, "roto.xml"), "w", encoding="utf-8") as f:
+            f.write("<LanguageData>\n")
+    return carpeta
+
+
+def traducir(mod, cache, url):
+    return main(['translate', mod, '--to', 'Spanish', '--servicio', 'libretranslate', '--url', url,
+                 '--tasa', '0', '--cache', cache])
+
+
+def test_mod_correcto_termina_con_0(tmp_path):
+    mod = crear_mod(str(tmp_path / "mod"))
+    with ServidorSimulado(latencia_ms=1) as servidor:
+        assert traducir(mod, str(tmp_path / "cache.sqlite3"), servidor.url) == 0
+    with open(os.path.join(mod, "Languages", "Spanish", "Keyed", "textos.xml"), encoding="utf-8") as f:
+        assert "{0}" in f.read()
+
+
+def test_archivo_roto_termina_con_1_y_se_nombra(tmp_path, capsys):
+    mod = crear_mod(str(tmp_path / "mod"), roto=True)
+    with ServidorSimulado(latencia_ms=1) as servidor:
+        assert traducir(mod, str(tmp_path / "cache.sqlite3"), servidor.url) == 1
+    assert "roto.xml: no se pudo leer" in capsys.readouterr().err
+
+
+def test_cache_que_no_se_puede_abrir_termina_con_1(tmp_path, capsys):
+    mod = crear_mod(str(tmp_path / "mod"))
+    (tmp_path / "archivo").write_text("no es una carpeta")
+    assert traducir(mod, str(tmp_path / "archivo" / "cache.sqlite3"), "http://127.0.0.1:9") == 1
+    assert "No se pudo abrir el cache" in capsys.readouterr().err
+
+
+def test_deepl_sin_clave_es_un_error_de_argumentos(tmp_path, capsys):
+    mod = crear_mod(str(tmp_path / "mod"))
+    with pytest.raises(SystemExit) as salida:
+        main(['translate', mod, '--to', 'Spanish', '--servicio', 'deepl', '--cache', str(tmp_path / "c.sqlite3")])
+    assert salida.value.code == 2
+    assert "deepl" in capsys.readouterr().err
+    assert not (tmp_path / "c.sqlite3").exists()
@@ -0,0 +1,36 @@
+import threading
+
+from traductor.cola_ui import ColaUI, InterfazCerrada
+
+
+class VentanaFalsa:
+    """Sin bucle de Tk: after() no programa nada, así la cola no se vacía sola"""
+
+    def after(self, milisegundos, funcion):
+        pass
+
+
+def test_cerrar_libera_a_quien_espera_en_ejecutar():
+    cola = ColaUI(VentanaFalsa(), lambda *args: None, lambda mensaje: None)
+    errores = []
+
+    def esperar_dialogo():
+        try:
+            cola.ejecutar(lambda: "respuesta")
+        except InterfazCerrada as e:
+            errores.append(e)
+
+    hilo = threading.Thread(target=esperar_dialogo)
+    hilo.start()
+    while not cola._esperando:
+        hilo.join(0.01)
+    cola.cerrar()
+    hilo.join(5)
+    assert not hilo.is_alive()
+    assert len(errores) == 1
+
+    # Después de cerrar ya no se espera: falla en el acto
+    hilo = threading.Thread(target=esperar_dialogo)
+    hilo.start()
+    hilo.join(5)
+    assert len(errores) == 2
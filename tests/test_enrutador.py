@@ -0,0 +1,90 @@
+import time
+
+import pytest
+
+from traductor.enrutador import UMBRAL_FALLOS, Backend, Enrutador, crear_backends, servicios_configurados
+from traductor.limitador import LimitadorTasa
+from traductor.motor import crear_motor
+from traductor.servicios import ErrorServicio
+
+
+def backend_falso(nombre, error=None, latencia=0.0):
+    """Backend sin límite de tasa cuyo cliente devuelve "nombre:texto" o lanza error"""
+    class Cliente:
+        def translate(self, texto):
+            time.sleep(latencia)
+            if error is not None:
+                raise error
+            return f"{nombre}:{texto}"
+    return Backend(nombre, lambda origen, destino: Cliente(), limitador=LimitadorTasa(0))
+
+
+def test_otro_servicio_releva_al_que_falla():
+    caido = backend_falso('caido', ErrorServicio("503", 503))
+    enrutador = Enrutador([caido, backend_falso('sano')])
+    assert enrutador.traducir("Hola", 'en', 'es') == "sano:Hola"
+    assert enrutador.relevos == 1
+    assert enrutador.estadisticas()['caido']['errores'] == 1
+    assert "1 peticiones relevadas" in enrutador.describir_reparto()
+
+
+def test_un_servicio_caido_se_aparta_tras_el_umbral():
+    # El caído falla rápido y sigue pareciendo el más barato hasta que se abre su circuito
+    caido = backend_falso('caido', ErrorServicio("503", 503))
+    enrutador = Enrutador([caido, backend_falso('sano', latencia=0.01)])
+    for _ in range(UMBRAL_FALLOS + 3):
+        assert enrutador.traducir("Hola", 'en', 'es') == "sano:Hola"
+    assert caido.cortacircuitos.abierto
+    assert caido.peticiones == UMBRAL_FALLOS
+    assert enrutador.describir_reparto().startswith("caido ")
+
+
+def test_un_429_pausa_el_servicio():
+    limitado = backend_falso('limitado', ErrorServicio("429", 429, reintentar_tras=30))
+    sano = backend_falso('sano')
+    enrutador = Enrutador([limitado, sano])
+    enrutador.traducir("Hola", 'en', 'es')
+    enrutador.traducir("Adiós", 'en', 'es')
+    assert (limitado.peticiones, limitado.limitadas, sano.peticiones) == (1, 1, 2)
+    assert limitado.tiempo_hasta_disponible(0) > 0
+
+
+def test_si_fallan_todos_se_relanza_el_ultimo_error():
+    enrutador = Enrutador([backend_falso('a', ErrorServicio("503", 503)),
+                           backend_falso('b', ErrorServicio("403", 403))])
+    with pytest.raises(ErrorServicio) as error:
+        enrutador.traducir("Hola", 'en', 'es')
+    assert error.value.codigo == 403
+    assert enrutador.relevos == 0
+
+
+def test_enrutador_sin_servicios():
+    with pytest.raises(ValueError):
+        Enrutador([])
+
+
+def test_crear_backends_nombra_cada_url_del_mismo_servicio():
+    backends = crear_backends([{'servicio': 'libretranslate', 'url': "http://a"},
+                               {'servicio': 'libretranslate', 'url': "http://b"},
+                               {'servicio': 'google', 'url': "ignorada"}])
+    assert [backend.nombre for backend in backends] == ["libretranslate@http://a", "libretranslate@http://b", "google"]
+
+
+def test_deepl_sin_clave_falla_al_configurar():
+    with pytest.raises(ValueError):
+        crear_backends([{'servicio': 'deepl'}])
+
+
+def test_crear_motor_con_uno_o_varios_servicios():
+    assert crear_motor().servicio == 'google'
+    motor = crear_motor(crear_backends([{'servicio': 'libretranslate', 'nombre': 'local'}]))
+    assert (motor.servicio, motor.enrutador) == ('local', None)
+    motor = crear_motor(crear_backends([{'servicio': 'libretranslate'}, {'servicio': 'google'}]))
+    assert motor.enrutador is not None and len(motor.enrutador.backends) == 2
+
+
+def test_servicios_configurados_lee_config_json(tmp_path):
+    config = tmp_path / "config.json"
+    assert servicios_configurados(str(config)) == []
+    config.write_text('{"hilos_traduccion": 4, "servicios": [{"servicio": "google"}]}', encoding='utf-8')
+    assert servicios_configurados(str(config)) == [{'servicio': 'google'}]
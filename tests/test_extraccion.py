@@ -0,0 +1,55 @@
+from traductor.extraccion import extraer_textos_xml, guardar_traducciones_xml
+
+KEYED = """<?xml version="1.0" encoding="utf-8"?>
+<LanguageData>
+  <Saludo>Hello {0}</Saludo>
+  <Vacio></Vacio>
+  <Anidado><Interior>No es Keyed</Interior></Anidado>
+  <Despedida>Goodbye</Despedida>
+</LanguageData>
+"""
+
+DEF_INJECTED = """<?xml version="1.0" encoding="utf-8"?>
+<Defs>
+  <ThingDef label="stone wall">
+    <description>A solid wall.</description>
+    <comps><li>Extra text</li></comps>
+  </ThingDef>
+</Defs>
+"""
+
+
+def escribir(carpeta, nombre, contenido):
+    ruta = carpeta / nombre
+    ruta.write_text(contenido, encoding="utf-8")
+    return str(ruta)
+
+
+def test_keyed_solo_hijos_directos_con_texto(tmp_path):
+    ruta = escribir(tmp_path, "keyed.xml", KEYED)
+    assert extraer_textos_xml(ruta) == [
+        {'id': 'Saludo', 'texto': 'Hello {0}', 'tipo': 'keyed'},
+        {'id': 'Despedida', 'texto': 'Goodbye', 'tipo': 'keyed'},
+    ]
+
+
+def test_guardar_y_volver_a_leer_keyed(tmp_path):
+    ruta = escribir(tmp_path, "keyed.xml", KEYED)
+    guardados = guardar_traducciones_xml(ruta, {'Saludo': 'Hola {0}', 'Vacio': 'no se aplica', 'Otro': 'x'})
+    assert guardados == 1
+    textos = {registro['id']: registro['texto'] for registro in extraer_textos_xml(ruta)}
+    assert textos == {'Saludo': 'Hola {0}', 'Despedida': 'Goodbye'}
+
+
+def test_guardar_y_volver_a_leer_elementos_y_atributos(tmp_path):
+    ruta = escribir(tmp_path, "defs.xml", DEF_INJECTED)
+    registros = extraer_textos_xml(ruta)
+    assert [(registro['id'], registro['tipo']) for registro in registros] == [
+        ('Defs/ThingDef@label', 'atributo'),
+        ('Defs/ThingDef/description', 'elemento'),
+        ('Defs/ThingDef/comps/li', 'elemento'),
+    ]
+    traducciones = {'Defs/ThingDef@label': 'muro de piedra', 'Defs/ThingDef/description': 'Un muro sólido.'}
+    assert guardar_traducciones_xml(ruta, traducciones) == 2
+    textos = {registro['id']: registro['texto'] for registro in extraer_textos_xml(ruta)}
+    assert textos == dict(traducciones, **{'Defs/ThingDef/comps/li': 'Extra text'})
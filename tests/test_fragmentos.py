@@ -0,0 +1,48 @@
+import random
+
+from traductor.fragmentos import dividir_texto, unir_fragmentos
+from traductor.placeholders import PATRON_INDIVISIBLE
+
+PIEZAS = ["word", "other", "{PAWN_nameDef}", "{0}", "<b>", "</b>", "[[3]]", "\\n", "\n", "\n\n", ". ", " ", "  ",
+          "larguísimapalabrasinespacios" * 3]
+
+
+def textos_al_azar(cantidad, semilla=7):
+    aleatorio = random.Random(semilla)
+    for _ in range(cantidad):
+        yield "".join(aleatorio.choice(PIEZAS) for _ in range(aleatorio.randint(1, 120)))
+
+
+def test_fragmentos_y_separadores_reconstruyen_el_texto():
+    for texto in textos_al_azar(300):
+        for limite in (40, 100, 500):
+            fragmentos, separadores = dividir_texto(texto, limite)
+            assert len(fragmentos) == len(separadores)
+            assert "".join(f + s for f, s in zip(fragmentos, separadores)) == texto
+            assert separadores[-1] == ""
+            assert all(len(fragmento) <= limite for fragmento in fragmentos)
+
+
+def test_no_parte_placeholders():
+    texto = "{PAWN_labelShort}" * 30
+    fragmentos, _ = dividir_texto(texto, 50)
+    for fragmento in fragmentos:
+        assert PATRON_INDIVISIBLE.sub("", fragmento) == ""
+
+
+def test_prefiere_cortar_por_parrafos():
+    texto = "Primer párrafo con frases. Otra frase.\n\nSegundo párrafo."
+    fragmentos, separadores = dividir_texto(texto, 45)
+    assert fragmentos == ["Primer párrafo con frases. Otra frase.", "Segundo párrafo."]
+    assert separadores == ["\n\n", ""]
+
+
+def test_unir_fragmentos_conserva_los_separadores():
+    texto = "Uno. Dos.\n\nTres cuatro cinco.\nSeis."
+    fragmentos, separadores = dividir_texto(texto, 12)
+    traducidos = [f" {fragmento.upper()} " for fragmento in fragmentos]  # los servicios añaden espacios
+    assert unir_fragmentos(traducidos, separadores) == texto.upper()
+
+
+def test_texto_corto_queda_entero():
+    assert dividir_texto("corto", 10) == (["corto"], [""])
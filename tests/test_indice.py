@@ -0,0 +1,105 @@
+import os
+import re
+
+import pytest
+
+from traductor.indice import IndiceProyecto, leer_por_bloques
+
+XML = """<?xml version="1.0" encoding="utf-8"?>
+<LanguageData>
+  <Saludo>{}</Saludo>
+  <Despedida>Goodbye</Despedida>
+</LanguageData>
+"""
+
+
+def escribir(ruta, saludo="Hello"):
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    with open(ruta, "w", encoding="utf-8") as f:
+        f.write(XML.format(saludo))
+    return ruta
+
+
+@pytest.fixture
+def mod(tmp_path):
+    keyed = tmp_path / "mod" / "Languages" / "English" / "Keyed"
+    rutas = [escribir(str(keyed / f"textos{numero}.xml")) for numero in range(3)]
+    indice = IndiceProyecto(str(tmp_path / "mod"), directorio=str(tmp_path / "indices"))
+    yield indice, rutas
+    indice.cerrar()
+
+
+def test_solo_se_reanaliza_lo_que_cambio(mod):
+    indice, rutas = mod
+    assert indice.sincronizar(rutas) == 3
+    assert indice.sincronizar(rutas) == 0
+
+    # Mismo contenido con otro mtime: el hash coincide y solo se actualiza la huella
+    os.utime(rutas[0], (1, 1))
+    assert indice.sincronizar(rutas) == 0
+    assert indice.vigente(rutas[0])
+
+    escribir(rutas[1], "Hi there")
+    assert indice.sincronizar(rutas) == 1
+    assert indice.registros(rutas[1])[0] == {'id': 'Saludo', 'texto': 'Hi there', 'tipo': 'keyed'}
+
+
+def test_el_indice_sobrevive_a_reabrir(mod, tmp_path):
+    indice, rutas = mod
+    indice.sincronizar(rutas)
+    indice.cerrar()
+    reabierto = IndiceProyecto(str(tmp_path / "mod"), directorio=str(tmp_path / "indices"))
+    try:
+        assert reabierto.sincronizar(rutas) == 0
+        assert len(reabierto.registros(rutas[2])) == 2
+    finally:
+        reabierto.cerrar()
+
+
+def test_xml_roto_se_recuerda_con_su_error(mod):
+    indice, rutas = mod
+    with open(rutas[0], "w", encoding="utf-8") as f:
+        f.write("<LanguageData>\n")
+    assert indice.sincronizar(rutas) == 3
+    assert indice.error(rutas[0])
+    assert indice.registros(rutas[0]) == []
+    assert indice.sincronizar(rutas) == 0
+
+
+def test_olvidar_ausentes(mod):
+    indice, rutas = mod
+    indice.sincronizar(rutas)
+    os.remove(rutas[2])
+    assert indice.olvidar_ausentes(os.path.dirname(rutas[2]), rutas[:2]) == 1
+    assert indice.registros(rutas[2]) == []
+
+
+def test_leer_por_bloques_guarda_lo_leido(mod):
+    indice, rutas = mod
+    assert [len(bloque) for bloque in leer_por_bloques(rutas[0], indice, tamano_bloque=1)] == [1, 1]
+    assert indice.registros_vigentes(rutas[0]) == indice.registros(rutas[0])
+
+
+@pytest.mark.parametrize("fts", [True, False])
+def test_buscar_subcadena_con_y_sin_trigramas(mod, fts):
+    indice, rutas = mod
+    escribir(rutas[1], "Hello 100% of_the colonists")
+    indice.sincronizar(rutas)
+    indice.fts_disponible = indice.fts_disponible and fts
+    assert [(r['ruta'], r['id']) for r in indice.buscar("COLONIST")] == [(rutas[1], 'Saludo')]
+    # Comodines de LIKE y consultas más cortas que un trigrama, tal cual
+    assert [r['ruta'] for r in indice.buscar("0%")] == [rutas[1]]
+    assert [r['ruta'] for r in indice.buscar("f_")] == [rutas[1]]
+    assert len(indice.buscar("goodbye")) == 3
+    assert len(indice.buscar("despedida")) == 3  # también en la clave
+    assert len(indice.buscar("goodbye", limite=2)) == 2
+
+
+def test_buscar_con_regex(mod):
+    indice, rutas = mod
+    escribir(rutas[2], "Hello {PAWN_nameDef}")
+    indice.sincronizar(rutas)
+    assert [r['texto'] for r in indice.buscar(r"\{PAWN_\w+\}", regex=True)] == ["Hello {PAWN_nameDef}"]
+    assert [r['orden'] for r in indice.buscar(r"^good", regex=True) if r['ruta'] == rutas[0]] == [1]
+    with pytest.raises(re.error):
+        indice.buscar("(", regex=True)
@@ -0,0 +1,37 @@
+import threading
+import time
+
+from traductor.limitador import LimitadorTasa, configurar_limitador, obtener_limitador
+
+
+def test_la_rafaga_no_espera():
+    limitador = LimitadorTasa(tasa=1, rafaga=5)
+    assert sum(limitador.adquirir() for _ in range(5)) == 0
+    assert limitador.espera_estimada() > 0.9
+
+
+def test_ritmo_sostenido_con_varios_hilos():
+    limitador = LimitadorTasa(tasa=200, rafaga=1)
+    inicio = time.monotonic()
+    hilos = [threading.Thread(target=lambda: [limitador.adquirir() for _ in range(10)]) for _ in range(4)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    # 40 peticiones con una ficha de ráfaga: 39 turnos a 200 por segundo
+    assert time.monotonic() - inicio >= 39 / 200 * 0.9
+    assert limitador.peticiones == 40
+    assert limitador.esperas > 0
+
+
+def test_tasa_cero_no_limita():
+    limitador = LimitadorTasa(tasa=0)
+    assert all(limitador.adquirir() == 0 for _ in range(100))
+    assert limitador.peticiones == 100
+
+
+def test_configurar_conserva_los_contadores():
+    limitador = configurar_limitador('pruebas_configurar', tasa=0)
+    limitador.adquirir()
+    assert configurar_limitador('pruebas_configurar', tasa=50, rafaga=2) is obtener_limitador('pruebas_configurar')
+    assert (limitador.tasa, limitador.rafaga, limitador.peticiones) == (50, 2, 1)
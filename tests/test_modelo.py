@@ -0,0 +1,52 @@
+from traductor.modelo import ESTADO_CORREGIDO, ModeloTextos, filas_de_registros
+
+
+def crear_modelo(*traducciones):
+    modelo = ModeloTextos()
+    modelo.agregar([(f"Clave{numero}", f"Texto {numero}", traduccion, "")
+                    for numero, traduccion in enumerate(traducciones)])
+    return modelo
+
+
+def test_texto_mas_largo_se_sigue_al_agregar_y_actualizar():
+    modelo = crear_modelo("corto", "bastante más largo", "")
+    assert modelo.texto_mas_largo(2) == "bastante más largo"
+    modelo.actualizar(2, ("Clave2", "Texto 2", "el más largo de todos ahora", ""))
+    assert modelo.texto_mas_largo(2) == "el más largo de todos ahora"
+
+
+def test_al_acortar_la_mas_larga_se_vuelve_a_medir():
+    modelo = crear_modelo("corto", "bastante más largo", "medio texto")
+    modelo.actualizar(1, ("Clave1", "Texto 1", "x", ""))
+    assert modelo.texto_mas_largo(2) == "medio texto"
+    assert modelo.longitudes_maximas[2] == len("medio texto")
+
+
+def test_ancho_sugerido_se_limita():
+    modelo = crear_modelo("a" * 10, "b" * 500)
+    assert modelo.ancho_sugerido(2, medir=len, minimo=50, maximo=300) == 300
+    modelo.actualizar(1, ("Clave1", "Texto 1", "b", ""))
+    assert modelo.ancho_sugerido(2, medir=len, minimo=50, maximo=300) == 50
+    assert modelo.ancho_sugerido(2, medir=len, minimo=5, maximo=300) == 10
+    assert crear_modelo().ancho_sugerido(0) == 200
+
+
+def test_contadores_al_agregar_actualizar_y_limpiar():
+    modelo = crear_modelo("uno", "", "  ")
+    assert modelo.contadores == {'total': 3, 'traducidos': 1, 'corregidos': 0}
+    modelo.actualizar(1, ("Clave1", "Texto 1", "dos", ESTADO_CORREGIDO))
+    assert modelo.contadores == {'total': 3, 'traducidos': 2, 'corregidos': 1}
+    modelo.actualizar(0, ("Clave0", "Texto 0", "", ""))
+    assert modelo.contadores == {'total': 3, 'traducidos': 1, 'corregidos': 1}
+    modelo.limpiar()
+    assert modelo.contadores == {'total': 0, 'traducidos': 0, 'corregidos': 0}
+
+
+def test_actualizacion_de_otra_generacion_se_descarta():
+    modelo = crear_modelo("uno")
+    generacion = modelo.generacion
+    modelo.limpiar()
+    modelo.agregar(filas_de_registros([{'id': 'Nueva', 'texto': "New"}], "Pendiente"))
+    assert not modelo.actualizar(0, ("Clave0", "Texto 0", "viejo", ""), generacion)
+    assert modelo.valores(0) == ("Nueva", "New", "", "Pendiente")
+    assert modelo.contadores['traducidos'] == 0
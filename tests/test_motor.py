@@ -0,0 +1,164 @@
+import threading
+
+from traductor.limitador import configurar_limitador
+from traductor.motor import LIMITE_CARACTERES, MAX_TEXTOS_POR_LOTE, MotorTraduccion, agrupar_duplicados, empaquetar_lotes
+
+SERVICIO = 'pruebas'
+configurar_limitador(SERVICIO, 1000, 1000)
+
+
+def por_lineas(texto):
+    return "\n".join(linea.upper() for linea in texto.split("\n"))
+
+
+def crear_motor(traducir=por_lineas, max_hilos=4):
+    """Motor con un cliente falso; devuelve (motor, lista de peticiones recibidas)"""
+    peticiones = []
+    lock = threading.Lock()
+
+    class Cliente:
+        def __init__(self, origen, destino):
+            pass
+
+        def translate(self, texto):
+            with lock:
+                peticiones.append(texto)
+            return traducir(texto)
+
+    return MotorTraduccion('en', 'es', max_hilos=max_hilos, fabrica_cliente=Cliente, servicio=SERVICIO), peticiones
+
+
+def test_empaquetar_lotes_cubre_todo_en_tramos_contiguos():
+    textos = ["corto"] * 250 + ["con\nsalto"] + ["x" * 400] + ["corto"] * 3
+    lotes = empaquetar_lotes(textos)
+    assert [indice for lote in lotes for indice in lote] == list(range(len(textos)))
+    assert all(len(lote) <= MAX_TEXTOS_POR_LOTE for lote in lotes)
+    assert [250] in lotes and [251] in lotes
+
+
+def test_empaquetar_lotes_respeta_el_limite_de_caracteres():
+    textos = ["a" * 290] * 40
+    for lote in empaquetar_lotes(textos, limite=1000):
+        assert sum(len(textos[indice]) for indice in lote) + len(lote) - 1 <= 1000
+
+
+def test_lote_en_una_peticion_separado_por_texto():
+    motor, peticiones = crear_motor()
+    resultados = list(motor.traducir_lote(["uno", "dos", "tres"]))
+    assert resultados == [(0, "UNO", None), (1, "DOS", None), (2, "TRES", None)]
+    assert peticiones == ["uno\ndos\ntres"]
+
+
+def test_respuesta_descuadrada_se_traduce_texto_a_texto():
+    # El servicio une las líneas: el lote no se puede dividir y se pide cada texto
+    motor, peticiones = crear_motor(lambda texto: texto.replace("\n", " ").upper())
+    ejecucion = motor.traducir_lote(["uno", "dos", "tres"])
+    assert [traduccion for _, traduccion, _ in ejecucion] == ["UNO", "DOS", "TRES"]
+    assert ejecucion.resumen['lotes_divididos'] == 1
+    assert sorted(peticiones) == sorted(["uno\ndos\ntres", "uno", "dos", "tres"])
+
+
+def test_error_en_un_texto_no_afecta_a_los_demas():
+    def traducir(texto):
+        if "\n" in texto or texto == "malo":
+            raise ValueError("no")
+        return texto.upper()
+
+    motor, _ = crear_motor(traducir)
+    resultados = list(motor.traducir_lote(["bueno", "malo", "otro"]))
+    assert [traduccion for _, traduccion, _ in resultados] == ["BUENO", None, "OTRO"]
+    assert isinstance(resultados[1][2], ValueError)
+
+
+def test_cada_ejecucion_tiene_su_resumen():
+    def traducir(texto):
+        if texto == "malo":
+            raise ValueError("no")
+        return texto.upper()
+
+    motor, _ = crear_motor(traducir)
+    primera = motor.traducir_lote(["a", "b", "a", "malo"], agrupar=False)
+    segunda = motor.traducir_lote(["c", "c"], agrupar=False)
+    # Intercaladas, como dos traducciones lanzadas a la vez
+    next(primera)
+    list(segunda)
+    list(primera)
+    assert (primera.resumen['textos'], primera.resumen['unicos']) == (4, 3)
+    assert (segunda.resumen['textos'], segunda.resumen['unicos']) == (2, 1)
+    assert primera.resumen['resiliencia']['llamadas'] == 3
+    assert primera.resumen['resiliencia']['errores']['otro'] == 1
+    assert segunda.resumen['resiliencia']['llamadas'] == 1
+
+
+def test_agrupar_duplicados_conserva_el_primero():
+    unicos, mapa = agrupar_duplicados(["Hola", "adiós", " hola ", "ADIÓS", "otro"])
+    assert unicos == ["Hola", "adiós", "otro"]
+    assert mapa == [0, 1, 0, 1, 2]
+
+
+def test_duplicados_se_traducen_una_vez_y_llegan_en_orden():
+    motor, peticiones = crear_motor(max_hilos=4)
+    textos = [f"texto {numero % 7}" for numero in range(50)]
+    ejecucion = motor.traducir_lote(textos, agrupar=False)
+    resultados = list(ejecucion)
+    assert [indice for indice, _, _ in resultados] == list(range(50))
+    assert [traduccion for _, traduccion, _ in resultados] == [texto.upper() for texto in textos]
+    assert len(peticiones) == 7
+    assert ejecucion.resumen['unicos'] == 7
+
+
+def test_resultados_entregados_se_liberan():
+    motor, _ = crear_motor(max_hilos=2)
+    textos = [f"texto {numero}" for numero in range(200)] + ["texto 0"]
+    ejecucion = motor.traducir_lote(textos, agrupar=False)
+    for indice, _, _ in ejecucion:
+        if indice == 150:
+            # El generador está suspendido en el yield: sus variables siguen vivas
+            pendientes = ejecucion._resultados.gi_frame.f_locals['resultados_piezas']
+            # Quedan el texto repetido al final y lo traducido que aún no se entregó
+            assert 0 in pendientes
+            assert len(pendientes) <= 1 + 4 * motor.max_hilos
+    assert pendientes == {}
+
+
+def texto_largo():
+    parrafo = "The colonist {PAWN_nameDef} walks to the storm and sees nothing at all. " * 20
+    return "\n\n".join(parrafo.strip() for _ in range(8))
+
+
+def test_texto_largo_se_parte_y_se_reune_en_el_lote():
+    motor, peticiones = crear_motor()
+    texto = texto_largo()
+    assert len(texto) > LIMITE_CARACTERES
+    ejecucion = motor.traducir_lote(["corto", texto, "otro"])
+    assert [traduccion for _, traduccion, _ in ejecucion] == ["CORTO", texto.upper(), "OTRO"]
+    assert ejecucion.resumen['fragmentados'] == 1
+    assert all(len(peticion) <= LIMITE_CARACTERES for peticion in peticiones)
+
+
+def test_traducir_texto_largo_desde_el_pool_no_se_bloquea():
+    # Con un solo hilo, esperar a fragmentos enviados al mismo pool no terminaría nunca
+    motor, _ = crear_motor(max_hilos=1)
+    texto = texto_largo()
+    futuro = motor._obtener_ejecutor().submit(motor.traducir_texto, texto)
+    assert futuro.result(timeout=10) == texto.upper()
+    motor.cerrar()
+
+
+def test_traducir_texto_largo_envia_los_fragmentos_en_paralelo():
+    empezados = []
+    varios = threading.Event()
+
+    def traducir(texto):
+        # Cada fragmento espera a que empiece otro: en serie no terminaría
+        empezados.append(texto)
+        if len(empezados) > 1:
+            varios.set()
+        assert varios.wait(timeout=5)
+        return texto.upper()
+
+    motor, peticiones = crear_motor(traducir, max_hilos=4)
+    texto = texto_largo()
+    assert motor.traducir_texto(texto) == texto.upper()
+    assert len(peticiones) > 1
+    motor.cerrar()
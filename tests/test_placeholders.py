@@ -0,0 +1,62 @@
+import pytest
+
+from traductor.placeholders import (CENTINELA, ErrorPlaceholders, extraer_placeholders, proteger_placeholders,
+                                    restaurar_placeholders)
+
+TEXTOS = [
+    "{0} hits {1} for {2} damage",
+    "{PAWN_labelShort}{0}{1}",  # contiguos
+    "<color=#FF0000>{PAWN_nameDef}</color> is <b>angry</b>",  # anidados en etiquetas
+    "[PAWN_nameDef]'s <i><b>{0}</b></i>",
+    "First line\\nSecond line with {0}\\n\\nThird",
+    "\\nstarts and ends with escaped newline\\n",
+    "real\nnewline and {0}",
+    "no tokens at all",
+]
+
+
+@pytest.mark.parametrize("texto", TEXTOS)
+def test_proteger_y_restaurar_devuelve_el_original(texto):
+    protegido, tokens = proteger_placeholders(texto)
+    assert restaurar_placeholders(protegido, tokens) == texto
+
+
+@pytest.mark.parametrize("texto", TEXTOS)
+def test_el_servicio_no_ve_ningun_token(texto):
+    protegido, tokens = proteger_placeholders(texto)
+    for token in tokens:
+        if token != "\n":
+            assert token not in protegido
+    assert "{" not in protegido and "<" not in protegido
+
+
+def test_tokens_contiguos_reciben_centinelas_distintos():
+    protegido, tokens = proteger_placeholders("{a}{b}<b>")
+    assert protegido == CENTINELA.format(0) + CENTINELA.format(1) + CENTINELA.format(2)
+    assert tokens == ["{a}", "{b}", "<b>"]
+
+
+def test_restaurar_admite_espacios_dentro_del_centinela():
+    _, tokens = proteger_placeholders("{0} y {1}")
+    assert restaurar_placeholders("[ [1] ] and [[ 0 ]]", tokens) == "{1} and {0}"
+
+
+def test_centinela_desconocido_se_deja_tal_cual():
+    assert restaurar_placeholders("[[5]] x [[0]]", ["{0}"]) == "[[5]] x {0}"
+
+
+def test_centinela_perdido_es_un_error():
+    protegido, tokens = proteger_placeholders("{PAWN_nameDef} hits {1}")
+    with pytest.raises(ErrorPlaceholders) as error:
+        restaurar_placeholders(protegido.replace(CENTINELA.format(0), ""), tokens)
+    assert error.value.faltan == ["'{PAWN_nameDef}'"]
+
+
+def test_corchetes_de_texto_se_traducen():
+    protegido, tokens = proteger_placeholders("[WIP] [Note] for [PAWN_nameDef] and [recipient_pronoun]")
+    assert protegido.startswith("[WIP] [Note] for ")
+    assert tokens == ["[PAWN_nameDef]", "[recipient_pronoun]"]
+
+
+def test_extraer_placeholders_sin_repetir():
+    assert sorted(extraer_placeholders("{0} {1} {0}")) == ["{0}", "{1}"]
@@ -0,0 +1,14 @@
+from traductor import procesos
+
+
+def test_pocos_elementos_se_procesan_aqui():
+    # Una lambda no se puede enviar a otro proceso: solo funciona si no se usa el pool
+    assert list(procesos.mapear(lambda numero: numero * 2, [1, 2, 3])) == [2, 4, 6]
+
+
+def test_el_pool_se_reutiliza_y_conserva_el_orden():
+    numeros = list(range(-50, 50))
+    assert list(procesos.mapear(abs, numeros)) == [abs(numero) for numero in numeros]
+    ejecutor = procesos.obtener_ejecutor()
+    assert list(procesos.mapear(abs, numeros)) == [abs(numero) for numero in numeros]
+    assert procesos.obtener_ejecutor() is ejecutor
@@ -0,0 +1,118 @@
+import threading
+import time
+
+import pytest
+
+from traductor.resiliencia import (CONEXION, DEMASIADO_LARGO, LIMITADO, OTRO, SERVIDOR, Cortacircuitos,
+                                   Resiliencia, clasificar_error, estadisticas_vacias)
+from traductor.servicios import ErrorServicio
+
+
+def fallar_veces(veces, error):
+    """Función que falla las primeras veces con error y luego devuelve 'ok'"""
+    llamadas = []
+
+    def funcion():
+        llamadas.append(1)
+        if len(llamadas) <= veces:
+            raise error
+        return 'ok'
+    return funcion, llamadas
+
+
+def test_clasificar_error():
+    assert clasificar_error(ErrorServicio("sin respuesta")) == CONEXION
+    assert clasificar_error(ErrorServicio("429", 429)) == LIMITADO
+    assert clasificar_error(ErrorServicio("413", 413)) == DEMASIADO_LARGO
+    assert clasificar_error(ErrorServicio("503", 503)) == SERVIDOR
+    assert clasificar_error(ErrorServicio("408", 408)) == SERVIDOR
+    assert clasificar_error(ErrorServicio("403", 403)) == OTRO
+    assert clasificar_error(TimeoutError()) == CONEXION
+    assert clasificar_error(ValueError()) == OTRO
+
+
+def test_el_cortacircuitos_se_abre_tras_el_umbral():
+    circuito = Cortacircuitos(umbral_fallos=3, enfriamiento=60)
+    for _ in range(2):
+        circuito.registrar_fallo()
+    assert not circuito.abierto and circuito.intentar()
+    circuito.registrar_fallo()
+    assert circuito.abierto and circuito.aperturas == 1
+    assert not circuito.intentar()
+    assert 59 < circuito.tiempo_restante() <= 60
+
+
+def test_un_exito_reinicia_los_fallos_seguidos():
+    circuito = Cortacircuitos(umbral_fallos=3, enfriamiento=60)
+    for _ in range(2):
+        circuito.registrar_fallo()
+    circuito.registrar_exito()
+    for _ in range(2):
+        circuito.registrar_fallo()
+    assert not circuito.abierto
+
+
+def test_tras_el_enfriamiento_pasa_una_sola_prueba():
+    circuito = Cortacircuitos(umbral_fallos=1, enfriamiento=0.05)
+    circuito.registrar_fallo()
+    assert circuito.esperar() >= 0.04
+    # Mientras la prueba está en marcha no pasa nadie más
+    assert circuito.abierto and not circuito.intentar()
+
+    # La prueba falla: vuelve a abrirse
+    circuito.registrar_fallo()
+    assert circuito.aperturas == 2 and circuito.tiempo_restante() > 0
+
+    # La siguiente prueba sale bien: los que esperaban pasan
+    assert circuito.esperar() >= 0.04
+    esperando = threading.Thread(target=circuito.esperar)
+    esperando.start()
+    circuito.registrar_exito()
+    esperando.join(5)
+    assert not esperando.is_alive() and not circuito.abierto
+
+
+def test_liberar_prueba_deja_pasar_otra():
+    circuito = Cortacircuitos(umbral_fallos=1, enfriamiento=0.01)
+    circuito.registrar_fallo()
+    time.sleep(0.02)
+    assert circuito.intentar() and not circuito.intentar()
+    circuito.liberar_prueba()
+    assert circuito.intentar()
+
+
+def test_reintenta_los_errores_transitorios():
+    resiliencia = Resiliencia(espera_base=0.001, semilla=1)
+    funcion, llamadas = fallar_veces(2, ErrorServicio("503", 503))
+    estadisticas = estadisticas_vacias()
+    assert resiliencia.llamar(funcion, estadisticas=estadisticas) == 'ok'
+    assert len(llamadas) == 3
+    assert estadisticas['reintentos'] == 2 and estadisticas['errores'][SERVIDOR] == 2
+    assert resiliencia.estadisticas()['llamadas'] == 1
+
+
+def test_no_reintenta_los_errores_definitivos():
+    resiliencia = Resiliencia(espera_base=0.001)
+    funcion, llamadas = fallar_veces(1, ErrorServicio("403", 403))
+    with pytest.raises(ErrorServicio):
+        resiliencia.llamar(funcion)
+    assert len(llamadas) == 1 and resiliencia.estadisticas()['reintentos'] == 0
+
+
+def test_relanza_el_ultimo_error_al_agotar_los_intentos():
+    resiliencia = Resiliencia(max_intentos=3, espera_base=0.001,
+                              cortacircuitos=Cortacircuitos(umbral_fallos=10))
+    funcion, llamadas = fallar_veces(5, ErrorServicio("429", 429))
+    with pytest.raises(ErrorServicio):
+        resiliencia.llamar(funcion)
+    estadisticas = resiliencia.estadisticas()
+    assert len(llamadas) == 3 and estadisticas['agotados'] == 1
+    # Los 429 no cuentan como servicio caído
+    assert estadisticas['aperturas'] == 0
+
+
+def test_la_espera_respeta_retry_after():
+    resiliencia = Resiliencia(espera_base=0.001, espera_maxima=10)
+    assert resiliencia.espera(0, ErrorServicio("429", 429, reintentar_tras=2)) == 2
+    assert resiliencia.espera(0, ErrorServicio("429", 429, reintentar_tras=60)) == 10
+    assert resiliencia.espera(3) <= 0.008
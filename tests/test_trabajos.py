@@ -0,0 +1,132 @@
+import threading
+
+from traductor.trabajos import CANCELADO, EN_CURSO, FALLIDO, TERMINADO, GestorTrabajos, filas_panel, trabajo_actual
+
+
+def esperar_estado(trabajo, estado):
+    while trabajo.estado != estado and not trabajo.terminado.is_set():
+        trabajo.terminado.wait(0.01)
+
+
+def test_un_trabajo_nuevo_sustituye_a_los_del_mismo_tipo():
+    gestor = GestorTrabajos()
+    soltar = threading.Event()
+    ejecutados = []
+
+    def cargar(nombre):
+        trabajo = trabajo_actual()
+        ejecutados.append(nombre)
+        if nombre == 'primera':
+            soltar.wait(5)
+        if not trabajo.cancelado:
+            ejecutados.append(nombre + ' terminada')
+
+    primera = gestor.lanzar('idioma', "Primera", cargar, 'primera')
+    esperar_estado(primera, EN_CURSO)
+    segunda = gestor.lanzar('idioma', "Segunda", cargar, 'segunda')
+    tercera = gestor.lanzar('idioma', "Tercera", cargar, 'tercera')
+    assert primera.cancelado and segunda.cancelado and not tercera.cancelado
+    soltar.set()
+    assert tercera.terminado.wait(5)
+    # La segunda no llegó a empezar y la tercera esperó a que la primera terminara
+    assert ejecutados == ['primera', 'tercera', 'tercera terminada']
+    assert (primera.estado, segunda.estado, tercera.estado) == (CANCELADO, CANCELADO, TERMINADO)
+    gestor.cerrar()
+
+
+def test_trabajos_no_unicos_y_de_otro_tipo_conviven():
+    gestor = GestorTrabajos()
+    soltar = threading.Event()
+    trabajos = [gestor.lanzar('texto', "Texto", soltar.wait, 5, unico=False) for _ in range(2)]
+    trabajos.append(gestor.lanzar('busqueda', "Buscar", soltar.wait, 5))
+    assert not any(trabajo.cancelado for trabajo in trabajos)
+    assert [fila[1][0] for fila in filas_panel(gestor)] == ["Texto", "Texto", "Buscar"]
+    soltar.set()
+    assert all(trabajo.terminado.wait(5) for trabajo in trabajos)
+    assert gestor.activos() == []
+    gestor.cerrar()
+
+
+def test_cancelar_por_numero_y_errores():
+    gestor = GestorTrabajos()
+
+    def esperar_cancelacion():
+        trabajo = trabajo_actual()
+        while not trabajo.cancelado:
+            trabajo.terminado.wait(0.01)
+
+    lento = gestor.lanzar('prueba', "Lento", esperar_cancelacion)
+    esperar_estado(lento, EN_CURSO)
+    gestor.cancelar(lento.numero)
+    assert lento.terminado.wait(5) and lento.estado == CANCELADO
+
+    otros = [gestor.lanzar(tipo, tipo, esperar_cancelacion) for tipo in ('a', 'b', 'c')]
+    gestor.cancelar_tipos('a', 'b')
+    assert [trabajo.cancelado for trabajo in otros] == [True, True, False]
+    otros[2].cancelar()
+    assert all(trabajo.terminado.wait(5) for trabajo in otros)
+
+    fallido = gestor.lanzar('prueba', "Falla", lambda: 1 / 0)
+    assert fallido.terminado.wait(5)
+    assert fallido.estado == FALLIDO and isinstance(fallido.error, ZeroDivisionError)
+    gestor.cerrar()
+
+
+def test_cerrar_espera_a_los_trabajos_cancelados():
+    gestor = GestorTrabajos()
+    empezado = threading.Event()
+    terminados = []
+
+    def trabajar():
+        empezado.set()
+        trabajo = trabajo_actual()
+        while not trabajo.cancelado:
+            trabajo.terminado.wait(0.01)
+        terminados.append(trabajo)
+
+    trabajo = gestor.lanzar('prueba', "Prueba", trabajar)
+    assert empezado.wait(5)
+    assert gestor.cerrar(espera=5)
+    assert terminados == [trabajo]
+    assert trabajo.estado == CANCELADO
+
+
+def test_cerrar_no_espera_mas_de_lo_indicado():
+    gestor = GestorTrabajos()
+    soltar = threading.Event()
+    gestor.lanzar('prueba', "Ignora la cancelación", soltar.wait)
+    assert not gestor.cerrar(espera=0.05)
+    soltar.set()
+
+
+def test_esperar_encadena_con_el_ultimo_trabajo_del_tipo():
+    gestor = GestorTrabajos()
+    soltar = threading.Event()
+    orden = []
+    gestor.lanzar('idioma', "Primera carga", soltar.wait)
+    gestor.lanzar('idioma', "Segunda carga", lambda: orden.append('idioma'))
+
+    def abrir():
+        if gestor.esperar('idioma', trabajo_actual()):
+            orden.append('archivo')
+
+    abierto = gestor.lanzar('archivo', "Abrir", abrir)
+    soltar.set()
+    assert abierto.terminado.wait(5)
+    assert orden == ['idioma', 'archivo']
+    gestor.cerrar()
+
+
+def test_esperar_se_rinde_si_cancelan_al_que_espera():
+    gestor = GestorTrabajos()
+    soltar = threading.Event()
+    resultados = []
+    gestor.lanzar('idioma', "Carga lenta", soltar.wait)
+    abierto = gestor.lanzar('archivo', "Abrir", lambda: resultados.append(gestor.esperar('idioma', trabajo_actual())))
+    while abierto.estado != EN_CURSO:
+        abierto.terminado.wait(0.01)
+    abierto.cancelar()
+    assert abierto.terminado.wait(5)
+    assert resultados == [False]
+    soltar.set()
+    gestor.cerrar()
@@ -0,0 +1,15 @@
+"""Núcleo del traductor de mods de RimWorld, independiente de la interfaz"""
+
+from .motor import MotorTraduccion, HILOS_POR_DEFECTO, LIMITE_CARACTERES, crear_motor, normalizar_texto
+from .servicios import SERVICIOS, ErrorServicio, crear_fabrica
+from .resiliencia import Resiliencia, Cortacircuitos, clasificar_error
+from .enrutador import Backend, Enrutador, crear_backends, servicios_configurados
+from .limitador import LimitadorTasa, obtener_limitador, configurar_limitador, estadisticas_limitadores
+from .cache import CacheTraducciones, clave_cache
+from .idiomas import codigo_idioma, idioma_destino_carpeta, nombre_legible_idioma
+from .extraccion import iterar_textos_xml, extraer_textos_xml, guardar_traducciones_xml
+from .escaneo import (escanear_proyecto, escanear_archivo, encontrar_carpeta_languages, listar_idiomas,
+                      archivos_idioma)
+from .placeholders import ErrorPlaceholders, extraer_placeholders, proteger_placeholders, restaurar_placeholders
+from .pipeline import traducir_textos, traducir_mod
+from .indice import IndiceProyecto
@@ -0,0 +1,137 @@
+"""Traducción de mods sin interfaz gráfica
+
+    python -m traductor translate <mod> --from English --to Spanish
+
+Con varios --servicio la traducción se reparte entre ellos (ver enrutador):
+
+    python -m traductor translate <mod> --to Spanish --servicio libretranslate=http://127.0.0.1:5000 --servicio google
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+from .cache import CacheTraducciones, RUTA_POR_DEFECTO
+from .escaneo import encontrar_carpeta_languages
+from .idiomas import codigo_idioma
+from .limitador import configurar_limitador
+from .enrutador import crear_backends
+from .motor import HILOS_POR_DEFECTO, crear_motor
+from .pipeline import traducir_mod
+from .resiliencia import describir_estadisticas
+from .servicios import SERVICIOS
+
+
+def _crear_parser():
+    parser = argparse.ArgumentParser(prog="python -m traductor",
+                                     description="Traductor de mods de RimWorld sin interfaz gráfica")
+    subcomandos = parser.add_subparsers(dest='comando', required=True)
+
+    traducir = subcomandos.add_parser('translate', help="Traduce un idioma completo de un mod")
+    traducir.add_argument('mod', help="Carpeta del mod (o su carpeta Languages)")
+    traducir.add_argument('--from', dest='origen', default="English",
+                          help="Carpeta del idioma original (por defecto English)")
+    traducir.add_argument('--to', dest='destino', required=True,
+                          help="Carpeta del idioma destino; se crea si no existe")
+    traducir.add_argument('--servicio', action='append', metavar="SERVICIO[=URL]",
+                          help=f"Servicio de traducción ({', '.join(sorted(SERVICIOS))}), opcionalmente con "
+                               f"su URL; se puede repetir para repartir entre varios (por defecto google)")
+    traducir.add_argument('--url', help="URL del servidor para los servicios sin URL propia "
+                                        "(p. ej. el servidor simulado)")
+    traducir.add_argument('--api-key', help="Clave de la API para los servicios que la piden")
+    traducir.add_argument('--hilos', type=int, default=HILOS_POR_DEFECTO,
+                          help=f"Peticiones simultáneas al servicio (por defecto {HILOS_POR_DEFECTO})")
+    traducir.add_argument('--tasa', type=float,
+                          help="Peticiones por segundo a cada servicio (0 sin límite); por defecto la cuota conocida")
+    traducir.add_argument('--cache', default=RUTA_POR_DEFECTO,
+                          help="Archivo del cache de traducciones (por defecto el de la aplicación)")
+    traducir.add_argument('--sobrescribir', action='store_true',
+                          help="Vuelve a traducir también los textos que ya estaban traducidos")
+    return parser
+
+
+def _mostrar_progreso(completados, total, textos_por_segundo):
+    print(f"\rTraduciendo... {completados}/{total} ({textos_por_segundo:.1f} textos/s)",
+          end='', file=sys.stderr, flush=True)
+
+
+def _crear_backends(argumentos):
+    """Un Backend por cada --servicio; ValueError si alguno no existe o le falta la clave"""
+    especificaciones = []
+    for especificacion in argumentos.servicio or ['google']:
+        servicio, _, url = especificacion.partition('=')
+        especificaciones.append({'servicio': servicio, 'url': url or argumentos.url, 'api_key': argumentos.api_key})
+    return crear_backends(especificaciones)
+
+
+def _crear_motor(argumentos, backends):
+    if argumentos.tasa is not None:
+        for backend in backends:
+            configurar_limitador(backend.nombre, tasa=argumentos.tasa)
+    return crear_motor(backends, codigo_idioma(argumentos.origen, 'auto'), codigo_idioma(argumentos.destino),
+                       argumentos.hilos)
+
+
+def traducir(argumentos, backends):
+    carpeta = os.path.abspath(argumentos.mod)
+    if os.path.basename(carpeta) == "Languages":
+        carpeta_languages = carpeta
+    else:
+        carpeta_languages = encontrar_carpeta_languages(carpeta)
+    if not carpeta_languages:
+        print(f"No se encontró la carpeta Languages en {carpeta}", file=sys.stderr)
+        return 1
+
+    motor = _crear_motor(argumentos, backends)
+    cache = None
+    inicio = time.monotonic()
+    try:
+        cache = CacheTraducciones(argumentos.cache)
+        resumen = traducir_mod(carpeta_languages, argumentos.origen, argumentos.destino, motor, cache,
+                               argumentos.sobrescribir, _mostrar_progreso)
+    except (OSError, sqlite3.Error) as e:
+        if cache is None:
+            print(f"No se pudo abrir el cache {argumentos.cache}: {e}", file=sys.stderr)
+        else:
+            print(e, file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        print("\nTraducción interrumpida; las traducciones obtenidas quedan en el cache", file=sys.stderr)
+        return 130
+    finally:
+        if cache is not None:
+            cache.cerrar()
+        motor.cerrar()
+
+    print(file=sys.stderr)
+    print(f"{resumen['archivos']} archivos, {resumen['traducidos']}/{resumen['textos']} textos traducidos, "
+          f"{resumen['guardados']} guardados, {resumen['errores']} errores "
+          f"en {time.monotonic() - inicio:.1f} s")
+    for ruta, mensaje in resumen['archivos_fallidos']:
+        print(f"{os.path.relpath(ruta, carpeta_languages)}: {mensaje}", file=sys.stderr)
+    if resumen['archivos_fallidos']:
+        print(f"{len(resumen['archivos_fallidos'])} archivos no se pudieron leer o guardar", file=sys.stderr)
+    incidencias = describir_estadisticas(resumen['resiliencia'])
+    if incidencias:
+        print(f"Servicio: {incidencias}")
+    if motor.enrutador is not None:
+        print(f"Reparto: {motor.enrutador.describir_reparto()}")
+    return 1 if resumen['errores'] or resumen['archivos_fallidos'] else 0
+
+
+def main(argv=None):
+    parser = _crear_parser()
+    argumentos = parser.parse_args(argv)
+    if argumentos.comando == 'translate':
+        # Un servicio desconocido o sin su clave es un error de los argumentos, no de la traducción
+        try:
+            backends = _crear_backends(argumentos)
+        except ValueError as e:
+            parser.error(str(e))
+        return traducir(argumentos, backends)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+import os
+import re
+import threading
+
+from .escaneo import listar_archivos_xml
+from .indice import LIMITE_RESULTADOS
+
+SEPARADOR_COLUMNAS = "\x00"
+MIN_CARACTERES_INDICE = 3  # Con menos, casi todas las palabras coinciden y el índice no filtra
+
+
+def _texto_fila(valores):
+    return SEPARADOR_COLUMNAS.join(str(valor).lower() for valor in valores if valor)
+
+
+class IndiceBusqueda:
+    """Índice de búsqueda de un ModeloTextos, al día con cada cambio del modelo
+
+    Guarda el texto de cada fila en minúsculas y un índice palabra -> filas.
+    Una consulta sin espacios se resuelve recorriendo el vocabulario (mucho
+    menor que las filas) y uniendo las filas de las palabras que la contienen;
+    con espacios, esas filas son los candidatos que luego se comprueban. Si la
+    consulta amplía la anterior solo se revisan los resultados previos.
+    """
+
+    def __init__(self, modelo):
+        self.modelo = modelo
+        self._lock = threading.RLock()
+        self._textos = []
+        self._palabras = {}  # palabra -> set de índices de fila
+        self._ultima = None  # (consulta, resultados) de la última búsqueda
+        modelo.suscribir(self._al_cambiar_modelo)
+
+    def _indexar(self, indice, signo):
+        for palabra in set(self._textos[indice].split()):
+            if signo > 0:
+                self._palabras.setdefault(palabra, set()).add(indice)
+            else:
+                filas = self._palabras.get(palabra)
+                if filas is not None:
+                    filas.discard(indice)
+                    if not filas:
+                        del self._palabras[palabra]
+
+    def _al_cambiar_modelo(self, evento, indices):
+        if evento == 'vista':
+            return
+        with self._lock:
+            if evento == 'limpiado':
+                self._textos = []
+                self._palabras = {}
+            elif evento == 'agregadas':
+                for indice in indices:
+                    self._textos.append(_texto_fila(self.modelo.valores(indice)))
+                    self._indexar(indice, 1)
+            elif evento == 'actualizada':
+                indice = indices[0]
+                self._indexar(indice, -1)
+                self._textos[indice] = _texto_fila(self.modelo.valores(indice))
+                self._indexar(indice, 1)
+            self._ultima = None
+
+    def buscar(self, consulta):
+        """Índices, en orden, de las filas con la consulta en alguna columna (sin distinguir mayúsculas)"""
+        consulta = consulta.lower().strip()
+        with self._lock:
+            if not consulta:
+                return list(range(len(self._textos)))
+
+            if self._ultima and self._ultima[0] in consulta:
+                resultados = [i for i in self._ultima[1] if consulta in self._textos[i]]
+            else:
+                resultados = self._buscar_en_indice(consulta)
+            self._ultima = (consulta, resultados)
+            return resultados
+
+    def _buscar_en_indice(self, consulta):
+        clave = max(consulta.split(), key=len)
+        if len(clave) >= MIN_CARACTERES_INDICE:
+            filas_palabras = [filas for palabra, filas in self._palabras.items() if clave in palabra]
+        # Con claves muy comunes unir conjuntos cuesta más que recorrer las filas una vez
+        if len(clave) < MIN_CARACTERES_INDICE or \
+                sum(len(filas) for filas in filas_palabras) >= len(self._textos):
+            return [i for i, texto in enumerate(self._textos) if consulta in texto]
+
+        candidatos = set()
+        for filas in filas_palabras:
+            candidatos |= filas
+        if clave == consulta:
+            # Sin espacios, estar dentro de una palabra equivale a estar en el texto
+            return sorted(candidatos)
+        return [i for i in sorted(candidatos) if consulta in self._textos[i]]
+
+
+def buscar_en_proyecto(indice, carpeta_languages, consulta, regex=False, al_progresar=None):
+    """Busca en todos los idiomas y archivos de un mod; devuelve {ruta: [registros]} en orden
+
+    Pone al día el IndiceProyecto con todos los XML de Languages (solo se
+    reanalizan los que cambiaron) y consulta su índice de trigramas. Los
+    registros de cada archivo llevan 'idioma' y 'ruta_relativa' dentro del idioma.
+    """
+    rutas = listar_archivos_xml(carpeta_languages)
+    indice.sincronizar(rutas, al_progresar)
+    indice.olvidar_ausentes(carpeta_languages, rutas)
+
+    agrupados = {}
+    for registro in indice.buscar(consulta, regex):
+        relativa = os.path.relpath(registro['ruta'], carpeta_languages)
+        registro['idioma'], _, registro['ruta_relativa'] = relativa.partition(os.sep)
+        agrupados.setdefault(registro['ruta'], []).append(registro)
+    return agrupados
+
+
+def titulo_grupo(registros):
+    """Título del grupo de resultados de un archivo: idioma/ruta (coincidencias)"""
+    primero = registros[0]
+    return f"{primero['idioma']}/{primero['ruta_relativa']} ({len(registros)})"
+
+
+def resumir_resultados(agrupados):
+    """Línea de resumen de buscar_en_proyecto, avisando si se llegó al límite de resultados"""
+    total = sum(len(registros) for registros in agrupados.values())
+    aviso = f" (se muestran las primeras {LIMITE_RESULTADOS})" if total >= LIMITE_RESULTADOS else ""
+    return f"{total} coincidencias en {len(agrupados)} archivos{aviso}"
+
+
+def describir_error_busqueda(error):
+    if isinstance(error, re.error):
+        return f"Expresión regular no válida: {error}"
+    return f"Error buscando: {error}"
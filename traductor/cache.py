@@ -0,0 +1,318 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import nullcontext
+
+from .motor import normalizar_texto
+
+MAX_ENTRADAS_POR_DEFECTO = 2_000_000
+RUTA_POR_DEFECTO = os.path.join(os.path.expanduser("~"), ".rimworld_editor", "cache_traducciones.sqlite3")
+POLITICAS = ('lru', 'lfu')
+INTERVALO_ESCRITURA = 2.0   # segundos máximos que una traducción nueva pasa solo en memoria
+UMBRAL_ESCRITURA = 200      # traducciones pendientes que adelantan la escritura
+VERSION_ESQUEMA = 1
+
+# Las entradas anteriores a la versión 1 solo guardaban el texto normalizado;
+# todas salían de Google con detección automática hacia español
+CLAVE_ANTIGUA = ('google', 'auto', 'es')
+
+
+def hash_texto(texto):
+    """Hash del texto normalizado; así claves largas no inflan el índice"""
+    return hashlib.sha1(normalizar_texto(texto).encode('utf-8')).hexdigest()
+
+
+def clave_cache(servicio, origen, destino, texto):
+    """Clave de memoria de traducción: (servicio, origen, destino, hash del texto)"""
+    return (servicio, origen, destino, hash_texto(texto))
+
+
+class CacheTraducciones:
+    """Cache persistente de traducciones sobre SQLite con expulsión acotada
+
+    Funciona como memoria de traducción compartida entre proyectos e idiomas:
+    las claves son las tuplas de clave_cache(), así una traducción al francés
+    nunca responde a una consulta en español.
+    Se usa como un diccionario (in, [], get, asignación). Las escrituras y los
+    accesos se acumulan en memoria y guardar() los vuelca en una sola
+    transacción, así guardar no reescribe el cache entero. Cuando se supera
+    max_entradas se expulsan las entradas menos usadas (lfu) o las que llevan
+    más tiempo sin usarse (lru) hasta quedar en el 90% del máximo.
+
+    Con escritura_diferida (salvo en ':memory:') un hilo propio llama a
+    guardar() cada intervalo_escritura segundos o en cuanto hay
+    umbral_escritura traducciones pendientes, con su propia conexión: quien
+    traduce nunca espera al disco y un cierre inesperado pierde como mucho
+    el último intervalo. cerrar() escribe lo que quede y para el hilo.
+    """
+
+    def __init__(self, ruta, max_entradas=MAX_ENTRADAS_POR_DEFECTO, politica='lru', escritura_diferida=True,
+                 intervalo_escritura=INTERVALO_ESCRITURA, umbral_escritura=UMBRAL_ESCRITURA):
+        if politica not in POLITICAS:
+            raise ValueError(f"Política de expulsión desconocida: {politica}")
+        if ruta != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(ruta)), exist_ok=True)
+
+        self.ruta = ruta
+        self.max_entradas = max(1, int(max_entradas))
+        self.politica = politica
+        self._lock = threading.RLock()
+        self._conexion = sqlite3.connect(ruta, check_same_thread=False)
+        self._crear_esquema()
+
+        self._pendientes = {}   # clave -> traducción aún no escrita
+        self._accesos = {}      # clave -> (accesos, último acceso) aún no escritos
+        self._escribiendo = {}  # lo que guardar() está escribiendo; se sigue leyendo de aquí
+        self._nuevas = 0        # claves de _pendientes que no estaban en disco al asignarlas
+        self._nuevas_escribiendo = 0
+        self._total = self._conexion.execute("SELECT COUNT(*) FROM memoria").fetchone()[0]
+        self._lock_escritura = threading.Lock()
+
+        # Estadísticas
+        self.aciertos = 0
+        self.fallos = 0
+        self.expulsadas = 0
+        self.escrituras = 0
+        self.errores_escritura = 0
+
+        # Escritura en segundo plano; en memoria no hay disco al que esperar ni otra conexión posible
+        self.intervalo_escritura = intervalo_escritura
+        self.umbral_escritura = max(1, int(umbral_escritura))
+        self._despertar = threading.Event()
+        self._detener = threading.Event()
+        self._hilo_escritura = None
+        if escritura_diferida and ruta != ':memory:':
+            self._conexion_escritura = sqlite3.connect(ruta, check_same_thread=False)
+            self._conexion_escritura.execute("PRAGMA synchronous=NORMAL")
+            self._hilo_escritura = threading.Thread(target=self._escribir_en_segundo_plano, daemon=True,
+                                                    name="escritura_cache")
+            self._hilo_escritura.start()
+        else:
+            self._conexion_escritura = self._conexion
+
+    def _crear_esquema(self):
+        with self._conexion:
+            self._conexion.execute("PRAGMA journal_mode=WAL")
+            self._conexion.execute("PRAGMA synchronous=NORMAL")
+            version = self._conexion.execute("PRAGMA user_version").fetchone()[0]
+            self._conexion.execute("""
+                CREATE TABLE IF NOT EXISTS memoria (
+                    servicio TEXT NOT NULL,
+                    origen TEXT NOT NULL,
+                    destino TEXT NOT NULL,
+                    hash TEXT NOT NULL,
+                    traduccion TEXT NOT NULL,
+                    accesos INTEGER NOT NULL DEFAULT 0,
+                    ultimo_acceso REAL NOT NULL,
+                    PRIMARY KEY (servicio, origen, destino, hash)
+                )
+            """)
+            self._conexion.execute(
+                "CREATE INDEX IF NOT EXISTS idx_memoria_ultimo_acceso ON memoria (ultimo_acceso)")
+            self._conexion.execute(
+                "CREATE INDEX IF NOT EXISTS idx_memoria_accesos ON memoria (accesos, ultimo_acceso)")
+            if version < 1:
+                self._migrar_version_0()
+            self._conexion.execute(f"PRAGMA user_version = {VERSION_ESQUEMA}")
+
+    def _migrar_version_0(self):
+        """Pasa la tabla de claves de texto a la memoria con servicio e idiomas"""
+        existe = self._conexion.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'traducciones'").fetchone()
+        if not existe:
+            return
+        self._conexion.create_function('hash_texto', 1, hash_texto, deterministic=True)
+        self._conexion.execute("""
+            INSERT OR IGNORE INTO memoria (servicio, origen, destino, hash, traduccion, accesos, ultimo_acceso)
+            SELECT ?, ?, ?, hash_texto(clave), traduccion, accesos, ultimo_acceso FROM traducciones
+        """, CLAVE_ANTIGUA)
+        self._conexion.execute("DROP TABLE traducciones")
+
+    def _buscar(self, clave):
+        if clave in self._pendientes:
+            return self._pendientes[clave]
+        if clave in self._escribiendo:
+            return self._escribiendo[clave]
+        fila = self._conexion.execute(
+            "SELECT traduccion FROM memoria WHERE servicio = ? AND origen = ? AND destino = ? AND hash = ?",
+            clave).fetchone()
+        return fila[0] if fila else None
+
+    def _buscar_en_disco(self, clave):
+        return self._conexion.execute(
+            "SELECT 1 FROM memoria WHERE servicio = ? AND origen = ? AND destino = ? AND hash = ?", clave).fetchone()
+
+    def _registrar_acceso(self, clave):
+        accesos, _ = self._accesos.get(clave, (0, 0.0))
+        self._accesos[clave] = (accesos + 1, time.time())
+
+    def get(self, clave, defecto=None):
+        with self._lock:
+            traduccion = self._buscar(clave)
+            if traduccion is None:
+                self.fallos += 1
+                return defecto
+            self.aciertos += 1
+            self._registrar_acceso(clave)
+            return traduccion
+
+    def __contains__(self, clave):
+        with self._lock:
+            return self._buscar(clave) is not None
+
+    def __getitem__(self, clave):
+        traduccion = self.get(clave)
+        if traduccion is None:
+            raise KeyError(clave)
+        return traduccion
+
+    def _anotar_pendiente(self, clave, traduccion):
+        # Solo la primera asignación de una clave mira el disco, así len() no tiene que hacerlo
+        if clave not in self._pendientes and clave not in self._escribiendo and not self._buscar_en_disco(clave):
+            self._nuevas += 1
+        self._pendientes[clave] = traduccion
+
+    def __setitem__(self, clave, traduccion):
+        with self._lock:
+            self._anotar_pendiente(clave, traduccion)
+            self._registrar_acceso(clave)
+            if len(self._pendientes) >= self.umbral_escritura:
+                self._despertar.set()
+
+    def __len__(self):
+        with self._lock:
+            return self._total + self._nuevas + self._nuevas_escribiendo
+
+    def guardar(self):
+        """Vuelca las escrituras y accesos pendientes y aplica la expulsión
+
+        Lo pendiente se aparta bajo el lock y se escribe fuera de él con la
+        conexión de escritura, así las consultas y asignaciones de otros hilos
+        no esperan a la transacción. Si la escritura falla, lo apartado vuelve
+        a quedar pendiente para el siguiente intento.
+        """
+        with self._lock_escritura:
+            with self._lock:
+                if not self._pendientes and not self._accesos:
+                    return
+                pendientes, self._pendientes = self._pendientes, {}
+                accesos, self._accesos = self._accesos, {}
+                self._escribiendo = pendientes
+                self._nuevas_escribiendo, self._nuevas = self._nuevas, 0
+
+            # Con una sola conexión (':memory:') las lecturas no pueden convivir con la transacción
+            misma_conexion = self._conexion_escritura is self._conexion
+            try:
+                with self._lock if misma_conexion else nullcontext():
+                    nuevas, borradas = self._escribir(pendientes, accesos)
+            except Exception:
+                with self._lock:
+                    self._pendientes = {**pendientes, **self._pendientes}
+                    for clave, (cantidad, ultimo) in accesos.items():
+                        cantidad_nueva, ultimo_nuevo = self._accesos.get(clave, (0, ultimo))
+                        self._accesos[clave] = (cantidad + cantidad_nueva, max(ultimo, ultimo_nuevo))
+                    self._escribiendo = {}
+                    self._nuevas += self._nuevas_escribiendo
+                    self._nuevas_escribiendo = 0
+                raise
+
+            with self._lock:
+                self._total += nuevas - borradas
+                self.expulsadas += borradas
+                self.escrituras += 1
+                self._escribiendo = {}
+                self._nuevas_escribiendo = 0
+
+    def _escribir(self, pendientes, accesos):
+        """Una transacción con las traducciones y accesos dados; devuelve (nuevas, expulsadas)"""
+        conexion = self._conexion_escritura
+        ahora = time.time()
+        nuevas = 0
+        with conexion:
+            if pendientes:
+                nuevas = max(conexion.executemany(
+                    "INSERT OR IGNORE INTO memoria (servicio, origen, destino, hash, traduccion, ultimo_acceso) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [(*clave, traduccion, ahora) for clave, traduccion in pendientes.items()]).rowcount, 0)
+                conexion.executemany(
+                    "UPDATE memoria SET traduccion = ? "
+                    "WHERE servicio = ? AND origen = ? AND destino = ? AND hash = ?",
+                    [(traduccion, *clave) for clave, traduccion in pendientes.items()])
+            if accesos:
+                conexion.executemany(
+                    "UPDATE memoria SET accesos = accesos + ?, ultimo_acceso = ? "
+                    "WHERE servicio = ? AND origen = ? AND destino = ? AND hash = ?",
+                    [(cantidad, ultimo, *clave) for clave, (cantidad, ultimo) in accesos.items()])
+            with self._lock:
+                total = self._total + nuevas
+            borradas = self._expulsar(conexion, total)
+        return nuevas, borradas
+
+    def _expulsar(self, conexion, total):
+        if total <= self.max_entradas:
+            return 0
+        sobrantes = total - int(self.max_entradas * 0.9)
+        orden = "ultimo_acceso" if self.politica == 'lru' else "accesos, ultimo_acceso"
+        return conexion.execute(
+            f"DELETE FROM memoria WHERE rowid IN "
+            f"(SELECT rowid FROM memoria ORDER BY {orden} LIMIT ?)", (sobrantes,)).rowcount
+
+    def _escribir_en_segundo_plano(self):
+        while not self._detener.is_set():
+            self._despertar.wait(self.intervalo_escritura)
+            self._despertar.clear()
+            if self._detener.is_set():
+                return
+            try:
+                self.guardar()
+            except Exception as e:
+                # Lo no escrito sigue pendiente; se reintenta en la siguiente vuelta
+                print(f"Error escribiendo el cache de traducciones: {e}")
+                with self._lock:
+                    self.errores_escritura += 1
+
+    def migrar_json(self, ruta_json):
+        """Importa el antiguo cache_traducciones.json y devuelve sus placeholders
+
+        El archivo se renombra a .migrado para no importarlo dos veces.
+        """
+        with open(ruta_json, 'r', encoding='utf-8') as f:
+            datos = json.load(f)
+        with self._lock:
+            for texto, traduccion in datos.get('traducciones', {}).items():
+                self._anotar_pendiente(clave_cache(*CLAVE_ANTIGUA, texto), traduccion)
+        self.guardar()
+        os.replace(ruta_json, ruta_json + ".migrado")
+        return datos.get('placeholders', {})
+
+    def estadisticas(self):
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            return {
+                'entradas': len(self),
+                'max_entradas': self.max_entradas,
+                'politica': self.politica,
+                'aciertos': self.aciertos,
+                'fallos': self.fallos,
+                'tasa_aciertos': self.aciertos / consultas if consultas else 0.0,
+                'expulsadas': self.expulsadas,
+                'pendientes': len(self._pendientes),
+                'escrituras': self.escrituras,
+                'errores_escritura': self.errores_escritura,
+            }
+
+    def cerrar(self):
+        """Para la escritura en segundo plano, guarda lo pendiente y cierra la base de datos"""
+        if self._hilo_escritura is not None:
+            self._detener.set()
+            self._despertar.set()
+            self._hilo_escritura.join()
+            self._hilo_escritura = None
+        self.guardar()
+        with self._lock:
+            if self._conexion_escritura is not self._conexion:
+                self._conexion_escritura.close()
+            self._conexion.close()
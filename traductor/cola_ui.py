@@ -0,0 +1,145 @@
+import collections
+import threading
+import time
+
+INTERVALO_MS = 16  # Un fotograma a 60 Hz
+PRESUPUESTO_MS = 12  # Tiempo máximo por fotograma aplicando actualizaciones
+
+
+def en_hilo_principal():
+    return threading.current_thread() is threading.main_thread()
+
+
+class InterfazCerrada(RuntimeError):
+    """La ventana se cerró mientras un hilo esperaba una respuesta suya"""
+
+
+class ColaUI:
+    """Cola única por la que los hilos de trabajo actualizan la interfaz sin tocar Tk
+
+    Los hilos solo encolan; el bucle principal de Tk la vacía cada
+    INTERVALO_MS con after() y dedica como mucho PRESUPUESTO_MS por pasada.
+    Las actualizaciones de fila seguidas se fusionan en un solo lote (de cada
+    fila cuenta el último valor) y del mensaje de estado solo se muestra el
+    último, así miles de actualizaciones se aplican en una pasada. Las demás
+    llamadas se ejecutan en el orden en que se encolaron.
+
+    Si se da generacion_actual, las filas encoladas con otra generación (de
+    un archivo que ya no está cargado) se descartan al aplicarlas.
+    """
+
+    def __init__(self, ventana, aplicar_fila, aplicar_estado, intervalo_ms=INTERVALO_MS,
+                 presupuesto_ms=PRESUPUESTO_MS, generacion_actual=None):
+        self.ventana = ventana
+        self._aplicar_fila = aplicar_fila
+        self._aplicar_estado = aplicar_estado
+        self._generacion_actual = generacion_actual
+        self.intervalo_ms = intervalo_ms
+        self.presupuesto = presupuesto_ms / 1000
+        self._lock = threading.Lock()
+        self._pendientes = collections.deque()  # (funcion, args) o (None, {item: (valores, generacion)}) para lotes de filas
+        self._estado = None
+        self._esperando = {}  # {evento: resultado} de las llamadas de ejecutar() sin responder
+        self._cerrada = False
+        self.ventana.after(self.intervalo_ms, self._drenar)
+
+    def llamar(self, funcion, *args):
+        """Encola una llamada para el hilo principal"""
+        with self._lock:
+            self._pendientes.append((funcion, args))
+
+    def fila(self, item, valores, generacion=None):
+        """Encola los nuevos valores de una fila de la tabla"""
+        with self._lock:
+            if not self._pendientes or self._pendientes[-1][0] is not None:
+                self._pendientes.append((None, {}))
+            self._pendientes[-1][1][item] = (valores, generacion)
+
+    def estado(self, mensaje):
+        """Cambia el mensaje de estado; si llegan varios antes de mostrarse, gana el último"""
+        with self._lock:
+            self._estado = mensaje
+
+    def ejecutar(self, funcion, *args):
+        """Ejecuta funcion en el hilo principal y espera su resultado (p. ej. un diálogo abierto por un hilo)
+
+        Tras cerrar() lanza InterfazCerrada en lugar de esperar.
+        """
+        if en_hilo_principal():
+            return funcion(*args)
+        terminado = threading.Event()
+        resultado = {}
+
+        def envoltura():
+            if terminado.is_set():
+                return  # cerrar() ya respondió por ella
+            try:
+                resultado['valor'] = funcion(*args)
+            except Exception as e:
+                resultado['error'] = e
+            finally:
+                terminado.set()
+
+        with self._lock:
+            if self._cerrada:
+                raise InterfazCerrada("La ventana se está cerrando")
+            self._pendientes.append((envoltura, ()))
+            self._esperando[terminado] = resultado
+        terminado.wait()
+        with self._lock:
+            self._esperando.pop(terminado, None)
+        if 'error' in resultado:
+            raise resultado['error']
+        return resultado.get('valor')
+
+    def cerrar(self):
+        """Responde con InterfazCerrada a los hilos que esperan en ejecutar() y a los que lleguen después
+
+        Se llama en el hilo principal antes de esperar a los trabajos: mientras
+        espera no puede atender sus diálogos y se bloquearían mutuamente.
+        """
+        with self._lock:
+            self._cerrada = True
+            esperando, self._esperando = self._esperando, {}
+        for terminado, resultado in esperando.items():
+            resultado['error'] = InterfazCerrada("La ventana se está cerrando")
+            terminado.set()
+
+    def _drenar(self):
+        limite = time.perf_counter() + self.presupuesto
+        try:
+            while time.perf_counter() < limite:
+                with self._lock:
+                    if not self._pendientes:
+                        break
+                    funcion, argumentos = self._pendientes.popleft()
+                if funcion is None:
+                    self._aplicar_lote(argumentos, limite)
+                    continue
+                try:
+                    funcion(*argumentos)
+                except Exception as e:
+                    print(f"Error actualizando la interfaz: {e}")
+
+            with self._lock:
+                mensaje, self._estado = self._estado, None
+            if mensaje is not None:
+                self._aplicar_estado(mensaje)
+        finally:
+            self.ventana.after(self.intervalo_ms, self._drenar)
+
+    def _aplicar_lote(self, filas, limite):
+        elementos = list(filas.items())
+        vigente = self._generacion_actual() if self._generacion_actual else None
+        for posicion, (item, (valores, generacion)) in enumerate(elementos, 1):
+            if generacion is not None and vigente is not None and generacion != vigente:
+                continue
+            try:
+                self._aplicar_fila(item, valores, generacion)
+            except Exception as e:
+                print(f"Error actualizando la fila {item}: {e}")
+            if posicion < len(elementos) and time.perf_counter() >= limite:
+                # Lo que no cabe en este fotograma sigue siendo lo primero en el siguiente
+                with self._lock:
+                    self._pendientes.appendleft((None, dict(elementos[posicion:])))
+                return
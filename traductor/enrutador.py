@@ -0,0 +1,244 @@
+"""Reparto de una traducción entre varios servicios según su latencia y su cuota
+
+    enrutador = Enrutador([
+        Backend('local', crear_fabrica('libretranslate', url="http://127.0.0.1:5000")),
+        Backend('google', crear_fabrica('google')),
+    ])
+    motor = MotorTraduccion('en', 'es', enrutador=enrutador)
+
+o, a partir de la configuración (ver crear_backends y motor.crear_motor):
+
+    backends = crear_backends([{'servicio': 'libretranslate', 'url': "http://127.0.0.1:5000"},
+                               {'servicio': 'google'}])
+    motor = crear_motor(backends, 'en', 'es')
+"""
+import json
+import os
+import threading
+import time
+
+from .limitador import obtener_limitador
+from .resiliencia import CONEXION, LIMITADO, SERVIDOR, Cortacircuitos, clasificar_error
+from .servicios import OPCIONES_SERVICIOS, ErrorServicio, crear_fabrica
+
+RUTA_CONFIGURACION = os.path.join(os.path.expanduser("~"), ".rimworld_editor", "config.json")
+
+SUAVIZADO_LATENCIA = 0.2  # peso de cada medida nueva en la latencia media
+PAUSA_LIMITADO = 1.0      # pausa de un servicio tras un 429 sin Retry-After
+UMBRAL_FALLOS = 3
+ENFRIAMIENTO = 10.0       # con otros servicios a mano no compensa insistir en uno caído
+
+
+class Backend:
+    """Un servicio dentro del enrutador con su limitador, su cortacircuitos y su latencia medida
+
+    Cada hilo crea su propio cliente con fabrica_cliente(origen, destino),
+    igual que en MotorTraduccion. El limitador por defecto es el compartido
+    del proceso para ese nombre, así configurar_limitador(nombre, ...) le aplica.
+    """
+
+    def __init__(self, nombre, fabrica_cliente, limitador=None, cortacircuitos=None):
+        self.nombre = nombre
+        self.fabrica_cliente = fabrica_cliente
+        self.limitador = limitador or obtener_limitador(nombre)
+        self.cortacircuitos = cortacircuitos or Cortacircuitos(UMBRAL_FALLOS, ENFRIAMIENTO)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._pausado_hasta = 0.0
+
+        # Medidas; en_vuelo lo lleva el enrutador al elegir
+        self.latencia_media = None
+        self.en_vuelo = 0
+        self.peticiones = 0
+        self.errores = 0
+        self.limitadas = 0
+
+    def tiempo_hasta_disponible(self, ahora):
+        """Segundos hasta que acepte peticiones: pausa por 429 o cortacircuitos abierto"""
+        with self._lock:
+            pausa = self._pausado_hasta - ahora
+        return max(0.0, pausa, self.cortacircuitos.tiempo_restante())
+
+    def coste(self, ahora):
+        """Segundos estimados hasta tener la respuesta si se le envía una petición ahora
+
+        La latencia media se multiplica por las peticiones que ya tiene en vuelo
+        más esta, y se suma lo que haya que esperar por su cuota o su pausa. Un
+        servicio sin medidas cuesta 0, así todos se prueban al empezar.
+        """
+        latencia = self.latencia_media or 0.0
+        return ((self.en_vuelo + 1) * latencia + self.limitador.espera_estimada()
+                + self.tiempo_hasta_disponible(ahora))
+
+    def _obtener_cliente(self, origen, destino):
+        clientes = getattr(self._local, 'clientes', None)
+        if clientes is None:
+            clientes = self._local.clientes = {}
+        if (origen, destino) not in clientes:
+            clientes[(origen, destino)] = self.fabrica_cliente(origen, destino)
+        return clientes[(origen, destino)]
+
+    def llamar(self, texto, origen, destino):
+        """Una petición al servicio, sin reintentos; anota su latencia y sus fallos"""
+        inicio = time.monotonic()
+        try:
+            cliente = self._obtener_cliente(origen, destino)
+            self.limitador.adquirir()
+            inicio = time.monotonic()
+            resultado = cliente.translate(texto)
+        except Exception as e:
+            self._registrar_fallo(e, time.monotonic() - inicio)
+            raise
+        self._registrar_latencia(time.monotonic() - inicio)
+        self.cortacircuitos.registrar_exito()
+        return resultado
+
+    def _registrar_latencia(self, duracion, error=False):
+        with self._lock:
+            self.peticiones += 1
+            if error:
+                self.errores += 1
+            if self.latencia_media is None:
+                self.latencia_media = duracion
+            else:
+                self.latencia_media += SUAVIZADO_LATENCIA * (duracion - self.latencia_media)
+
+    def _registrar_fallo(self, error, duracion):
+        clase = clasificar_error(error)
+        # Un timeout cuenta con lo que tardó, así el servicio degradado se encarece solo;
+        # un error rápido no debe abaratarlo
+        self._registrar_latencia(max(duracion, self.latencia_media or 0.0), error=True)
+        if clase in (SERVIDOR, CONEXION):
+            self.cortacircuitos.registrar_fallo()
+            return
+        self.cortacircuitos.liberar_prueba()
+        if clase == LIMITADO:
+            pausa = getattr(error, 'reintentar_tras', None) or PAUSA_LIMITADO
+            with self._lock:
+                self.limitadas += 1
+                self._pausado_hasta = max(self._pausado_hasta, time.monotonic() + pausa)
+
+    def estadisticas(self):
+        with self._lock:
+            return {
+                'peticiones': self.peticiones,
+                'errores': self.errores,
+                'limitadas': self.limitadas,
+                'latencia_ms': (self.latencia_media or 0.0) * 1000,
+                'aperturas': self.cortacircuitos.aperturas,
+            }
+
+
+class Enrutador:
+    """Envía cada petición al servicio que antes la respondería y pasa al siguiente si falla
+
+    El elegido es el de menor Backend.coste, así la carga se reparte en
+    proporción a la velocidad de cada servicio y se aparta de los que agotan
+    su cuota. Si una petición falla se prueba con los demás servicios en el
+    mismo orden entre los disponibles; si fallan todos se relanza el último
+    error para que la Resiliencia del motor reintente con espera. Cuando al
+    empezar ninguno está disponible (pausados o con el circuito abierto) se
+    espera al primero que lo esté.
+    """
+
+    def __init__(self, backends):
+        self.backends = list(backends)
+        if not self.backends:
+            raise ValueError("El enrutador necesita al menos un servicio")
+        self.nombre = "+".join(backend.nombre for backend in self.backends)
+        self._lock = threading.Lock()
+        self.relevos = 0  # peticiones que otro servicio atendió tras un fallo
+
+    def _elegir(self, descartados):
+        with self._lock:
+            ahora = time.monotonic()
+            candidatos = [backend for backend in self.backends if backend not in descartados]
+            if descartados:
+                # Tras un fallo solo se relevan los que pueden atender ya; esperar es cosa de la Resiliencia
+                candidatos = [backend for backend in candidatos if not backend.tiempo_hasta_disponible(ahora)]
+            if not candidatos:
+                return None, 0.0
+            backend = min(candidatos, key=lambda candidato: candidato.coste(ahora))
+            backend.en_vuelo += 1
+            return backend, backend.tiempo_hasta_disponible(ahora)
+
+    def traducir(self, texto, origen, destino):
+        descartados = []
+        ultimo_error = None
+        while True:
+            backend, espera = self._elegir(descartados)
+            if backend is None:
+                raise ultimo_error
+            try:
+                if espera > 0:
+                    time.sleep(espera)
+                if not backend.cortacircuitos.intentar():
+                    # Otro hilo está haciendo la llamada de prueba
+                    ultimo_error = ultimo_error or ErrorServicio(f"{backend.nombre} no está disponible", 503)
+                else:
+                    try:
+                        resultado = backend.llamar(texto, origen, destino)
+                    except Exception as e:
+                        ultimo_error = e
+                    else:
+                        if descartados:
+                            with self._lock:
+                                self.relevos += 1
+                        return resultado
+            finally:
+                with self._lock:
+                    backend.en_vuelo -= 1
+            descartados.append(backend)
+
+    # La interfaz lee estos contadores del limitador del motor; aquí son la suma de todos los servicios
+    @property
+    def peticiones(self):
+        return sum(backend.limitador.peticiones for backend in self.backends)
+
+    @property
+    def tiempo_espera(self):
+        return sum(backend.limitador.tiempo_espera for backend in self.backends)
+
+    def estadisticas(self):
+        return {backend.nombre: backend.estadisticas() for backend in self.backends}
+
+    def describir_reparto(self):
+        """Resumen corto de cuántas peticiones atendió cada servicio y con qué latencia"""
+        estadisticas = self.estadisticas()
+        total = sum(datos['peticiones'] for datos in estadisticas.values()) or 1
+        partes = [f"{nombre} {100 * datos['peticiones'] / total:.0f}% ({datos['latencia_ms']:.0f} ms"
+                  + (f", {datos['errores']} errores)" if datos['errores'] else ")")
+                  for nombre, datos in estadisticas.items()]
+        if self.relevos:
+            partes.append(f"{self.relevos} peticiones relevadas")
+        return ", ".join(partes)
+
+
+def crear_backends(especificaciones):
+    """Un Backend por cada especificación {'servicio', y opcionalmente 'url', 'api_key', 'timeout', 'nombre'}
+
+    Las opciones que el servicio no admite se ignoran. El mismo servicio en
+    dos URL recibe nombres (y limitadores) distintos: servicio@url. Lanza
+    ValueError si un servicio no existe o le falta una opción obligatoria.
+    """
+    especificaciones = list(especificaciones)
+    backends = []
+    for especificacion in especificaciones:
+        servicio = especificacion.get('servicio')
+        opciones = {opcion: especificacion[opcion] for opcion in OPCIONES_SERVICIOS.get(servicio, ())
+                    if especificacion.get(opcion)}
+        fabrica = crear_fabrica(servicio, **opciones)
+        repetido = sum(1 for otra in especificaciones if otra.get('servicio') == servicio) > 1
+        nombre = especificacion.get('nombre') or (
+            f"{servicio}@{opciones['url']}" if repetido and 'url' in opciones else servicio)
+        backends.append(Backend(nombre, fabrica))
+    return backends
+
+
+def servicios_configurados(ruta=RUTA_CONFIGURACION):
+    """Especificaciones de la clave 'servicios' del config.json de la aplicación; [] si no hay"""
+    try:
+        with open(ruta, 'r', encoding='utf-8') as f:
+            return json.load(f).get('servicios') or []
+    except (OSError, ValueError):
+        return []
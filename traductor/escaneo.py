@@ -0,0 +1,236 @@
+import os
+import time
+
+from .extraccion import iterar_textos_xml
+from .placeholders import PATRON_PLACEHOLDER
+from .procesos import mapear
+
+MARCAS_SIN_TRADUCIR = ('TODO',)
+
+
+def _textos_por_id(registros):
+    return {registro['id']: registro['texto'] for registro in registros}
+
+
+def resumir_registros(ruta, registros, referencia=None, error=None):
+    """Cuenta claves, textos traducidos y placeholders a partir de los registros de un archivo
+
+    Si hay registros de referencia (el mismo archivo en la carpeta English),
+    un texto cuenta como traducido cuando difiere del original. Sin referencia
+    solo se consideran pendientes los textos marcados con TODO.
+    """
+    resumen = {
+        'ruta': ruta,
+        'claves': 0,
+        'traducidos': 0,
+        'sin_traducir': 0,
+        'placeholders': 0,
+        'error': error,
+    }
+    referencia = referencia or {}
+    for registro in registros:
+        texto = registro['texto']
+        resumen['claves'] += 1
+        resumen['placeholders'] += len(PATRON_PLACEHOLDER.findall(texto))
+        if texto in MARCAS_SIN_TRADUCIR or referencia.get(registro['id']) == texto:
+            resumen['sin_traducir'] += 1
+        else:
+            resumen['traducidos'] += 1
+    return resumen
+
+
+def escanear_archivo(ruta, ruta_referencia=None):
+    """Lee un archivo de idioma y devuelve su resumen"""
+    try:
+        referencia = {}
+        if ruta_referencia and os.path.exists(ruta_referencia):
+            referencia = _textos_por_id(iterar_textos_xml(ruta_referencia))
+        return resumir_registros(ruta, iterar_textos_xml(ruta), referencia)
+    except Exception as e:
+        return resumir_registros(ruta, [], error=str(e))
+
+
+def _escanear(argumentos):
+    return escanear_archivo(*argumentos)
+
+
+def escanear_proyecto(archivos, carpeta_idioma, carpeta_referencia=None, al_progresar=None, max_procesos=None,
+                      indice=None):
+    """Escanea en paralelo todos los archivos de una carpeta de idioma
+
+    Los archivos se leen en el pool de procesos compartido (ver procesos.mapear),
+    o en este proceso si son pocos. archivos es la lista de rutas completas. Devuelve el modelo del proyecto:
+    {'archivos': {ruta_relativa: resumen}, 'totales': {...}, 'segundos': ...}.
+    Con un IndiceProyecto solo se vuelven a leer los archivos que cambiaron.
+    al_progresar recibe (completados, total).
+    """
+    inicio = time.monotonic()
+    if carpeta_referencia and os.path.normcase(os.path.abspath(carpeta_referencia)) == \
+            os.path.normcase(os.path.abspath(carpeta_idioma)):
+        carpeta_referencia = None
+
+    trabajos = []
+    for ruta in archivos:
+        ruta_relativa = os.path.relpath(ruta, carpeta_idioma)
+        ruta_referencia = os.path.join(carpeta_referencia, ruta_relativa) if carpeta_referencia else None
+        trabajos.append((ruta, ruta_referencia))
+
+    if indice is not None:
+        return _escanear_con_indice(trabajos, carpeta_idioma, carpeta_referencia, indice,
+                                    al_progresar, max_procesos, inicio)
+
+    resultados = {}
+    total = len(trabajos)
+    for completados, resumen in enumerate(mapear(_escanear, trabajos, max_procesos), 1):
+        resultados[os.path.relpath(resumen['ruta'], carpeta_idioma)] = resumen
+        if al_progresar:
+            al_progresar(completados, total)
+
+    return {
+        'archivos': resultados,
+        'totales': resumir_proyecto(resultados.values()),
+        'segundos': time.monotonic() - inicio,
+        'analizados': total,
+        'carpeta_idioma': carpeta_idioma,
+        'carpeta_referencia': carpeta_referencia,
+    }
+
+
+def _escanear_con_indice(trabajos, carpeta_idioma, carpeta_referencia, indice, al_progresar, max_procesos, inicio):
+    rutas = [ruta for ruta, _ in trabajos]
+    referencias = {ruta for _, ruta in trabajos if ruta and os.path.exists(ruta)}
+    analizados = indice.sincronizar(rutas + sorted(referencias), al_progresar, max_procesos)
+    indice.olvidar_ausentes(carpeta_idioma, rutas)
+
+    resultados = {}
+    for ruta, ruta_referencia in trabajos:
+        referencia = _textos_por_id(indice.registros(ruta_referencia)) if ruta_referencia in referencias else {}
+        resultados[os.path.relpath(ruta, carpeta_idioma)] = resumir_registros(
+            ruta, indice.registros(ruta), referencia, indice.error(ruta))
+
+    return {
+        'archivos': resultados,
+        'totales': resumir_proyecto(resultados.values()),
+        'segundos': time.monotonic() - inicio,
+        'analizados': analizados,
+        'carpeta_idioma': carpeta_idioma,
+        'carpeta_referencia': carpeta_referencia,
+    }
+
+
+def actualizar_archivo_proyecto(modelo, ruta, indice=None):
+    """Vuelve a contar un solo archivo (p. ej. tras guardarlo) y ajusta los totales sin recorrer el resto"""
+    carpeta_idioma = modelo['carpeta_idioma']
+    carpeta_ref = modelo['carpeta_referencia']
+    ruta_relativa = os.path.relpath(ruta, carpeta_idioma)
+    ruta_referencia = os.path.join(carpeta_ref, ruta_relativa) if carpeta_ref else None
+
+    if indice is not None:
+        indice.sincronizar([ruta] + ([ruta_referencia] if ruta_referencia and os.path.exists(ruta_referencia) else []))
+        referencia = {}
+        if ruta_referencia and os.path.exists(ruta_referencia):
+            referencia = _textos_por_id(indice.registros(ruta_referencia))
+        nuevo = resumir_registros(ruta, indice.registros(ruta), referencia, indice.error(ruta))
+    else:
+        nuevo = escanear_archivo(ruta, ruta_referencia)
+
+    totales = modelo['totales']
+    anterior = modelo['archivos'].get(ruta_relativa)
+    for resumen, signo in ((anterior, -1), (nuevo, 1)):
+        if resumen is None:
+            continue
+        totales['archivos'] += signo
+        totales['errores'] += signo if resumen['error'] else 0
+        for campo in ('claves', 'traducidos', 'sin_traducir', 'placeholders'):
+            totales[campo] += signo * resumen[campo]
+    modelo['archivos'][ruta_relativa] = nuevo
+    return nuevo
+
+
+def escanear_idioma(archivos, carpeta_idioma, al_progresar=None, indice=None):
+    """escanear_proyecto sobre la lista de archivos_idioma(), comparando con la carpeta de referencia"""
+    rutas = [archivo['ruta_completa'] for archivo in archivos]
+    return escanear_proyecto(rutas, carpeta_idioma, carpeta_referencia(carpeta_idioma), al_progresar, indice=indice)
+
+
+def describir_proyecto(modelo):
+    """Resumen de una línea del modelo de escanear_proyecto para la barra de estado"""
+    totales = modelo['totales']
+    mensaje = (f"Proyecto: {totales['archivos']} archivos, {totales['claves']} claves, "
+               f"{totales['sin_traducir']} sin traducir, {totales['placeholders']} placeholders "
+               f"({modelo['analizados']} analizados en {modelo['segundos']:.1f} s)")
+    if totales['errores']:
+        mensaje += f", {totales['errores']} archivos con errores"
+    return mensaje
+
+
+def resumir_proyecto(resumenes):
+    totales = {'archivos': 0, 'claves': 0, 'traducidos': 0, 'sin_traducir': 0, 'placeholders': 0, 'errores': 0}
+    for resumen in resumenes:
+        totales['archivos'] += 1
+        totales['errores'] += 1 if resumen['error'] else 0
+        for campo in ('claves', 'traducidos', 'sin_traducir', 'placeholders'):
+            totales[campo] += resumen[campo]
+    return totales
+
+
+def listar_archivos_xml(carpeta):
+    """Rutas completas de todos los XML bajo una carpeta, incluidas subcarpetas, en orden"""
+    rutas = []
+    for raiz, _, archivos in os.walk(carpeta):
+        rutas.extend(os.path.join(raiz, archivo) for archivo in archivos if archivo.lower().endswith('.xml'))
+    return sorted(rutas, key=str.lower)
+
+
+def tiene_archivos_xml(carpeta):
+    """Indica si hay algún XML en la carpeta o sus subcarpetas"""
+    try:
+        for _, _, archivos in os.walk(carpeta):
+            if any(archivo.lower().endswith('.xml') for archivo in archivos):
+                return True
+    except OSError:
+        pass
+    return False
+
+
+def listar_idiomas(carpeta_languages):
+    """Nombres de las carpetas de idioma de Languages que tienen algún XML"""
+    return [nombre for nombre in os.listdir(carpeta_languages)
+            if os.path.isdir(os.path.join(carpeta_languages, nombre))
+            and tiene_archivos_xml(os.path.join(carpeta_languages, nombre))]
+
+
+def archivos_idioma(carpeta_idioma):
+    """Archivos XML de una carpeta de idioma, ordenados por su ruta dentro de ella
+
+    Cada archivo es {'ruta_completa', 'ruta_relativa', 'nombre_archivo',
+    'carpeta'}, con carpeta el nombre de la carpeta que lo contiene.
+    """
+    return [{
+        'ruta_completa': ruta,
+        'ruta_relativa': os.path.relpath(ruta, carpeta_idioma),
+        'nombre_archivo': os.path.basename(ruta),
+        'carpeta': os.path.basename(os.path.dirname(ruta)),
+    } for ruta in listar_archivos_xml(carpeta_idioma)]
+
+
+def encontrar_carpeta_languages(carpeta_mod):
+    """Carpeta Languages de un mod: en la raíz, en la de una versión o donde aparezca"""
+    if not carpeta_mod:
+        return None
+    for ruta in (os.path.join(carpeta_mod, "Languages"),
+                 os.path.join(carpeta_mod, "1.4", "Languages"),
+                 os.path.join(carpeta_mod, "1.3", "Languages"),
+                 os.path.join(carpeta_mod, "Common", "Languages")):
+        if os.path.exists(ruta):
+            return ruta
+    for raiz, carpetas, _ in os.walk(carpeta_mod):
+        if 'Languages' in carpetas:
+            return os.path.join(raiz, 'Languages')
+    return None
+
+
+def carpeta_referencia(carpeta_idioma):
+    """Carpeta English hermana de la carpeta de idioma, si existe"""
+    carpeta = os.path.join(os.path.dirname(os.path.normpath(carpeta_idioma)), "English")
+    return carpeta if os.path.isdir(carpeta) else None
@@ -0,0 +1,101 @@
+import xml.etree.ElementTree as ET
+
+
+def _texto_elemento(elemento):
+    return elemento.text.strip() if elemento.text and elemento.text.strip() else ""
+
+
+def _registros_atributos(elemento, id_actual):
+    for attr, valor in elemento.attrib.items():
+        if valor and valor.strip() and len(valor.strip()) > 1:
+            yield {
+                'id': f"{id_actual}@{attr}",
+                'texto': valor.strip(),
+                'atributo': attr,
+                'tipo': 'atributo'
+            }
+
+
+def iterar_textos_xml(ruta_archivo):
+    """Recorre un XML con iterparse y va devolviendo sus textos según aparecen
+
+    Produce los mismos registros y en el mismo orden que la extracción
+    recursiva ({'id', 'texto', 'tipo'} y 'atributo' en los atributos), pero
+    sin referencias a elementos: cada subárbol terminado se vacía y se suelta
+    de su padre, así la memoria no depende del tamaño del archivo.
+    """
+    pila = []  # [elemento, id, pendiente de emitir texto y atributos]
+    keyed = None
+
+    def emitir_pendiente(nivel):
+        elemento, id_actual, pendiente = nivel
+        if not pendiente:
+            return
+        nivel[2] = False
+        texto = _texto_elemento(elemento)
+        if keyed:
+            if texto:
+                yield {'id': elemento.tag, 'texto': texto, 'tipo': 'keyed'}
+            return
+        if texto:
+            yield {'id': id_actual, 'texto': texto, 'tipo': 'elemento'}
+        yield from _registros_atributos(elemento, id_actual)
+
+    for evento, elemento in ET.iterparse(ruta_archivo, events=('start', 'end')):
+        if evento == 'start':
+            if keyed is None:
+                keyed = elemento.tag == "LanguageData"
+            if pila:
+                # El texto del padre ya está completo cuando empieza su primer hijo
+                yield from emitir_pendiente(pila[-1])
+                id_actual = f"{pila[-1][1]}/{elemento.tag}"
+            else:
+                id_actual = elemento.tag
+            # En Keyed solo cuentan los hijos directos de LanguageData
+            pila.append([elemento, id_actual, len(pila) == 1 if keyed else True])
+        else:
+            yield from emitir_pendiente(pila[-1])
+            pila.pop()
+            elemento.clear()
+            if pila:
+                pila[-1][0].remove(elemento)
+
+
+def extraer_textos_xml(ruta_archivo):
+    """Devuelve todos los textos de un XML como lista"""
+    return list(iterar_textos_xml(ruta_archivo))
+
+
+def guardar_traducciones_xml(ruta_archivo, traducciones):
+    """Aplica las traducciones (id -> texto) sobre el XML y lo guarda; devuelve cuántas se aplicaron
+
+    Vuelve a leer el archivo y localiza cada texto por su id, con el mismo
+    esquema que iterar_textos_xml, en lugar de conservar los elementos de la carga.
+    """
+    tree = ET.parse(ruta_archivo)
+    root = tree.getroot()
+    guardados = 0
+
+    if root.tag == "LanguageData":
+        for elem in root:
+            if traducciones.get(elem.tag) and _texto_elemento(elem):
+                elem.text = traducciones[elem.tag]
+                guardados += 1
+    else:
+        def aplicar(elemento, id_actual):
+            nonlocal guardados
+            if traducciones.get(id_actual) and _texto_elemento(elemento):
+                elemento.text = traducciones[id_actual]
+                guardados += 1
+            for attr, valor in elemento.attrib.items():
+                id_atributo = f"{id_actual}@{attr}"
+                if traducciones.get(id_atributo) and valor.strip():
+                    elemento.set(attr, traducciones[id_atributo])
+                    guardados += 1
+            for hijo in elemento:
+                aplicar(hijo, f"{id_actual}/{hijo.tag}")
+
+        aplicar(root, root.tag)
+
+    tree.write(ruta_archivo, encoding='utf-8', xml_declaration=True)
+    return guardados
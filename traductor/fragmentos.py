@@ -0,0 +1,69 @@
+import re
+
+from .placeholders import PATRON_INDIVISIBLE
+
+# Dónde cortar un texto largo, de mejor a peor: párrafo, línea (también el \n
+# escrito tal cual en el XML), final de frase y espacio entre palabras
+CORTES = (
+    re.compile(r'\s*(?:(?:\\n|\n)\s*){2,}'),
+    re.compile(r'\s*(?:\\n|\n)\s*'),
+    re.compile(r'(?<=[.!?;…])\s+|(?<=[。！？；])\s*'),
+    re.compile(r'\s+'),
+)
+
+
+def _dentro_de(posicion, tramos):
+    return any(inicio < posicion < fin for inicio, fin in tramos)
+
+
+def _buscar_corte(texto, limite):
+    """(fin del fragmento, inicio del siguiente) para el mejor corte dentro de limite"""
+    # Un corte muy al principio dejaría fragmentos diminutos; mejor bajar al siguiente tipo de corte
+    minimo = max(1, limite // 4)
+    placeholders = [coincidencia.span() for coincidencia in PATRON_INDIVISIBLE.finditer(texto, 0, limite + 1)]
+    for patron in CORTES:
+        mejor = None
+        for coincidencia in patron.finditer(texto):
+            inicio, fin = coincidencia.span()
+            if inicio > limite:
+                break
+            if inicio >= minimo and fin > 0 and not _dentro_de(inicio, placeholders):
+                mejor = (inicio, fin)
+        if mejor:
+            return mejor
+
+    # Sin espacios donde cortar: corte duro, sin partir un placeholder ni un \n escrito
+    corte = limite
+    for inicio, fin in placeholders:
+        if inicio < corte < fin and inicio > 0:
+            corte = inicio
+    if texto[corte - 1] == '\\' and corte > 1:
+        corte -= 1
+    return corte, corte
+
+
+def dividir_texto(texto, limite):
+    """Parte un texto en fragmentos de como mucho limite caracteres
+
+    Corta por párrafos si puede, si no por líneas, frases o palabras, y nunca
+    dentro de un placeholder. Devuelve (fragmentos, separadores) con
+    texto == fragmento0 + separador0 + fragmento1 + ... (el último separador
+    es ''), así los saltos de línea y espacios entre fragmentos se conservan
+    tal cual sin pasar por el servicio.
+    """
+    fragmentos = []
+    separadores = []
+    resto = texto
+    while len(resto) > limite:
+        fin, siguiente = _buscar_corte(resto, limite)
+        fragmentos.append(resto[:fin])
+        separadores.append(resto[fin:siguiente])
+        resto = resto[siguiente:]
+    fragmentos.append(resto)
+    separadores.append('')
+    return fragmentos, separadores
+
+
+def unir_fragmentos(traducciones, separadores):
+    """Vuelve a juntar los fragmentos traducidos con sus separadores originales"""
+    return "".join(traduccion.strip() + separador for traduccion, separador in zip(traducciones, separadores))
@@ -0,0 +1,74 @@
+import re
+
+IDIOMA_DESTINO_POR_DEFECTO = 'es'
+
+# Carpetas de Languages/ de RimWorld -> código ISO que entienden los servicios
+CODIGOS_IDIOMA = {
+    'english': 'en',
+    'spanish': 'es',
+    'spanishlatin': 'es',
+    'french': 'fr',
+    'german': 'de',
+    'italian': 'it',
+    'portuguese': 'pt',
+    'portuguesebrazilian': 'pt',
+    'russian': 'ru',
+    'ukrainian': 'uk',
+    'polish': 'pl',
+    'czech': 'cs',
+    'slovak': 'sk',
+    'hungarian': 'hu',
+    'romanian': 'ro',
+    'dutch': 'nl',
+    'danish': 'da',
+    'swedish': 'sv',
+    'norwegian': 'no',
+    'finnish': 'fi',
+    'estonian': 'et',
+    'greek': 'el',
+    'turkish': 'tr',
+    'catalan': 'ca',
+    'chinesesimplified': 'zh-CN',
+    'chinesetraditional': 'zh-TW',
+    'japanese': 'ja',
+    'korean': 'ko',
+    'vietnamese': 'vi',
+    'thai': 'th',
+    'arabic': 'ar',
+}
+
+# Nombres para mostrar de las carpetas más comunes
+NOMBRES_LEGIBLES = {
+    'english': 'English',
+    'spanish': 'Spanish (Español)',
+    'french': 'French (Français)',
+    'german': 'German (Deutsch)',
+    'italian': 'Italian (Italiano)',
+    'portuguese': 'Portuguese (Português)',
+    'russian': 'Russian (Русский)',
+    'chinesesimplified': 'Chinese Simplified (简体中文)',
+    'chinesetraditional': 'Chinese Traditional (繁體中文)',
+    'japanese': 'Japanese (日本語)',
+    'korean': 'Korean (한국어)',
+}
+
+
+def nombre_legible_idioma(nombre_carpeta):
+    """Nombre para mostrar de una carpeta de idioma"""
+    nombre = nombre_carpeta.lower().replace('_', '').replace('-', '')
+    return NOMBRES_LEGIBLES.get(nombre, nombre_carpeta.title())
+
+
+def codigo_idioma(nombre_carpeta, defecto=IDIOMA_DESTINO_POR_DEFECTO):
+    """Convierte el nombre de una carpeta de idioma (p. ej. 'Spanish (Español)') a su código ISO"""
+    if not nombre_carpeta:
+        return defecto
+    nombre = nombre_carpeta.split('(')[0]
+    nombre = re.sub(r'[\s_\-]', '', nombre).lower()
+    return CODIGOS_IDIOMA.get(nombre, defecto)
+
+
+def idioma_destino_carpeta(nombre_carpeta, defecto=IDIOMA_DESTINO_POR_DEFECTO):
+    """Idioma al que traducir una carpeta; la carpeta English es el origen, no un destino"""
+    codigo = codigo_idioma(nombre_carpeta, defecto)
+    return defecto if codigo == 'en' else codigo
@@ -0,0 +1,312 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+
+from .extraccion import iterar_textos_xml
+from .procesos import mapear
+
+DIRECTORIO_INDICES = os.path.join(os.path.expanduser("~"), ".rimworld_editor", "indices")
+VERSION_ESQUEMA = 2
+LIMITE_RESULTADOS = 5000
+FILAS_POR_BLOQUE = 500  # registros que leer_por_bloques entrega de cada vez
+MIN_CARACTERES_TRIGRAMA = 3  # FTS5 trigram no puede resolver consultas más cortas
+
+
+def hash_archivo(ruta):
+    h = hashlib.sha1()
+    with open(ruta, 'rb') as f:
+        for bloque in iter(lambda: f.read(1 << 20), b''):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+def _fts_trigram_disponible(conexion):
+    try:
+        conexion.execute("CREATE VIRTUAL TABLE temp.prueba_fts USING fts5(x, tokenize='trigram')")
+        conexion.execute("DROP TABLE temp.prueba_fts")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def _patron_like(texto):
+    return '%' + texto.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
+
+def leer_archivo(ruta):
+    """Extrae los registros de un archivo junto con su hash; se ejecuta en los procesos del pool"""
+    try:
+        hash_actual = hash_archivo(ruta)
+    except OSError as e:
+        return ruta, None, [], str(e)
+    try:
+        return ruta, hash_actual, list(iterar_textos_xml(ruta)), None
+    except Exception as e:
+        # Un XML roto también se indexa con su hash para no reanalizarlo mientras no cambie
+        return ruta, hash_actual, [], str(e)
+
+
+class IndiceProyecto:
+    """Índice persistente de un mod: archivos, su huella y los textos extraídos
+
+    Guarda en ~/.rimworld_editor/indices un SQLite por mod con la ruta,
+    mtime, tamaño y hash de cada XML y sus registros. Al reabrir el mod solo
+    se vuelven a analizar los archivos cuyo mtime o tamaño cambió y cuyo
+    contenido (hash) es realmente distinto. Si SQLite trae FTS5, los registros
+    tienen además un índice de trigramas para buscar subcadenas en todo el mod.
+    """
+
+    def __init__(self, carpeta_mod, directorio=DIRECTORIO_INDICES):
+        self.carpeta_mod = os.path.abspath(carpeta_mod)
+        if directorio == ':memory:':
+            self.ruta = directorio
+        else:
+            os.makedirs(directorio, exist_ok=True)
+            nombre = hashlib.sha1(os.path.normcase(self.carpeta_mod).encode('utf-8')).hexdigest()[:16]
+            self.ruta = os.path.join(directorio, f"{nombre}.sqlite3")
+        self._lock = threading.RLock()
+        self._conexion = sqlite3.connect(self.ruta, check_same_thread=False)
+        self.fts_disponible = _fts_trigram_disponible(self._conexion)
+        self._crear_esquema()
+
+    def _crear_esquema(self):
+        with self._conexion:
+            self._conexion.execute("PRAGMA journal_mode=WAL")
+            self._conexion.execute("PRAGMA synchronous=NORMAL")
+            version = self._conexion.execute("PRAGMA user_version").fetchone()[0]
+            if version != VERSION_ESQUEMA:
+                # El índice se puede reconstruir siempre; ante otro esquema se empieza de cero
+                self._conexion.execute("DROP TABLE IF EXISTS busqueda")
+                self._conexion.execute("DROP TABLE IF EXISTS registros")
+                self._conexion.execute("DROP TABLE IF EXISTS archivos")
+            self._conexion.execute("""
+                CREATE TABLE IF NOT EXISTS archivos (
+                    ruta TEXT PRIMARY KEY,
+                    mtime REAL NOT NULL,
+                    tamano INTEGER NOT NULL,
+                    hash TEXT,
+                    error TEXT
+                )
+            """)
+            self._conexion.execute("""
+                CREATE TABLE IF NOT EXISTS registros (
+                    ruta TEXT NOT NULL,
+                    orden INTEGER NOT NULL,
+                    id TEXT NOT NULL,
+                    texto TEXT NOT NULL,
+                    tipo TEXT NOT NULL,
+                    atributo TEXT,
+                    PRIMARY KEY (ruta, orden)
+                )
+            """)
+            if self.fts_disponible:
+                # Tabla de contenido externo: los triggers la mantienen al día con registros
+                self._conexion.execute("""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS busqueda
+                    USING fts5(id, texto, content='registros', content_rowid='rowid', tokenize='trigram')
+                """)
+                self._conexion.execute("""
+                    CREATE TRIGGER IF NOT EXISTS registros_insertados AFTER INSERT ON registros BEGIN
+                        INSERT INTO busqueda (rowid, id, texto) VALUES (new.rowid, new.id, new.texto);
+                    END
+                """)
+                self._conexion.execute("""
+                    CREATE TRIGGER IF NOT EXISTS registros_borrados AFTER DELETE ON registros BEGIN
+                        INSERT INTO busqueda (busqueda, rowid, id, texto) VALUES ('delete', old.rowid, old.id, old.texto);
+                    END
+                """)
+            self._conexion.execute(f"PRAGMA user_version = {VERSION_ESQUEMA}")
+
+    def _relativa(self, ruta):
+        return os.path.relpath(os.path.abspath(ruta), self.carpeta_mod)
+
+    def _huella(self, ruta):
+        estado = os.stat(ruta)
+        return estado.st_mtime, estado.st_size
+
+    def vigente(self, ruta):
+        """True si el archivo no cambió desde que se indexó"""
+        with self._lock:
+            fila = self._conexion.execute(
+                "SELECT mtime, tamano FROM archivos WHERE ruta = ? AND error IS NULL",
+                (self._relativa(ruta),)).fetchone()
+        try:
+            return fila is not None and tuple(fila) == self._huella(ruta)
+        except OSError:
+            return False
+
+    def sincronizar(self, rutas, al_progresar=None, max_procesos=None):
+        """Pone al día el índice para las rutas dadas; devuelve cuántos archivos se analizaron
+
+        Los archivos con el mismo mtime y tamaño se dan por buenos. Si cambiaron
+        pero el hash coincide solo se actualiza la huella; el resto se analiza
+        en el pool de procesos compartido, o aquí si son pocos (ver procesos.mapear).
+        """
+        with self._lock:
+            guardados = dict(
+                (ruta, (mtime, tamano, hash_guardado)) for ruta, mtime, tamano, hash_guardado in
+                self._conexion.execute("SELECT ruta, mtime, tamano, hash FROM archivos"))
+
+        por_analizar = []
+        huellas = {}
+        for ruta in rutas:
+            try:
+                huella = self._huella(ruta)
+            except OSError:
+                continue
+            huellas[ruta] = huella
+            anterior = guardados.get(self._relativa(ruta))
+            if anterior and anterior[:2] == huella:
+                continue
+            if anterior and anterior[2] == hash_archivo(ruta):
+                with self._lock, self._conexion:
+                    self._conexion.execute("UPDATE archivos SET mtime = ?, tamano = ? WHERE ruta = ?",
+                                           (*huella, self._relativa(ruta)))
+                continue
+            por_analizar.append(ruta)
+
+        total = len(por_analizar)
+        if not total:
+            return 0
+
+        def registrar(completados, resultado):
+            ruta, hash_actual, registros, error = resultado
+            self._guardar_archivo(ruta, huellas[ruta], hash_actual, registros, error)
+            if al_progresar:
+                al_progresar(completados, total)
+
+        # Tras un cambio suele haber uno o dos archivos: mapear los lee aquí sin arrancar procesos
+        for completados, resultado in enumerate(mapear(leer_archivo, por_analizar, max_procesos), 1):
+            registrar(completados, resultado)
+        return total
+
+    def _guardar_archivo(self, ruta, huella, hash_actual, registros, error):
+        relativa = self._relativa(ruta)
+        with self._lock, self._conexion:
+            self._conexion.execute("DELETE FROM registros WHERE ruta = ?", (relativa,))
+            self._conexion.execute(
+                "INSERT OR REPLACE INTO archivos (ruta, mtime, tamano, hash, error) VALUES (?, ?, ?, ?, ?)",
+                (relativa, *huella, hash_actual, error))
+            self._conexion.executemany(
+                "INSERT INTO registros (ruta, orden, id, texto, tipo, atributo) VALUES (?, ?, ?, ?, ?, ?)",
+                [(relativa, orden, r['id'], r['texto'], r['tipo'], r.get('atributo'))
+                 for orden, r in enumerate(registros)])
+
+    def guardar_registros(self, ruta, registros):
+        """Guarda los registros de un archivo recién leído por otra vía (p. ej. la carga de la tabla)"""
+        try:
+            huella = self._huella(ruta)
+            hash_actual = hash_archivo(ruta)
+        except OSError:
+            return
+        self._guardar_archivo(ruta, huella, hash_actual, registros, None)
+
+    def registros(self, ruta):
+        """Registros indexados de un archivo en el mismo formato que iterar_textos_xml"""
+        with self._lock:
+            filas = self._conexion.execute(
+                "SELECT id, texto, tipo, atributo FROM registros WHERE ruta = ? ORDER BY orden",
+                (self._relativa(ruta),)).fetchall()
+        registros = []
+        for id_texto, texto, tipo, atributo in filas:
+            registro = {'id': id_texto, 'texto': texto, 'tipo': tipo}
+            if atributo is not None:
+                registro['atributo'] = atributo
+            registros.append(registro)
+        return registros
+
+    def registros_vigentes(self, ruta):
+        """Registros del índice si el archivo no cambió; None si hay que volver a leerlo"""
+        return self.registros(ruta) if self.vigente(ruta) else None
+
+    def error(self, ruta):
+        with self._lock:
+            fila = self._conexion.execute("SELECT error FROM archivos WHERE ruta = ?",
+                                          (self._relativa(ruta),)).fetchone()
+        return fila[0] if fila else None
+
+    def olvidar_ausentes(self, carpeta, rutas):
+        """Elimina del índice los archivos de una carpeta que ya no existen"""
+        prefijo = self._relativa(carpeta) + os.sep
+        presentes = {self._relativa(ruta) for ruta in rutas}
+        with self._lock, self._conexion:
+            ausentes = [ruta for (ruta,) in self._conexion.execute(
+                "SELECT ruta FROM archivos WHERE substr(ruta, 1, ?) = ?", (len(prefijo), prefijo))
+                if ruta not in presentes]
+            self._conexion.executemany("DELETE FROM registros WHERE ruta = ?", [(r,) for r in ausentes])
+            self._conexion.executemany("DELETE FROM archivos WHERE ruta = ?", [(r,) for r in ausentes])
+        return len(ausentes)
+
+    def buscar(self, consulta, regex=False, limite=LIMITE_RESULTADOS):
+        """Busca en la clave y el texto de todos los registros indexados, sin distinguir mayúsculas
+
+        Sin regex busca la subcadena, con el índice de trigramas cuando es
+        posible. Con regex la consulta es una expresión regular de Python (un
+        patrón inválido lanza re.error). Devuelve como mucho limite registros
+        {'ruta', 'orden', 'id', 'texto'}, con la ruta completa, ordenados por
+        archivo y posición.
+        """
+        columnas = "SELECT r.ruta, r.orden, r.id, r.texto FROM registros r"
+        orden = " ORDER BY r.ruta, r.orden LIMIT ?"
+        if regex:
+            patron = re.compile(consulta, re.IGNORECASE)
+            sql = columnas + " WHERE coincide(r.id) OR coincide(r.texto)" + orden
+            parametros = (limite,)
+        elif self.fts_disponible and len(consulta) >= MIN_CARACTERES_TRIGRAMA:
+            # Entre comillas es una frase: para el tokenizador trigram, una subcadena
+            sql = columnas + " JOIN busqueda b ON b.rowid = r.rowid WHERE busqueda MATCH ?" + orden
+            parametros = ('"' + consulta.replace('"', '""') + '"', limite)
+        else:
+            sql = columnas + " WHERE r.id LIKE ?1 ESCAPE '\\' OR r.texto LIKE ?1 ESCAPE '\\'" + orden
+            parametros = (_patron_like(consulta), limite)
+
+        with self._lock:
+            if regex:
+                self._conexion.create_function(
+                    "coincide", 1, lambda valor: valor is not None and patron.search(valor) is not None,
+                    deterministic=True)
+            filas = self._conexion.execute(sql, parametros).fetchall()
+        return [{'ruta': os.path.join(self.carpeta_mod, ruta), 'orden': orden_registro, 'id': id_texto,
+                 'texto': texto}
+                for ruta, orden_registro, id_texto, texto in filas]
+
+    def cerrar(self):
+        with self._lock:
+            self._conexion.close()
+
+
+def abrir_indice(carpeta_mod, actual=None):
+    """Devuelve actual si ya es el índice de carpeta_mod; si no, abre el del mod (None si no se puede)"""
+    if not carpeta_mod:
+        return None
+    if actual is not None and actual.carpeta_mod == os.path.abspath(carpeta_mod):
+        return actual
+    try:
+        return IndiceProyecto(carpeta_mod)
+    except Exception as e:
+        print(f"Error abriendo índice del proyecto: {e}")
+        return None
+
+
+def leer_por_bloques(ruta, indice=None, tamano_bloque=FILAS_POR_BLOQUE):
+    """Registros de un archivo en listas de tamano_bloque, para ir mostrándolos mientras se lee
+
+    Si el archivo no cambió desde que se indexó salen del índice; si hubo que
+    leer el XML, al terminar se guardan en él. Dejar de iterar antes de tiempo
+    no guarda nada.
+    """
+    registros = indice.registros_vigentes(ruta) if indice else None
+    leidos = []
+    bloque = []
+    for registro in (registros if registros is not None else iterar_textos_xml(ruta)):
+        leidos.append(registro)
+        bloque.append(registro)
+        if len(bloque) >= tamano_bloque:
+            yield bloque
+            bloque = []
+    if bloque:
+        yield bloque
+    if indice and registros is None:
+        indice.guardar_registros(ruta, leidos)
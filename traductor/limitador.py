@@ -0,0 +1,111 @@
+import threading
+import time
+
+# (peticiones por segundo sostenidas, ráfaga máxima) por servicio
+LIMITES_POR_DEFECTO = {
+    'google': (10.0, 20),
+    'languagetool': (20 / 60, 5),  # API pública: 20 peticiones por minuto
+}
+
+
+class LimitadorTasa:
+    """Cubo de fichas compartido por todos los hilos que llaman a un mismo servicio"""
+
+    def __init__(self, tasa, rafaga=1, nombre=""):
+        self.nombre = nombre
+        self._lock = threading.Lock()
+        self.tasa = float(tasa)
+        self.rafaga = max(1.0, float(rafaga))
+        self._fichas = self.rafaga
+        self._ultima_reposicion = time.monotonic()
+
+        # Contadores
+        self.peticiones = 0
+        self.esperas = 0
+        self.tiempo_espera = 0.0
+
+    def configurar(self, tasa=None, rafaga=None):
+        """Ajusta la tasa sostenida y/o la ráfaga sin perder los contadores"""
+        with self._lock:
+            self._reponer(time.monotonic())
+            if tasa is not None:
+                self.tasa = float(tasa)
+            if rafaga is not None:
+                self.rafaga = max(1.0, float(rafaga))
+                self._fichas = min(self._fichas, self.rafaga)
+
+    def _reponer(self, ahora):
+        transcurrido = ahora - self._ultima_reposicion
+        self._ultima_reposicion = ahora
+        self._fichas = min(self.rafaga, self._fichas + transcurrido * self.tasa)
+
+    def adquirir(self, fichas=1):
+        """Reserva fichas y duerme lo necesario; devuelve los segundos esperados
+
+        Las fichas pueden quedar en negativo: cada hilo reserva su turno bajo el
+        lock y espera fuera de él, así el ritmo sostenido es exacto aunque haya
+        muchos hilos compitiendo. El tiempo que tarda la propia petición
+        repone fichas, por lo que no se espera de más tras una respuesta lenta.
+        """
+        if self.tasa <= 0:
+            with self._lock:
+                self.peticiones += 1
+            return 0.0
+
+        with self._lock:
+            self._reponer(time.monotonic())
+            self._fichas -= fichas
+            espera = -self._fichas / self.tasa if self._fichas < 0 else 0.0
+            self.peticiones += 1
+            if espera > 0:
+                self.esperas += 1
+                self.tiempo_espera += espera
+
+        if espera > 0:
+            time.sleep(espera)
+        return espera
+
+    def espera_estimada(self, fichas=1):
+        """Segundos que esperaría ahora adquirir(fichas), sin reservar nada"""
+        if self.tasa <= 0:
+            return 0.0
+        with self._lock:
+            self._reponer(time.monotonic())
+            faltan = fichas - self._fichas
+        return faltan / self.tasa if faltan > 0 else 0.0
+
+    def estadisticas(self):
+        with self._lock:
+            return {
+                'tasa': self.tasa,
+                'rafaga': self.rafaga,
+                'peticiones': self.peticiones,
+                'esperas': self.esperas,
+                'tiempo_espera': self.tiempo_espera,
+            }
+
+
+_limitadores = {}
+_lock_limitadores = threading.Lock()
+
+
+def obtener_limitador(servicio):
+    """Devuelve el limitador único del proceso para un servicio"""
+    with _lock_limitadores:
+        if servicio not in _limitadores:
+            tasa, rafaga = LIMITES_POR_DEFECTO.get(servicio, (5.0, 5))
+            _limitadores[servicio] = LimitadorTasa(tasa, rafaga, nombre=servicio)
+        return _limitadores[servicio]
+
+
+def configurar_limitador(servicio, tasa=None, rafaga=None):
+    """Ajusta el limitador de un servicio, por ejemplo a la cuota del proveedor"""
+    limitador = obtener_limitador(servicio)
+    limitador.configurar(tasa, rafaga)
+    return limitador
+
+
+def estadisticas_limitadores():
+    with _lock_limitadores:
+        limitadores = dict(_limitadores)
+    return {servicio: limitador.estadisticas() for servicio, limitador in limitadores.items()}
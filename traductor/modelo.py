@@ -0,0 +1,158 @@
+import threading
+
+COLUMNAS = ('id', 'original', 'traducido', 'estado')
+ESTADO_CORREGIDO = "Corregido"
+
+
+def _contribucion(fila):
+    """Lo que aporta una fila a los contadores (traducida, corregida)"""
+    traducida = 1 if fila[2] and str(fila[2]).strip() else 0
+    corregida = 1 if ESTADO_CORREGIDO in str(fila[3]) else 0
+    return traducida, corregida
+
+
+def filas_de_registros(registros, estado):
+    """Filas de la tabla para registros recién leídos de un archivo, aún sin traducir"""
+    return [(registro['id'], registro['texto'], "", estado) for registro in registros]
+
+
+class ModeloTextos:
+    """Filas de la tabla de textos en memoria, independientes del widget que las muestra
+
+    Cada fila es una lista [id, original, traducido, estado]. La vista es la
+    lista de índices de filas que se muestran (todas, o el resultado de un
+    filtro). Los cambios se notifican a los oyentes con (evento, índices).
+    También lleva al vuelo el texto más largo de cada columna y los contadores
+    de filas traducidas y corregidas, así leerlos no obliga a recorrer las filas.
+
+    Cada limpiar() abre una generación nueva: un trabajo que empezó con otro
+    archivo pasa la generación que leyó al actualizar, y si ya no es la
+    vigente la actualización se descarta en lugar de pisar la fila del mismo
+    número del archivo nuevo.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.filas = []
+        self.vista = []
+        self._filtrado = False
+        self._posiciones = None  # índice de fila -> posición en la vista filtrada
+        self._oyentes = []
+        self.generacion = 0
+        self.longitudes_maximas = [0] * len(COLUMNAS)
+        self._mas_largas = [None] * len(COLUMNAS)  # fila con el texto más largo de cada columna
+        self.contadores = {'total': 0, 'traducidos': 0, 'corregidos': 0}
+
+    def suscribir(self, oyente):
+        self._oyentes.append(oyente)
+
+    def _notificar(self, evento, indices=()):
+        for oyente in list(self._oyentes):
+            oyente(evento, indices)
+
+    def __len__(self):
+        return len(self.filas)
+
+    def _contar(self, fila, signo):
+        traducida, corregida = _contribucion(fila)
+        self.contadores['traducidos'] += signo * traducida
+        self.contadores['corregidos'] += signo * corregida
+
+    def _medir(self, indice):
+        for columna, valor in enumerate(self.filas[indice][:len(COLUMNAS)]):
+            longitud = len(str(valor)) if valor else 0
+            if longitud > self.longitudes_maximas[columna]:
+                self.longitudes_maximas[columna] = longitud
+                self._mas_largas[columna] = indice
+            elif self._mas_largas[columna] == indice and longitud < self.longitudes_maximas[columna]:
+                # La fila más larga se ha acortado: hay que volver a buscar la más larga
+                self._remedir(columna)
+
+    def _remedir(self, columna):
+        self.longitudes_maximas[columna] = 0
+        self._mas_largas[columna] = None
+        for indice, fila in enumerate(self.filas):
+            longitud = len(str(fila[columna])) if fila[columna] else 0
+            if longitud > self.longitudes_maximas[columna]:
+                self.longitudes_maximas[columna] = longitud
+                self._mas_largas[columna] = indice
+
+    def texto_mas_largo(self, columna):
+        with self._lock:
+            indice = self._mas_largas[columna]
+            return str(self.filas[indice][columna]) if indice is not None else ""
+
+    def ancho_sugerido(self, columna, medir=None, minimo=200, maximo=800):
+        """Ancho en píxeles para una columna según su texto más largo
+
+        medir(texto) da el ancho en píxeles con la fuente de la tabla; sin él
+        se estiman 8 píxeles por carácter.
+        """
+        texto = self.texto_mas_largo(columna)
+        ancho = medir(texto) if medir else len(texto) * 8
+        return max(minimo, min(ancho, maximo))
+
+    def limpiar(self):
+        with self._lock:
+            self.filas = []
+            self.vista = []
+            self._filtrado = False
+            self._posiciones = None
+            self.generacion += 1
+            self.longitudes_maximas = [0] * len(COLUMNAS)
+            self._mas_largas = [None] * len(COLUMNAS)
+            self.contadores = {'total': 0, 'traducidos': 0, 'corregidos': 0}
+        self._notificar('limpiado')
+
+    def agregar(self, filas):
+        """Añade filas al final; devuelve los índices asignados"""
+        with self._lock:
+            inicio = len(self.filas)
+            self.filas.extend([list(fila) for fila in filas])
+            indices = range(inicio, len(self.filas))
+            for indice in indices:
+                self._medir(indice)
+                self._contar(self.filas[indice], 1)
+            self.contadores['total'] = len(self.filas)
+            if not self._filtrado:
+                self.vista.extend(indices)
+        self._notificar('agregadas', indices)
+        return indices
+
+    def valores(self, indice):
+        with self._lock:
+            return tuple(self.filas[indice])
+
+    def actualizar(self, indice, valores, generacion=None):
+        """Reemplaza los valores de una fila; devuelve False si generacion ya no es la vigente"""
+        with self._lock:
+            if generacion is not None and generacion != self.generacion:
+                return False
+            fila = self.filas[indice]
+            self._contar(fila, -1)
+            for columna, valor in enumerate(list(valores)[:len(COLUMNAS)]):
+                fila[columna] = valor
+            self._contar(fila, 1)
+            self._medir(indice)
+        self._notificar('actualizada', (indice,))
+        return True
+
+    def mostrar(self, indices=None):
+        """Cambia la vista a los índices dados, o a todas las filas con None"""
+        with self._lock:
+            if indices is None:
+                self.vista = list(range(len(self.filas)))
+                self._filtrado = False
+                self._posiciones = None
+            else:
+                self.vista = list(indices)
+                self._filtrado = True
+                self._posiciones = {indice: posicion for posicion, indice in enumerate(self.vista)}
+        self._notificar('vista')
+
+    def posicion(self, indice):
+        """Posición de una fila en la vista, o None si el filtro la oculta"""
+        with self._lock:
+            if self._posiciones is None:
+                return indice if 0 <= indice < len(self.filas) else None
+            return self._posiciones.get(indice)
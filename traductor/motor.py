@@ -0,0 +1,372 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from .enrutador import Enrutador
+from .fragmentos import dividir_texto, unir_fragmentos
+from .limitador import obtener_limitador
+from .resiliencia import Resiliencia, es_reintentable, estadisticas_vacias
+from .servicios import crear_fabrica
+
+HILOS_POR_DEFECTO = 8
+LIMITE_CARACTERES = 4900
+
+# Agrupación de textos cortos en una sola petición
+DELIMITADOR_LOTE = "\n"
+MAX_TEXTOS_POR_LOTE = 100
+LONGITUD_MAX_AGRUPABLE = 300
+
+
+def normalizar_texto(texto):
+    """Forma canónica de un texto; la misma que usa la clave de cache"""
+    return texto.strip().lower()
+
+
+def agrupar_duplicados(textos):
+    """Devuelve los textos únicos y, para cada texto, el índice de su representante"""
+    unicos = []
+    mapa = []
+    vistos = {}
+    for texto in textos:
+        clave = normalizar_texto(texto)
+        if clave not in vistos:
+            vistos[clave] = len(unicos)
+            unicos.append(texto)
+        mapa.append(vistos[clave])
+    return unicos, mapa
+
+
+def es_agrupable(texto):
+    """Un texto entra en un lote si es corto y no contiene el delimitador"""
+    return len(texto) <= LONGITUD_MAX_AGRUPABLE and DELIMITADOR_LOTE not in texto and texto.strip() == texto
+
+
+def empaquetar_lotes(textos, limite=LIMITE_CARACTERES, max_textos=MAX_TEXTOS_POR_LOTE):
+    """Divide los índices de textos en lotes contiguos que caben en una petición
+
+    Los textos que no son agrupables forman un lote propio, y los lotes se
+    cierran al cambiar de tipo para que cada uno cubra un tramo consecutivo.
+    """
+    lotes = []
+    actual = []
+    longitud = 0
+
+    for indice, texto in enumerate(textos):
+        if not es_agrupable(texto):
+            if actual:
+                lotes.append(actual)
+                actual, longitud = [], 0
+            lotes.append([indice])
+            continue
+
+        extra = len(texto) + (len(DELIMITADOR_LOTE) if actual else 0)
+        if actual and (longitud + extra > limite or len(actual) >= max_textos):
+            lotes.append(actual)
+            actual, longitud = [], 0
+            extra = len(texto)
+
+        actual.append(indice)
+        longitud += extra
+
+    if actual:
+        lotes.append(actual)
+    return lotes
+
+
+class Ejecucion:
+    """Resultados de una traducción en curso junto con su resumen
+
+    Se itera como el generador que envuelve y resumen se va completando
+    mientras tanto: textos, unicos, fragmentados, lotes_divididos (lotes cuya
+    respuesta no se pudo separar) y resiliencia (reintentos, errores y
+    aperturas del cortacircuitos). Cada ejecución tiene el suyo, así dos
+    traducciones simultáneas con el mismo motor no se pisan.
+    """
+
+    def __init__(self, resultados, resumen):
+        self._resultados = resultados
+        self.resumen = resumen
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._resultados)
+
+    def close(self):
+        """Deja de consumir resultados; no se envían más peticiones"""
+        self._resultados.close()
+
+
+class MotorTraduccion:
+    """Motor de traducción concurrente con un pool acotado de hilos
+
+    El servicio se elige por nombre (ver servicios.SERVICIOS) o con una
+    fabrica_cliente propia (origen, destino) -> cliente con translate(texto).
+    Con un enrutador (ver enrutador.Enrutador) las peticiones se reparten entre
+    varios servicios y servicio pasa a ser el nombre del enrutador.
+    Cada petición pasa por la Resiliencia del motor (reintentos y cortacircuitos).
+    """
+
+    def __init__(self, origen='auto', destino='es', max_hilos=HILOS_POR_DEFECTO, fabrica_cliente=None,
+                 servicio='google', resiliencia=None, enrutador=None):
+        self.origen = origen
+        self.destino = destino
+        self.enrutador = enrutador
+        if enrutador is not None:
+            # Cada servicio tiene su limitador; el enrutador ofrece sus contadores sumados
+            self.servicio = enrutador.nombre
+            self.limitador = enrutador
+            self.fabrica_cliente = None
+        else:
+            self.servicio = servicio
+            self.limitador = obtener_limitador(servicio)
+            self.fabrica_cliente = fabrica_cliente or crear_fabrica(servicio)
+        self.resiliencia = resiliencia or Resiliencia()
+        self.max_hilos = max(1, int(max_hilos))
+        self._local = threading.local()
+        self._ejecutor = None
+        self._lock = threading.Lock()
+
+    def configurar_hilos(self, max_hilos):
+        """Cambia el tamaño del pool; el nuevo pool se crea en la siguiente ejecución"""
+        max_hilos = max(1, int(max_hilos))
+        with self._lock:
+            if max_hilos == self.max_hilos:
+                return
+            self.max_hilos = max_hilos
+            ejecutor_anterior, self._ejecutor = self._ejecutor, None
+        if ejecutor_anterior:
+            ejecutor_anterior.shutdown(wait=False)
+
+    def configurar_idiomas(self, origen=None, destino=None):
+        """Cambia el par de idiomas; cada hilo crea su cliente para el nuevo par al necesitarlo"""
+        if origen is not None:
+            self.origen = origen
+        if destino is not None:
+            self.destino = destino
+
+    def cerrar(self):
+        """Libera los hilos del pool"""
+        with self._lock:
+            ejecutor, self._ejecutor = self._ejecutor, None
+        if ejecutor:
+            ejecutor.shutdown(wait=False)
+
+    def _obtener_ejecutor(self):
+        with self._lock:
+            if self._ejecutor is None:
+                self._ejecutor = ThreadPoolExecutor(max_workers=self.max_hilos,
+                                                    thread_name_prefix="traduccion",
+                                                    initializer=self._marcar_hilo_pool)
+            return self._ejecutor
+
+    def _marcar_hilo_pool(self):
+        self._local.en_pool = True
+
+    def _obtener_cliente(self):
+        """Reutiliza un cliente por hilo en lugar de crear uno por texto"""
+        clientes = getattr(self._local, 'clientes', None)
+        if clientes is None:
+            clientes = self._local.clientes = {}
+        clave = (self.origen, self.destino)
+        if clave not in clientes:
+            clientes[clave] = self.fabrica_cliente(self.origen, self.destino)
+        return clientes[clave]
+
+    def traducir_texto(self, texto):
+        """Traduce un único texto, reintentando los fallos transitorios
+
+        Si no cabe en una petición se parte por párrafos o frases y los
+        fragmentos se traducen en paralelo con traducir_lote. Desde un hilo
+        del pool se traducen uno tras otro en ese mismo hilo: esperar al pool
+        desde uno de sus hilos podría bloquearlo.
+        """
+        if len(texto) <= LIMITE_CARACTERES:
+            return self._traducir_peticion(texto)
+        if not getattr(self._local, 'en_pool', False):
+            for _, traduccion, error in self.traducir_lote([texto], agrupar=False, deduplicar=False):
+                if error is not None:
+                    raise error
+                return traduccion
+        fragmentos, separadores = dividir_texto(texto, LIMITE_CARACTERES)
+        return unir_fragmentos([self._traducir_peticion(fragmento) for fragmento in fragmentos], separadores)
+
+    def _traducir_peticion(self, texto, estadisticas=None):
+        """Una petición con el cliente del hilo actual (o el enrutador), con reintentos"""
+        if self.enrutador is not None:
+            return self.resiliencia.llamar(self.enrutador.traducir, texto, self.origen, self.destino,
+                                           estadisticas=estadisticas)
+        return self.resiliencia.llamar(self._peticion, self._obtener_cliente(), texto, estadisticas=estadisticas)
+
+    def _peticion(self, cliente, texto):
+        # Cada intento, también los reintentos, consume cuota del servicio
+        self.limitador.adquirir()
+        return cliente.translate(texto)
+
+    def _traducir_seguro(self, texto, resumen):
+        # Se ejecuta en el pool: los textos largos ya llegan partidos desde traducir_lote
+        try:
+            return self._traducir_peticion(texto, resumen['resiliencia']), None
+        except Exception as e:
+            return None, e
+
+    def _traducir_unidad(self, textos, resumen):
+        """Traduce un lote en una sola petición y lo separa de nuevo por texto
+
+        Si la respuesta no se puede dividir limpiamente (el servicio unió o
+        partió líneas) se vuelve a traducir cada texto por separado.
+        """
+        if len(textos) == 1:
+            return [self._traducir_seguro(textos[0], resumen)]
+
+        traduccion, error = self._traducir_seguro(DELIMITADOR_LOTE.join(textos), resumen)
+        if error is not None and es_reintentable(error):
+            # Ya se reintentó; con el servicio caído, pedir texto a texto solo multiplicaría los fallos
+            return [(None, error)] * len(textos)
+        if traduccion:
+            partes = [parte.strip() for parte in traduccion.replace('\r\n', '\n').split(DELIMITADOR_LOTE)]
+            if len(partes) == len(textos) and all(partes):
+                return [(parte, None) for parte in partes]
+
+        with self._lock:
+            resumen['lotes_divididos'] += 1
+        return [self._traducir_seguro(texto, resumen) for texto in textos]
+
+    def traducir_lote(self, textos, al_progresar=None, agrupar=True, deduplicar=True):
+        """Traduce en paralelo; devuelve una Ejecucion con (indice, traducción, error) en el orden original
+
+        Con deduplicar cada texto distinto se traduce una sola vez y el resultado
+        se reparte entre todas sus repeticiones. Con agrupar los textos cortos
+        viajan juntos en una sola petición. Los que no caben en una petición se
+        parten (ver fragmentos.dividir_texto), sus fragmentos se traducen en
+        paralelo como cualquier otro texto y se vuelven a unir en orden.
+        Mantiene como máximo dos peticiones por hilo en vuelo, así el pool nunca
+        se queda sin trabajo, y cada resultado se libera al entregar la última
+        repetición de su texto: solo se guardan los ya traducidos que aún no se
+        pueden entregar y los de textos que se repiten más adelante.
+        al_progresar recibe (completados, total, textos_por_segundo).
+        """
+        total = len(textos)
+        if deduplicar:
+            unicos, mapa = agrupar_duplicados(textos)
+        else:
+            unicos, mapa = list(textos), list(range(total))
+        # Lo que viaja al servicio: cada texto único entero o, si es largo, sus fragmentos
+        piezas = []
+        tramos = []  # por texto único: (primera pieza, separadores entre sus piezas)
+        for texto in unicos:
+            if len(texto) > LIMITE_CARACTERES:
+                fragmentos, separadores = dividir_texto(texto, LIMITE_CARACTERES)
+            else:
+                fragmentos, separadores = [texto], ['']
+            tramos.append((len(piezas), separadores))
+            piezas.extend(fragmentos)
+        resumen = {'textos': total, 'unicos': len(unicos),
+                   'fragmentados': sum(1 for _, separadores in tramos if len(separadores) > 1),
+                   'lotes_divididos': 0, 'resiliencia': estadisticas_vacias()}
+        resumen['resiliencia'].update(aperturas=0, tiempo_abierto=0.0)
+        return Ejecucion(self._entregar(piezas, tramos, mapa, resumen, al_progresar, agrupar), resumen)
+
+    def _entregar(self, piezas, tramos, mapa, resumen, al_progresar, agrupar):
+        """Generador de traducir_lote: envía las piezas al pool y entrega cada texto en orden"""
+        total = len(mapa)
+        if not total:
+            return
+
+        if agrupar:
+            unidades = empaquetar_lotes(piezas)
+        else:
+            unidades = [[indice] for indice in range(len(piezas))]
+
+        ejecutor = self._obtener_ejecutor()
+        en_vuelo = deque()
+        pendientes = iter(unidades)
+        max_en_vuelo = self.max_hilos * 2
+        resultados_piezas = {}
+        resultados_unicos = {}
+        ultima_aparicion = [0] * len(tramos)
+        for indice, unico in enumerate(mapa):
+            ultima_aparicion[unico] = indice
+        siguiente = 0
+        inicio = time.monotonic()
+
+        def llenar():
+            while len(en_vuelo) < max_en_vuelo:
+                unidad = next(pendientes, None)
+                if unidad is None:
+                    return
+                lote = [piezas[indice] for indice in unidad]
+                en_vuelo.append((unidad, ejecutor.submit(self._traducir_unidad, lote, resumen)))
+
+        def terminado(unico):
+            # Las unidades se recogen en orden: si llegó la última pieza, llegaron todas
+            primera, separadores = tramos[unico]
+            return primera + len(separadores) - 1 in resultados_piezas
+
+        def resultado(unico):
+            primera, separadores = tramos[unico]
+            if len(separadores) == 1:
+                return resultados_piezas[primera]
+            if unico not in resultados_unicos:
+                partes = [resultados_piezas[primera + numero] for numero in range(len(separadores))]
+                errores = [error for _, error in partes if error is not None]
+                if errores:
+                    resultados_unicos[unico] = (None, errores[0])
+                elif not all(traduccion for traduccion, _ in partes):
+                    resultados_unicos[unico] = (None, None)
+                else:
+                    traducciones = [traduccion for traduccion, _ in partes]
+                    resultados_unicos[unico] = (unir_fragmentos(traducciones, separadores), None)
+            return resultados_unicos[unico]
+
+        def liberar(unico):
+            primera, separadores = tramos[unico]
+            for numero in range(len(separadores)):
+                del resultados_piezas[primera + numero]
+            resultados_unicos.pop(unico, None)
+
+        cortacircuitos = self.resiliencia.cortacircuitos
+        aperturas, tiempo_abierto = cortacircuitos.aperturas, cortacircuitos.tiempo_abierto
+        try:
+            llenar()
+            while en_vuelo:
+                unidad, futuro = en_vuelo.popleft()
+                resultados_piezas.update(zip(unidad, futuro.result()))
+                llenar()
+
+                # Los representantes se traducen en orden de primera aparición, así
+                # que todo texto cuyo representante ya terminó se puede entregar
+                inicio_tramo = siguiente
+                while siguiente < total and terminado(mapa[siguiente]):
+                    siguiente += 1
+
+                if al_progresar:
+                    transcurrido = max(time.monotonic() - inicio, 1e-6)
+                    al_progresar(siguiente, total, siguiente / transcurrido)
+
+                for indice in range(inicio_tramo, siguiente):
+                    unico = mapa[indice]
+                    traduccion, error = resultado(unico)
+                    if ultima_aparicion[unico] == indice:
+                        liberar(unico)
+                    yield indice, traduccion, error
+        finally:
+            # El cortacircuitos es de todo el motor: cuenta lo que ocurrió mientras duró esta ejecución
+            resumen['resiliencia'].update(aperturas=cortacircuitos.aperturas - aperturas,
+                                          tiempo_abierto=cortacircuitos.tiempo_abierto - tiempo_abierto)
+
+
+def crear_motor(backends=None, origen='auto', destino='es', max_hilos=HILOS_POR_DEFECTO):
+    """Motor para una lista de Backend (p. ej. de enrutador.crear_backends)
+
+    Sin backends usa Google; con uno, ese servicio directamente, y con
+    varios reparte entre ellos con un Enrutador.
+    """
+    if not backends:
+        return MotorTraduccion(origen, destino, max_hilos)
+    if len(backends) == 1:
+        return MotorTraduccion(origen, destino, max_hilos, fabrica_cliente=backends[0].fabrica_cliente,
+                               servicio=backends[0].nombre)
+    return MotorTraduccion(origen, destino, max_hilos, enrutador=Enrutador(backends))
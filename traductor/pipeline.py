@@ -0,0 +1,150 @@
+import os
+import shutil
+
+from .cache import clave_cache
+from .escaneo import MARCAS_SIN_TRADUCIR, listar_archivos_xml
+from .extraccion import iterar_textos_xml, guardar_traducciones_xml
+from .motor import Ejecucion
+from .placeholders import ErrorPlaceholders, proteger_placeholders, restaurar_placeholders
+from .resiliencia import estadisticas_vacias
+
+
+def es_traducible(texto):
+    return bool(texto) and len(texto.strip()) > 1
+
+
+def traducir_textos(textos, motor, cache=None, al_progresar=None):
+    """Traduce textos con cache y placeholders; devuelve una Ejecucion con (indice, traducción, error, de_cache)
+
+    Lo que está en cache se entrega primero y sin petición; el resto va al
+    motor concurrente con los placeholders protegidos, en el orden original,
+    y cada traducción nueva se guarda en el cache, que la escribe a disco en
+    segundo plano (ver CacheTraducciones). El resumen es el de la ejecución
+    del motor (textos cuenta solo los que no estaban en cache) más de_cache.
+    """
+    resumen = {'textos': 0, 'unicos': 0, 'fragmentados': 0, 'lotes_divididos': 0, 'de_cache': 0,
+               'resiliencia': dict(estadisticas_vacias(), aperturas=0, tiempo_abierto=0.0)}
+    return Ejecucion(_traducir_textos(textos, motor, cache, al_progresar, resumen), resumen)
+
+
+def _traducir_textos(textos, motor, cache, al_progresar, resumen):
+    pendientes = []  # (indice, clave, tokens protegidos)
+    textos_motor = []
+    for indice, texto in enumerate(textos):
+        clave = clave_cache(motor.servicio, motor.origen, motor.destino, texto)
+        traduccion = cache.get(clave) if cache is not None else None
+        if traduccion is not None:
+            resumen['de_cache'] += 1
+            yield indice, traduccion, None, True
+            continue
+        protegido, tokens = proteger_placeholders(texto)
+        pendientes.append((indice, clave, tokens))
+        textos_motor.append(protegido)
+
+    resultados = motor.traducir_lote(textos_motor, al_progresar)
+    resumen.update(resultados.resumen)
+    try:
+        for posicion, traduccion, error in resultados:
+            indice, clave, tokens = pendientes[posicion]
+            if error or not traduccion:
+                yield indice, None, error, False
+                continue
+            try:
+                traduccion = restaurar_placeholders(traduccion, tokens)
+            except ErrorPlaceholders as e:
+                # Ni se guarda ni se cachea: el texto perdería sus placeholders
+                yield indice, None, e, False
+                continue
+            if cache is not None:
+                cache[clave] = traduccion
+            yield indice, traduccion, None, False
+    finally:
+        resultados.close()
+        resumen.update(resultados.resumen)
+
+
+def textos_pendientes(ruta_origen, ruta_destino, sobrescribir=False):
+    """Textos de ruta_destino que faltan por traducir: {id: texto original en ruta_origen}
+
+    Un texto está pendiente si sigue igual que el original o marcado con
+    TODO. Si el destino no existe, lo están todos los del original.
+    """
+    originales = {registro['id']: registro['texto'] for registro in iterar_textos_xml(ruta_origen)}
+    if not os.path.exists(ruta_destino):
+        return {id_texto: texto for id_texto, texto in originales.items() if es_traducible(texto)}
+
+    pendientes = {}
+    for registro in iterar_textos_xml(ruta_destino):
+        original = originales.get(registro['id'])
+        if not es_traducible(original):
+            continue
+        if sobrescribir or registro['texto'] == original or registro['texto'] in MARCAS_SIN_TRADUCIR:
+            pendientes[registro['id']] = original
+    return pendientes
+
+
+def traducir_mod(carpeta_languages, idioma_origen, idioma_destino, motor, cache=None, sobrescribir=False,
+                 al_progresar=None, al_guardar=None):
+    """Traduce todos los XML de un idioma del mod a otro; devuelve un resumen
+
+    Los archivos que no existen en el idioma destino se copian del origen
+    antes de traducirlos. Todos los textos pendientes del mod viajan en una
+    sola pasada del motor, así los duplicados entre archivos se traducen una
+    vez y el pool no se vacía entre archivo y archivo.
+    al_progresar recibe (completados, total, textos_por_segundo) y
+    al_guardar (ruta_destino, textos_guardados) tras escribir cada archivo.
+    Un archivo que no se puede leer o guardar (p. ej. un XML mal formado) no
+    detiene el resto: queda en 'archivos_fallidos' como (ruta, mensaje) para
+    que quien llama lo muestre, y errores cuenta los textos que no se
+    pudieron traducir.
+    """
+    carpeta_origen = os.path.join(carpeta_languages, idioma_origen)
+    carpeta_destino = os.path.join(carpeta_languages, idioma_destino)
+    if not os.path.isdir(carpeta_origen):
+        raise FileNotFoundError(f"No existe la carpeta de idioma: {carpeta_origen}")
+
+    resumen = {'archivos': 0, 'archivos_fallidos': [], 'textos': 0, 'traducidos': 0, 'errores': 0, 'guardados': 0}
+    trabajos = []  # (ruta_origen, ruta_destino, ids)
+    textos = []
+    for ruta_origen in listar_archivos_xml(carpeta_origen):
+        ruta_destino = os.path.join(carpeta_destino, os.path.relpath(ruta_origen, carpeta_origen))
+        try:
+            pendientes = textos_pendientes(ruta_origen, ruta_destino, sobrescribir)
+        except Exception as e:
+            resumen['archivos_fallidos'].append((ruta_origen, f"no se pudo leer: {e}"))
+            continue
+        resumen['archivos'] += 1
+        if pendientes:
+            trabajos.append((ruta_origen, ruta_destino, list(pendientes)))
+            textos.extend(pendientes.values())
+    resumen['textos'] = len(textos)
+
+    traducciones = [None] * len(textos)
+    resultados = traducir_textos(textos, motor, cache, al_progresar)
+    for indice, traduccion, error, _ in resultados:
+        if error or not traduccion:
+            resumen['errores'] += 1
+            continue
+        traducciones[indice] = traduccion
+        resumen['traducidos'] += 1
+    resumen['resiliencia'] = resultados.resumen['resiliencia']
+
+    inicio = 0
+    for ruta_origen, ruta_destino, ids in trabajos:
+        traducciones_archivo = {id_texto: traduccion for id_texto, traduccion
+                                in zip(ids, traducciones[inicio:inicio + len(ids)]) if traduccion}
+        inicio += len(ids)
+        if not traducciones_archivo:
+            continue
+        try:
+            if not os.path.exists(ruta_destino):
+                os.makedirs(os.path.dirname(ruta_destino), exist_ok=True)
+                shutil.copy2(ruta_origen, ruta_destino)
+            guardados = guardar_traducciones_xml(ruta_destino, traducciones_archivo)
+        except Exception as e:
+            resumen['archivos_fallidos'].append((ruta_destino, f"no se pudo guardar: {e}"))
+            continue
+        resumen['guardados'] += guardados
+        if al_guardar:
+            al_guardar(ruta_destino, guardados)
+    return resumen
@@ -0,0 +1,76 @@
+import re
+
+PATRON_PLACEHOLDER = re.compile(r'\{[^}]+\}')
+
+# Lo que el servicio no debe tocar, en una sola pasada: {0} y {PAWN_labelShort},
+# los símbolos de gramática como [PAWN_nameDef] o [recipient_pronoun] (siempre
+# SIMBOLO_propiedad; un [Nota] o [WIP] es texto y se traduce), etiquetas como
+# <color=#FF0000>...</color> y <b>, el \n escrito tal cual en el XML y los
+# saltos de línea reales
+PATRON_TOKENS = re.compile(r'\{[^{}\n]+\}|\[[A-Za-z]+_\w+\]|</?[A-Za-z]+(?:=[^<>\n]*)?>|\\n|\n')
+SALTO_ESCRITO = '\\n'
+
+# Centinela numerado que sustituye a cada token; al restaurar se admiten los
+# espacios que algunos servicios meten dentro
+CENTINELA = "[[{}]]"
+PATRON_RESTAURAR = re.compile(r'\[\s*\[\s*(\d+)\s*\]\s*\]|\r?\n')
+
+# Lo que un corte de texto no debe partir: tokens sin proteger y centinelas
+PATRON_INDIVISIBLE = re.compile(PATRON_TOKENS.pattern + r'|\[\[\d+\]\]')
+
+
+class ErrorPlaceholders(ValueError):
+    """La traducción perdió centinelas: guardarla dejaría el texto sin sus placeholders"""
+
+    def __init__(self, faltan):
+        super().__init__(f"La traducción perdió {', '.join(faltan)}")
+        self.faltan = faltan
+
+
+def extraer_placeholders(texto):
+    """Extrae placeholders como {0}, {1}, {name}, etc., sin repetir"""
+    return list(set(PATRON_PLACEHOLDER.findall(texto)))
+
+
+def proteger_placeholders(texto):
+    """Sustituye placeholders, etiquetas y saltos por centinelas; devuelve (texto protegido, tokens)
+
+    Cada token pasa a ser [[n]], con n su posición en tokens. El \\n escrito
+    se envía como salto de línea real, que los servicios conservan y que
+    permite partir el texto por líneas; un salto real del original, o uno
+    escrito al principio o al final (los servicios recortan los extremos),
+    va como centinela para no confundirlos al restaurar.
+    """
+    tokens = []
+
+    def sustituir(coincidencia):
+        token = coincidencia.group(0)
+        if token == SALTO_ESCRITO and 0 < coincidencia.start() and coincidencia.end() < len(texto):
+            return '\n'
+        tokens.append(token)
+        return CENTINELA.format(len(tokens) - 1)
+
+    return PATRON_TOKENS.sub(sustituir, texto), tokens
+
+
+def restaurar_placeholders(texto_traducido, tokens):
+    """Devuelve cada token a su centinela y los saltos de línea a \\n escrito, en una pasada
+
+    Lanza ErrorPlaceholders si el servicio quitó algún centinela.
+    """
+    restaurados = set()
+
+    def sustituir(coincidencia):
+        numero = coincidencia.group(1)
+        if numero is None:
+            return SALTO_ESCRITO
+        numero = int(numero)
+        if numero >= len(tokens):
+            return coincidencia.group(0)
+        restaurados.add(numero)
+        return tokens[numero]
+
+    restaurado = PATRON_RESTAURAR.sub(sustituir, texto_traducido)
+    if len(restaurados) < len(tokens):
+        raise ErrorPlaceholders([repr(token) for numero, token in enumerate(tokens) if numero not in restaurados])
+    return restaurado
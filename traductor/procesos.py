@@ -0,0 +1,59 @@
+import atexit
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+# Por debajo de esto, arrancar procesos y pasarles los datos cuesta más que leer aquí
+MIN_ELEMENTOS_PROCESOS = 16
+
+_lock = threading.Lock()
+_ejecutor = None
+_max_procesos = None
+
+
+def obtener_ejecutor(max_procesos=None):
+    """Pool de procesos compartido por escaneos e índices; se crea al primer uso y dura toda la sesión"""
+    global _ejecutor, _max_procesos
+    with _lock:
+        if _ejecutor is not None and _max_procesos != max_procesos:
+            # Las tareas ya enviadas terminan; las nuevas van al pool del nuevo tamaño
+            _ejecutor.shutdown(wait=False)
+            _ejecutor = None
+        if _ejecutor is None:
+            _ejecutor = ProcessPoolExecutor(max_workers=max_procesos)
+            _max_procesos = max_procesos
+        return _ejecutor
+
+
+def cerrar_ejecutor():
+    """Termina los procesos del pool; el siguiente uso crea uno nuevo"""
+    global _ejecutor
+    with _lock:
+        ejecutor, _ejecutor = _ejecutor, None
+    if ejecutor is not None:
+        ejecutor.shutdown(wait=False, cancel_futures=True)
+
+
+atexit.register(cerrar_ejecutor)
+
+
+def mapear(funcion, elementos, max_procesos=None):
+    """Aplica funcion a cada elemento y entrega los resultados en orden
+
+    Con MIN_ELEMENTOS_PROCESOS o más, y si max_procesos no es 1, usa el pool
+    compartido; si no hay soporte de procesos (entornos restringidos) o el
+    pool se rompe, sigue en este proceso donde se quedó. funcion tiene que
+    poder enviarse a otro proceso (definida a nivel de módulo).
+    """
+    entregados = 0
+    if len(elementos) >= MIN_ELEMENTOS_PROCESOS and max_procesos != 1:
+        # Bloques de varios elementos por tarea para no pagar la comunicación entre procesos por elemento
+        tamano_bloque = max(1, len(elementos) // ((max_procesos or os.cpu_count() or 1) * 4))
+        try:
+            for resultado in obtener_ejecutor(max_procesos).map(funcion, elementos, chunksize=tamano_bloque):
+                entregados += 1
+                yield resultado
+        except (OSError, RuntimeError):
+            cerrar_ejecutor()
+    for elemento in elementos[entregados:]:
+        yield funcion(elemento)
@@ -0,0 +1,231 @@
+import random
+import threading
+import time
+
+from .servicios import ErrorServicio
+
+# Clases de error de un servicio
+LIMITADO = 'limitado'                # 429: demasiadas peticiones
+SERVIDOR = 'servidor'                # 5xx
+CONEXION = 'conexion'                # timeout, conexión rechazada o cortada
+DEMASIADO_LARGO = 'demasiado_largo'  # 413: el texto no cabe en una petición
+OTRO = 'otro'                        # petición inválida, credenciales... no se arregla reintentando
+
+REINTENTABLES = (LIMITADO, SERVIDOR, CONEXION)
+
+MAX_INTENTOS = 5
+ESPERA_BASE = 0.5
+ESPERA_MAXIMA = 30.0
+UMBRAL_FALLOS = 5
+ENFRIAMIENTO = 30.0
+
+
+def clasificar_error(error):
+    """Clase de un error de servicio (LIMITADO, SERVIDOR, CONEXION, DEMASIADO_LARGO u OTRO)"""
+    if isinstance(error, ErrorServicio):
+        if error.codigo is None:
+            return CONEXION
+        if error.codigo == 429:
+            return LIMITADO
+        if error.codigo == 413:
+            return DEMASIADO_LARGO
+        if error.codigo >= 500 or error.codigo == 408:
+            return SERVIDOR
+        return OTRO
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return CONEXION
+    return OTRO
+
+
+def es_reintentable(error):
+    return clasificar_error(error) in REINTENTABLES
+
+
+class Cortacircuitos:
+    """Deja de llamar a un servicio caído y lo vuelve a probar pasado un tiempo
+
+    Tras umbral_fallos fallos seguidos de servidor o de conexión se abre:
+    todas las llamadas esperan en esperar() en lugar de insistir, así la cola
+    entera se pausa. Pasado el enfriamiento pasa una sola llamada de prueba;
+    si sale bien se cierra y si falla se vuelve a abrir.
+    """
+
+    def __init__(self, umbral_fallos=UMBRAL_FALLOS, enfriamiento=ENFRIAMIENTO):
+        self.umbral_fallos = umbral_fallos
+        self.enfriamiento = enfriamiento
+        self._condicion = threading.Condition()
+        self._fallos_seguidos = 0
+        self._abierto_hasta = None
+        self._probando = False
+
+        # Estadísticas
+        self.aperturas = 0
+        self.tiempo_abierto = 0.0
+
+    @property
+    def abierto(self):
+        with self._condicion:
+            return self._abierto_hasta is not None
+
+    def esperar(self):
+        """Bloquea mientras el circuito está abierto; devuelve los segundos esperados"""
+        inicio = time.monotonic()
+        with self._condicion:
+            while self._abierto_hasta is not None:
+                restante = self._abierto_hasta - time.monotonic()
+                if restante <= 0 and not self._probando:
+                    # Esta llamada es la prueba; las demás siguen esperando su resultado
+                    self._probando = True
+                    break
+                self._condicion.wait(restante if restante > 0 else None)
+        return time.monotonic() - inicio
+
+    def intentar(self):
+        """Como esperar() pero sin bloquear: True si la llamada puede pasar ya (quizá como prueba)"""
+        with self._condicion:
+            if self._abierto_hasta is None:
+                return True
+            if self._abierto_hasta <= time.monotonic() and not self._probando:
+                self._probando = True
+                return True
+            return False
+
+    def tiempo_restante(self):
+        """Segundos hasta que el circuito admita la llamada de prueba (0 si está cerrado)"""
+        with self._condicion:
+            if self._abierto_hasta is None:
+                return 0.0
+            return max(0.0, self._abierto_hasta - time.monotonic())
+
+    def registrar_exito(self):
+        with self._condicion:
+            self._fallos_seguidos = 0
+            if self._abierto_hasta is not None:
+                self._abierto_hasta = None
+                self._probando = False
+                self._condicion.notify_all()
+
+    def registrar_fallo(self):
+        with self._condicion:
+            self._fallos_seguidos += 1
+            if self._probando or (self._abierto_hasta is None and self._fallos_seguidos >= self.umbral_fallos):
+                self._probando = False
+                self._abierto_hasta = time.monotonic() + self.enfriamiento
+                self.aperturas += 1
+                self.tiempo_abierto += self.enfriamiento
+                self._condicion.notify_all()
+
+    def liberar_prueba(self):
+        """La llamada de prueba terminó sin dar veredicto (p. ej. un error que no es del servicio)"""
+        with self._condicion:
+            if self._probando:
+                self._probando = False
+                self._condicion.notify_all()
+
+
+class Resiliencia:
+    """Reintentos con espera exponencial y jitter más un cortacircuitos alrededor de cada llamada
+
+    La espera antes del intento n es un valor al azar entre 0 y
+    min(espera_maxima, espera_base * 2**n) ("full jitter"), así los hilos que
+    fallaron a la vez no vuelven a la vez; si el servicio indicó Retry-After,
+    se espera al menos eso. Solo se reintentan los errores de REINTENTABLES.
+    """
+
+    def __init__(self, max_intentos=MAX_INTENTOS, espera_base=ESPERA_BASE, espera_maxima=ESPERA_MAXIMA,
+                 cortacircuitos=None, semilla=None):
+        self.max_intentos = max(1, int(max_intentos))
+        self.espera_base = espera_base
+        self.espera_maxima = espera_maxima
+        self.cortacircuitos = cortacircuitos or Cortacircuitos()
+        self._aleatorio = random.Random(semilla)
+        self._lock = threading.Lock()
+        self._estadisticas = estadisticas_vacias()
+
+    def _contar(self, campo, cantidad=1, estadisticas=None):
+        with self._lock:
+            self._estadisticas[campo] += cantidad
+            if estadisticas is not None:
+                estadisticas[campo] += cantidad
+
+    def _contar_error(self, clase, estadisticas=None):
+        with self._lock:
+            self._estadisticas['errores'][clase] += 1
+            if estadisticas is not None:
+                estadisticas['errores'][clase] += 1
+
+    def espera(self, intento, error=None):
+        """Segundos a esperar antes de repetir tras el intento dado (0 el primero)"""
+        with self._lock:
+            espera = self._aleatorio.uniform(0, min(self.espera_maxima, self.espera_base * 2 ** intento))
+        reintentar_tras = getattr(error, 'reintentar_tras', None)
+        if reintentar_tras:
+            espera = max(espera, min(reintentar_tras, self.espera_maxima))
+        return espera
+
+    def llamar(self, funcion, *args, estadisticas=None):
+        """Llama a funcion(*args) reintentando los errores transitorios; relanza el último si se agotan
+
+        Los contadores se suman a los de la Resiliencia y, si se pasa, también
+        a estadisticas (ver estadisticas_vacias), p. ej. las de una sola ejecución.
+        """
+        self._contar('llamadas', estadisticas=estadisticas)
+        for intento in range(self.max_intentos):
+            self._contar('espera', self.cortacircuitos.esperar(), estadisticas)
+            try:
+                resultado = funcion(*args)
+            except Exception as e:
+                clase = clasificar_error(e)
+                self._contar_error(clase, estadisticas)
+                if clase in (SERVIDOR, CONEXION):
+                    self.cortacircuitos.registrar_fallo()
+                else:
+                    self.cortacircuitos.liberar_prueba()
+                if clase not in REINTENTABLES:
+                    raise
+                if intento + 1 >= self.max_intentos:
+                    self._contar('agotados', estadisticas=estadisticas)
+                    raise
+                espera = self.espera(intento, e)
+                self._contar('reintentos', estadisticas=estadisticas)
+                self._contar('espera', espera, estadisticas)
+                time.sleep(espera)
+            else:
+                self.cortacircuitos.registrar_exito()
+                return resultado
+
+    def estadisticas(self):
+        with self._lock:
+            estadisticas = dict(self._estadisticas, errores=dict(self._estadisticas['errores']))
+        estadisticas['aperturas'] = self.cortacircuitos.aperturas
+        estadisticas['tiempo_abierto'] = self.cortacircuitos.tiempo_abierto
+        return estadisticas
+
+
+def estadisticas_vacias():
+    """Contadores a cero con los campos de Resiliencia.estadisticas(), salvo los del cortacircuitos"""
+    return {'llamadas': 0, 'reintentos': 0, 'agotados': 0, 'espera': 0.0,
+            'errores': {clase: 0 for clase in REINTENTABLES + (DEMASIADO_LARGO, OTRO)}}
+
+
+def diferencia_estadisticas(antes, despues):
+    """Lo ocurrido entre dos llamadas a Resiliencia.estadisticas(), p. ej. durante una traducción"""
+    diferencia = {campo: despues[campo] - antes[campo] for campo in despues if campo != 'errores'}
+    diferencia['errores'] = {clase: despues['errores'][clase] - antes['errores'][clase]
+                             for clase in despues['errores']}
+    return diferencia
+
+
+def describir_estadisticas(estadisticas):
+    """Resumen corto para el mensaje final de una traducción; vacío si no hubo incidencias"""
+    partes = []
+    if estadisticas['reintentos']:
+        partes.append(f"{estadisticas['reintentos']} reintentos")
+    if estadisticas['agotados']:
+        partes.append(f"{estadisticas['agotados']} peticiones fallidas tras reintentar")
+    if estadisticas['aperturas']:
+        partes.append(f"servicio pausado {estadisticas['aperturas']} veces")
+    limitados = estadisticas['errores'][LIMITADO]
+    if limitados:
+        partes.append(f"{limitados} respuestas 429")
+    return ", ".join(partes)
@@ -0,0 +1,201 @@
+import http.client
+import json
+import urllib.parse
+
+try:
+    from deep_translator import GoogleTranslator
+    from deep_translator.exceptions import NotValidLength, RequestError, TooManyRequests
+    DEEP_TRANSLATOR_AVAILABLE = True
+except ImportError:
+    DEEP_TRANSLATOR_AVAILABLE = False
+
+try:
+    import requests
+except ImportError:
+    requests = None
+
+TIMEOUT_POR_DEFECTO = 30
+URL_LIBRETRANSLATE = "http://localhost:5000"
+URL_DEEPL = "https://api.deepl.com"
+URL_DEEPL_GRATIS = "https://api-free.deepl.com"
+
+# Códigos de destino que DeepL escribe distinto (el resto es el código ISO en mayúsculas)
+IDIOMAS_DESTINO_DEEPL = {
+    'en': 'EN-US',
+    'pt': 'PT-BR',
+    'zh-cn': 'ZH-HANS',
+    'zh-tw': 'ZH-HANT',
+}
+
+
+class ErrorServicio(Exception):
+    """Fallo de un servicio de traducción con su código HTTP y, si lo indicó, cuándo reintentar"""
+
+    def __init__(self, mensaje, codigo=None, reintentar_tras=None):
+        super().__init__(mensaje)
+        self.codigo = codigo
+        self.reintentar_tras = reintentar_tras
+
+
+class ClienteGoogle:
+    """GoogleTranslator de deep_translator con sus errores convertidos en ErrorServicio"""
+
+    def __init__(self, origen, destino):
+        if not DEEP_TRANSLATOR_AVAILABLE:
+            raise RuntimeError("deep_translator no está instalado")
+        self._traductor = GoogleTranslator(source=origen, target=destino)
+
+    def translate(self, texto):
+        try:
+            return self._traductor.translate(texto)
+        except TooManyRequests as e:
+            raise ErrorServicio(f"Google respondió 429: {e}", 429) from e
+        except NotValidLength as e:
+            raise ErrorServicio(f"Texto demasiado largo para Google: {e}", 413) from e
+        except RequestError as e:
+            # deep_translator no conserva el código; un fallo de la petición se trata como del servidor
+            raise ErrorServicio(f"Google no respondió correctamente: {e}", 503) from e
+        except Exception as e:
+            if requests is not None and isinstance(e, (requests.Timeout, requests.ConnectionError)):
+                raise ErrorServicio(f"No se pudo conectar con Google: {e}") from e
+            raise
+
+
+class _ClienteHTTP:
+    """Conexión HTTP persistente a un servicio; el motor crea un cliente por hilo
+
+    Así cada hilo reutiliza su conexión en lugar de abrir una por texto.
+    """
+
+    def __init__(self, url, timeout=TIMEOUT_POR_DEFECTO):
+        self.url = url
+        self.timeout = timeout
+        partes = urllib.parse.urlsplit(self.url)
+        self._clase_conexion = http.client.HTTPSConnection if partes.scheme == 'https' else http.client.HTTPConnection
+        self._host = partes.netloc
+        self._ruta = partes.path
+        self._conexion = None
+
+    def _pedir(self, cuerpo, cabeceras):
+        if self._conexion is None:
+            self._conexion = self._clase_conexion(self._host, timeout=self.timeout)
+        self._conexion.request('POST', self._ruta, cuerpo, cabeceras)
+        respuesta = self._conexion.getresponse()
+        return respuesta, respuesta.read()
+
+    def _post_json(self, datos, cabeceras=None):
+        """Envía datos como JSON y devuelve la respuesta decodificada; los fallos salen como ErrorServicio"""
+        cuerpo = json.dumps(datos).encode('utf-8')
+        cabeceras = dict(cabeceras or {}, **{'Content-Type': 'application/json'})
+        try:
+            try:
+                respuesta, contenido = self._pedir(cuerpo, cabeceras)
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                # El servidor cerró la conexión reutilizada; se repite una vez con otra nueva
+                self.cerrar()
+                respuesta, contenido = self._pedir(cuerpo, cabeceras)
+        except (OSError, http.client.HTTPException) as e:
+            self.cerrar()
+            raise ErrorServicio(f"No se pudo conectar con {self.url}: {e}") from e
+
+        if respuesta.status != 200:
+            raise ErrorServicio(f"{self.nombre} respondió {respuesta.status}: {_mensaje_error(contenido, respuesta)}",
+                                respuesta.status, _segundos(respuesta.getheader('Retry-After')))
+        return json.loads(contenido.decode('utf-8'))
+
+    def cerrar(self):
+        if self._conexion is not None:
+            self._conexion.close()
+            self._conexion = None
+
+
+class ClienteLibreTranslate(_ClienteHTTP):
+    """Cliente de la API /translate de LibreTranslate (y de cualquier servidor compatible)"""
+
+    nombre = "LibreTranslate"
+
+    def __init__(self, origen, destino, url=URL_LIBRETRANSLATE, api_key=None, timeout=TIMEOUT_POR_DEFECTO):
+        super().__init__(url.rstrip('/') + "/translate", timeout)
+        self.origen = origen
+        self.destino = destino
+        self.api_key = api_key
+
+    def translate(self, texto):
+        datos = {'q': texto, 'source': self.origen, 'target': self.destino, 'format': 'text'}
+        if self.api_key:
+            datos['api_key'] = self.api_key
+        return self._post_json(datos)['translatedText']
+
+
+class ClienteDeepL(_ClienteHTTP):
+    """Cliente de la API v2 de DeepL; las claves gratuitas (terminadas en :fx) van a api-free"""
+
+    nombre = "DeepL"
+
+    def __init__(self, origen, destino, api_key=None, url=None, timeout=TIMEOUT_POR_DEFECTO):
+        if not api_key:
+            raise ValueError("DeepL necesita una clave de API")
+        if url is None:
+            url = URL_DEEPL_GRATIS if api_key.endswith(':fx') else URL_DEEPL
+        super().__init__(url.rstrip('/') + "/v2/translate", timeout)
+        self.api_key = api_key
+        # DeepL detecta el idioma si no se indica el original
+        self.origen = None if origen == 'auto' else origen.split('-')[0].upper()
+        self.destino = IDIOMAS_DESTINO_DEEPL.get(destino.lower(), destino.upper())
+
+    def translate(self, texto):
+        datos = {'text': [texto], 'target_lang': self.destino, 'preserve_formatting': True}
+        if self.origen:
+            datos['source_lang'] = self.origen
+        respuesta = self._post_json(datos, {'Authorization': f"DeepL-Auth-Key {self.api_key}"})
+        return respuesta['translations'][0]['text']
+
+
+def _mensaje_error(contenido, respuesta):
+    try:
+        datos = json.loads(contenido.decode('utf-8'))
+        return datos.get('error') or datos.get('message') or respuesta.reason
+    except (ValueError, AttributeError):
+        return respuesta.reason
+
+
+def _segundos(valor):
+    try:
+        return float(valor) if valor is not None else None
+    except ValueError:
+        return None
+
+
+# Servicio -> fábrica de clientes (origen, destino, **opciones); el cliente solo necesita translate(texto)
+SERVICIOS = {
+    'google': ClienteGoogle,
+    'libretranslate': ClienteLibreTranslate,
+    'deepl': ClienteDeepL,
+}
+
+# Opciones que admite cada servicio además del par de idiomas
+OPCIONES_SERVICIOS = {
+    'google': (),
+    'libretranslate': ('url', 'api_key', 'timeout'),
+    'deepl': ('api_key', 'url', 'timeout'),
+}
+
+# Opciones sin las que el servicio no funciona
+OPCIONES_OBLIGATORIAS = {
+    'deepl': ('api_key',),
+}
+
+
+def crear_fabrica(servicio, **opciones):
+    """Fábrica (origen, destino) -> cliente para MotorTraduccion, con las opciones del servicio (url, api_key...)
+
+    Lanza ValueError al crearla, no al traducir, si el servicio no existe o
+    le falta una opción obligatoria.
+    """
+    if servicio not in SERVICIOS:
+        raise ValueError(f"Servicio de traducción desconocido: {servicio}")
+    for opcion in OPCIONES_OBLIGATORIAS.get(servicio, ()):
+        if not opciones.get(opcion):
+            raise ValueError(f"El servicio {servicio} necesita la opción {opcion}")
+    crear = SERVICIOS[servicio]
+    return lambda origen, destino: crear(origen, destino, **opciones)
@@ -0,0 +1,194 @@
+"""Servidor local que imita a un servicio de traducción para pruebas de carga sin red
+
+Habla la API /translate de LibreTranslate, así que el motor lo usa con el
+servicio 'libretranslate' apuntando a su URL:
+
+    python -m traductor.servidor_simulado --puerto 5000 --latencia-ms 150 --errores 0.02 --tasa 20
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DISTRIBUCIONES = ('fija', 'uniforme', 'lognormal')
+MAX_CARACTERES_POR_DEFECTO = 5000
+
+
+class ServidorSimulado:
+    """Servicio de traducción falso con latencia, errores, límite de tasa y tamaño máximo configurables
+
+    - latencia_ms y distribucion: 'fija', 'uniforme' (entre 0 y el doble) o
+      'lognormal' (misma media, cola larga como los servicios reales).
+    - tasa_errores: proporción de peticiones que fallan con 500.
+    - tasa y rafaga: cubo de fichas; sin fichas responde 429 con Retry-After.
+    - max_caracteres: los textos más largos se rechazan con 413.
+    La "traducción" antepone el idioma destino a cada línea y respeta los
+    saltos de línea, igual que un servicio real con un lote de textos.
+    """
+
+    def __init__(self, puerto=0, latencia_ms=100, distribucion='lognormal', tasa_errores=0.0, tasa=None, rafaga=10,
+                 max_caracteres=MAX_CARACTERES_POR_DEFECTO, semilla=None, host='127.0.0.1'):
+        if distribucion not in DISTRIBUCIONES:
+            raise ValueError(f"Distribución de latencia desconocida: {distribucion}")
+        self.latencia = latencia_ms / 1000
+        self.distribucion = distribucion
+        self.tasa_errores = tasa_errores
+        self.tasa = tasa
+        self.rafaga = max(1.0, float(rafaga))
+        self.max_caracteres = max_caracteres
+        self._aleatorio = random.Random(semilla)
+        self._lock = threading.Lock()
+        self._fichas = self.rafaga
+        self._ultima_reposicion = time.monotonic()
+        self.estadisticas = {'peticiones': 0, 'traducidas': 0, 'errores': 0, 'limitadas': 0, 'demasiado_largas': 0,
+                             'caracteres': 0}
+
+        self._servidor = ThreadingHTTPServer((host, puerto), _crear_manejador(self))
+        self._servidor.daemon_threads = True
+        self._hilo = None
+
+    @property
+    def url(self):
+        host, puerto = self._servidor.server_address[:2]
+        return f"http://{host}:{puerto}"
+
+    def atender(self):
+        """Atiende peticiones en este hilo hasta que se llame a detener()"""
+        self._servidor.serve_forever()
+
+    def iniciar(self):
+        """Atiende peticiones en un hilo propio; devuelve el servidor para encadenar"""
+        self._hilo = threading.Thread(target=self.atender, daemon=True, name="servidor_simulado")
+        self._hilo.start()
+        return self
+
+    def detener(self):
+        if self._hilo:
+            self._servidor.shutdown()
+        self._servidor.server_close()
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *error):
+        self.detener()
+
+    def _contar(self, campo, cantidad=1):
+        with self._lock:
+            self.estadisticas[campo] += cantidad
+
+    def _sortear_latencia(self):
+        with self._lock:
+            if self.distribucion == 'fija' or not self.latencia:
+                return self.latencia
+            if self.distribucion == 'uniforme':
+                return self._aleatorio.uniform(0, 2 * self.latencia)
+            # Lognormal con sigma 0.5 y la media pedida
+            return self._aleatorio.lognormvariate(0, 0.5) * self.latencia / 1.1331
+
+    def _admitir(self):
+        """Toma una ficha del cubo; devuelve los segundos a esperar si no hay"""
+        if not self.tasa:
+            return None
+        with self._lock:
+            ahora = time.monotonic()
+            self._fichas = min(self.rafaga, self._fichas + (ahora - self._ultima_reposicion) * self.tasa)
+            self._ultima_reposicion = ahora
+            if self._fichas < 1:
+                return (1 - self._fichas) / self.tasa
+            self._fichas -= 1
+            return None
+
+    def _falla(self):
+        with self._lock:
+            return self._aleatorio.random() < self.tasa_errores
+
+    def responder(self, datos):
+        """Resuelve una petición /translate; devuelve (código HTTP, cuerpo, cabeceras)"""
+        self._contar('peticiones')
+        espera = self._admitir()
+        if espera is not None:
+            self._contar('limitadas')
+            return 429, {'error': "Too many requests"}, {'Retry-After': f"{espera:.2f}"}
+
+        texto = datos.get('q')
+        if not isinstance(texto, str):
+            return 400, {'error': "Invalid request: missing q parameter"}, {}
+        if self.max_caracteres and len(texto) > self.max_caracteres:
+            self._contar('demasiado_largas')
+            return 413, {'error': f"Text too long (max {self.max_caracteres} characters)"}, {}
+
+        time.sleep(self._sortear_latencia())
+        if self._falla():
+            self._contar('errores')
+            return 500, {'error': "Simulated server error"}, {}
+
+        destino = datos.get('target', 'es')
+        traduccion = "\n".join(f"[{destino}] {linea}" if linea.strip() else linea for linea in texto.split("\n"))
+        self._contar('traducidas')
+        self._contar('caracteres', len(texto))
+        return 200, {'translatedText': traduccion}, {}
+
+
+def _crear_manejador(servidor):
+    class Manejador(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Cabeceras y cuerpo salen en escrituras separadas; con Nagle cada respuesta esperaría al ACK retrasado
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            if self.path.rstrip('/') != "/translate":
+                self._enviar(404, {'error': "Not found"})
+                return
+            try:
+                longitud = int(self.headers.get('Content-Length', 0))
+                datos = json.loads(self.rfile.read(longitud).decode('utf-8') or "{}")
+            except (ValueError, UnicodeDecodeError):
+                self._enviar(400, {'error': "Invalid JSON"})
+                return
+            self._enviar(*servidor.responder(datos))
+
+        def _enviar(self, codigo, cuerpo, cabeceras=None):
+            contenido = json.dumps(cuerpo, ensure_ascii=False).encode('utf-8')
+            self.send_response(codigo)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(contenido)))
+            for nombre, valor in (cabeceras or {}).items():
+                self.send_header(nombre, valor)
+            self.end_headers()
+            self.wfile.write(contenido)
+
+        def log_message(self, formato, *argumentos):
+            pass
+
+    return Manejador
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m traductor.servidor_simulado",
+                                     description="Servicio de traducción simulado compatible con LibreTranslate")
+    parser.add_argument('--puerto', type=int, default=5000)
+    parser.add_argument('--latencia-ms', type=float, default=100)
+    parser.add_argument('--distribucion', choices=DISTRIBUCIONES, default='lognormal')
+    parser.add_argument('--errores', type=float, default=0.0, help="Proporción de peticiones que fallan con 500")
+    parser.add_argument('--tasa', type=float, help="Peticiones por segundo admitidas; las demás reciben 429")
+    parser.add_argument('--rafaga', type=float, default=10)
+    parser.add_argument('--max-caracteres', type=int, default=MAX_CARACTERES_POR_DEFECTO)
+    argumentos = parser.parse_args(argv)
+
+    servidor = ServidorSimulado(argumentos.puerto, argumentos.latencia_ms, argumentos.distribucion,
+                                argumentos.errores, argumentos.tasa, argumentos.rafaga, argumentos.max_caracteres)
+    print(f"Servidor simulado en {servidor.url}/translate (Ctrl+C para detener)")
+    try:
+        servidor.atender()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.detener()
+        print(servidor.estadisticas)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+from .modelo import COLUMNAS
+
+BUFFER_FILAS = 2
+PASO_RUEDA = 3
+ALTO_FILA_POR_DEFECTO = 20
+ALTO_CABECERA_POR_DEFECTO = 25
+
+# Máscaras de event.state
+MASCARA_SHIFT = 0x0001
+MASCARA_CONTROL = 0x0004
+
+
+class TablaVirtual:
+    """Muestra un ModeloTextos en un ttk.Treeview materializando solo las filas visibles
+
+    Ofrece las llamadas de Treeview que usa el editor (item, selection,
+    selection_set, get_children, set, yview, configure) trabajando sobre el
+    modelo, y delega el resto en el widget. El iid de cada fila es su índice
+    en el modelo como texto, así sigue siendo válido aunque la fila no esté
+    materializada. La selección vive en el modelo y sobrevive al desplazamiento.
+    """
+
+    def __init__(self, widget, modelo, etiquetas_fila=None):
+        self.widget = widget
+        self.modelo = modelo
+        self.etiquetas_fila = etiquetas_fila  # posición en la vista -> tags de la fila
+        self.inicio = 0
+        self._seleccion = set()
+        self._foco = None
+        self._ancla = None
+        self._materializadas = []
+        self._visibles = set()
+        self._yscrollcommand = None
+        self._render_pendiente = False
+        self._alto_fila = ALTO_FILA_POR_DEFECTO
+        self._alto_cabecera = ALTO_CABECERA_POR_DEFECTO
+
+        widget.bind('<Configure>', lambda e: self._programar_render(), add='+')
+        widget.bind('<<TreeviewSelect>>', self._al_seleccionar_widget, add='+')
+        widget.bind('<ButtonPress-1>', self._al_pulsar, add='+')
+        widget.bind('<MouseWheel>', self._al_girar_rueda, add='+')
+        widget.bind('<Button-4>', lambda e: self._desplazar(-PASO_RUEDA), add='+')
+        widget.bind('<Button-5>', lambda e: self._desplazar(PASO_RUEDA), add='+')
+        for tecla, delta in (('Up', -1), ('Down', 1), ('Prior', 'pagina_arriba'), ('Next', 'pagina_abajo'),
+                             ('Home', 'inicio'), ('End', 'fin')):
+            widget.bind(f'<{tecla}>', lambda e, d=delta: self._mover_foco(d, False), add='+')
+            widget.bind(f'<Shift-{tecla}>', lambda e, d=delta: self._mover_foco(d, True), add='+')
+        self._secuencias_propias = {'<Configure>', '<<TreeviewSelect>>', '<ButtonPress-1>', '<Button-1>',
+                                    '<MouseWheel>', '<Button-4>', '<Button-5>'}
+        modelo.suscribir(self._al_cambiar_modelo)
+
+    def bind(self, secuencia=None, funcion=None, add=None):
+        # Los eventos que usa la propia tabla se comparten: sus manejadores nunca se reemplazan
+        if secuencia in self._secuencias_propias:
+            add = '+'
+        return self.widget.bind(secuencia, funcion, add)
+
+    def __getattr__(self, nombre):
+        return getattr(self.widget, nombre)
+
+    def __getitem__(self, opcion):
+        return self.widget[opcion]
+
+    # ---- Renderizado ----
+
+    def filas_visibles(self):
+        if self._materializadas:
+            caja = self.widget.bbox(str(self._materializadas[0]))
+            if caja:
+                self._alto_cabecera, self._alto_fila = caja[1], max(1, caja[3])
+        return max(1, (self.widget.winfo_height() - self._alto_cabecera) // self._alto_fila)
+
+    def _programar_render(self):
+        if not self._render_pendiente:
+            self._render_pendiente = True
+            self.widget.after_idle(self.renderizar)
+
+    def renderizar(self):
+        """Sustituye las filas del Treeview por las de la ventana visible"""
+        self._render_pendiente = False
+        vista = self.modelo.vista
+        total = len(vista)
+        visibles = self.filas_visibles()
+        self.inicio = max(0, min(self.inicio, total - visibles))
+
+        deseadas = vista[self.inicio:self.inicio + visibles + BUFFER_FILAS]
+        if deseadas != self._materializadas:
+            hijos = self.widget.get_children()
+            if hijos:
+                self.widget.delete(*hijos)
+            for posicion, indice in enumerate(deseadas, start=self.inicio):
+                opciones = {'values': self.modelo.valores(indice)}
+                if self.etiquetas_fila:
+                    opciones['tags'] = self.etiquetas_fila(posicion)
+                self.widget.insert('', 'end', iid=str(indice), **opciones)
+            self._materializadas = list(deseadas)
+            self._visibles = set(deseadas)
+            self.widget.selection_set([str(i) for i in deseadas if i in self._seleccion])
+            if self._foco in self._visibles:
+                self.widget.focus(str(self._foco))
+        # El Treeview nunca se desplaza por su cuenta; la ventana la decide self.inicio
+        self.widget.yview_moveto(0)
+
+        if self._yscrollcommand:
+            if total:
+                self._yscrollcommand(self.inicio / total, min(1.0, (self.inicio + visibles) / total))
+            else:
+                self._yscrollcommand(0.0, 1.0)
+
+    def _al_cambiar_modelo(self, evento, indices):
+        if evento == 'actualizada':
+            indice = indices[0]
+            if indice in self._visibles:
+                try:
+                    self.widget.item(str(indice), values=self.modelo.valores(indice))
+                except Exception:
+                    pass  # La fila se desmaterializó mientras tanto
+            return
+        if evento == 'limpiado':
+            self.inicio = 0
+            self._seleccion.clear()
+            self._foco = self._ancla = None
+        elif evento == 'vista':
+            self.inicio = 0
+            self._seleccion &= set(self.modelo.vista)
+        self._programar_render()
+
+    # ---- Desplazamiento y teclado ----
+
+    def yview(self, *args):
+        total = len(self.modelo.vista)
+        visibles = self.filas_visibles()
+        if not args:
+            if not total:
+                return 0.0, 1.0
+            return self.inicio / total, min(1.0, (self.inicio + visibles) / total)
+        if args[0] == 'moveto':
+            self.inicio = int(float(args[1]) * total)
+        elif args[0] == 'scroll':
+            cantidad = int(args[1])
+            self.inicio += cantidad * visibles if args[2] == 'pages' else cantidad
+        self.renderizar()
+
+    def _desplazar(self, filas):
+        self.inicio += filas
+        self.renderizar()
+        return "break"
+
+    def _al_girar_rueda(self, event):
+        return self._desplazar(-PASO_RUEDA if event.delta > 0 else PASO_RUEDA)
+
+    def ver(self, indice):
+        """Desplaza la ventana lo justo para que la fila quede visible"""
+        posicion = self.modelo.posicion(indice)
+        if posicion is None:
+            return
+        visibles = self.filas_visibles()
+        if posicion < self.inicio:
+            self.inicio = posicion
+        elif posicion >= self.inicio + visibles:
+            self.inicio = posicion - visibles + 1
+        self.renderizar()
+
+    def see(self, item):
+        self.ver(int(item))
+
+    def _mover_foco(self, delta, extender):
+        vista = self.modelo.vista
+        if not vista:
+            return "break"
+        posicion = self.modelo.posicion(self._foco) if self._foco is not None else None
+        if delta == 'inicio':
+            posicion = 0
+        elif delta == 'fin':
+            posicion = len(vista) - 1
+        elif posicion is None:
+            posicion = self.inicio
+        elif delta in ('pagina_arriba', 'pagina_abajo'):
+            paso = self.filas_visibles()
+            posicion += paso if delta == 'pagina_abajo' else -paso
+        else:
+            posicion += delta
+        posicion = max(0, min(posicion, len(vista) - 1))
+
+        self._foco = vista[posicion]
+        if extender and self._ancla is not None and self.modelo.posicion(self._ancla) is not None:
+            desde, hasta = sorted((self.modelo.posicion(self._ancla), posicion))
+            self._seleccion = set(vista[desde:hasta + 1])
+        else:
+            self._seleccion = {self._foco}
+            self._ancla = self._foco
+        self.ver(self._foco)
+        self.widget.event_generate('<<TreeviewSelect>>')
+        return "break"
+
+    # ---- Selección ----
+
+    def _al_pulsar(self, event):
+        # Un clic sin modificadores reemplaza la selección, también la de filas no visibles;
+        # las visibles las sincroniza <<TreeviewSelect>>
+        if self.widget.identify_region(event.x, event.y) in ('cell', 'tree') and \
+                not event.state & (MASCARA_SHIFT | MASCARA_CONTROL):
+            self._seleccion &= self._visibles
+
+    def _al_seleccionar_widget(self, event=None):
+        seleccion_widget = set(self.widget.selection())
+        for indice in self._materializadas:
+            if str(indice) in seleccion_widget:
+                self._seleccion.add(indice)
+            else:
+                self._seleccion.discard(indice)
+        foco = self.widget.focus()
+        if foco:
+            self._foco = int(foco)
+            if len(seleccion_widget) == 1:
+                self._ancla = self._foco
+        self.widget.yview_moveto(0)
+
+    def selection(self):
+        return tuple(str(indice) for indice in sorted(self._seleccion))
+
+    def selection_set(self, *items):
+        if len(items) == 1 and isinstance(items[0], (list, tuple)):
+            items = items[0]
+        self._seleccion = {int(item) for item in items}
+        self.widget.selection_set([str(i) for i in self._materializadas if i in self._seleccion])
+
+    # ---- Acceso a filas al estilo Treeview ----
+
+    def get_children(self, item=''):
+        return tuple(str(indice) for indice in self.modelo.vista)
+
+    def item(self, item, option=None, generacion=None, **opciones):
+        indice = int(item)
+        if 'values' in opciones:
+            # Con generacion, una fila de un archivo anterior se ignora sin error
+            if not self.modelo.actualizar(indice, opciones.pop('values'), generacion):
+                return None
+        if opciones and indice in self._visibles:
+            self.widget.item(item, **opciones)
+        if option == 'values':
+            return self.modelo.valores(indice)
+        if option is None and not opciones:
+            return {'values': self.modelo.valores(indice)}
+        return None
+
+    def set(self, item, column=None, value=None):
+        indice = int(item)
+        valores = list(self.modelo.valores(indice))
+        if column is None:
+            return dict(zip(COLUMNAS, valores))
+        columna = int(column[1:]) - 1 if str(column).startswith('#') else COLUMNAS.index(column)
+        if value is None:
+            return valores[columna]
+        valores[columna] = value
+        self.modelo.actualizar(indice, valores)
+
+    def configure(self, **opciones):
+        if 'yscrollcommand' in opciones:
+            self._yscrollcommand = opciones.pop('yscrollcommand')
+        if opciones:
+            self.widget.configure(**opciones)
+
+    config = configure
+
+    def limpiar(self):
+        self.modelo.limpiar()
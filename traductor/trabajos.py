@@ -0,0 +1,192 @@
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+MAX_TRABAJOS = 4
+ESPERA_CIERRE = 3.0  # segundos que cerrar() espera a que los trabajos cancelados terminen
+
+# Columnas del panel de trabajos: (columna, título, ancho)
+COLUMNAS_PANEL = (('trabajo', 'Trabajo', 300), ('estado', 'Estado', 90),
+                  ('progreso', 'Progreso', 140), ('restante', 'Restante', 90))
+
+EN_COLA = "En cola"
+EN_CURSO = "En curso"
+TERMINADO = "Terminado"
+CANCELADO = "Cancelado"
+FALLIDO = "Error"
+
+_local = threading.local()
+
+
+def trabajo_actual():
+    """Trabajo que se está ejecutando en este hilo, o None fuera del gestor"""
+    return getattr(_local, 'trabajo', None)
+
+
+class Trabajo:
+    """Un trabajo en segundo plano: su estado, progreso y petición de cancelación
+
+    La cancelación es cooperativa: el código del trabajo consulta cancelado
+    en sus puntos seguros y termina por su cuenta.
+    """
+
+    def __init__(self, numero, tipo, descripcion):
+        self.numero = numero
+        self.tipo = tipo
+        self.descripcion = descripcion
+        self.estado = EN_COLA
+        self.completados = 0
+        self.total = 0
+        self.inicio = None
+        self.fin = None
+        self.error = None
+        self._cancelacion = threading.Event()
+        self.terminado = threading.Event()
+
+    @property
+    def cancelado(self):
+        return self._cancelacion.is_set()
+
+    def cancelar(self):
+        self._cancelacion.set()
+
+    def progresar(self, completados, total=None):
+        self.completados = completados
+        if total is not None:
+            self.total = total
+
+    def eta(self):
+        """Segundos estimados hasta terminar según el ritmo actual, o None si aún no se sabe"""
+        if not self.inicio or not self.total or not self.completados:
+            return None
+        transcurrido = time.monotonic() - self.inicio
+        return transcurrido / self.completados * (self.total - self.completados)
+
+
+class GestorTrabajos:
+    """Ejecuta los trabajos de la aplicación en un pool acotado de hilos
+
+    Con unico=True (lo normal) un trabajo nuevo sustituye a los del mismo
+    tipo: los anteriores se cancelan y el nuevo no empieza hasta que terminen
+    los que ya estaban en curso, así dos cargas de idioma nunca se pisan. Los
+    que seguían en cola terminan sin llegar a ejecutarse.
+    """
+
+    def __init__(self, max_trabajos=MAX_TRABAJOS):
+        self._ejecutor = ThreadPoolExecutor(max_workers=max_trabajos, thread_name_prefix="trabajo")
+        self._lock = threading.Lock()
+        self._numeros = itertools.count(1)
+        self._trabajos = []
+
+    def lanzar(self, tipo, descripcion, funcion, *args, unico=True):
+        """Encola funcion(*args) como trabajo; devuelve el Trabajo"""
+        trabajo = Trabajo(next(self._numeros), tipo, descripcion)
+        with self._lock:
+            anteriores = [t for t in self._trabajos if t.tipo == tipo] if unico else []
+            for anterior in anteriores:
+                anterior.cancelar()
+            en_curso = [anterior for anterior in anteriores if anterior.estado == EN_CURSO]
+            self._trabajos.append(trabajo)
+        self._ejecutor.submit(self._ejecutar, trabajo, en_curso, funcion, args)
+        return trabajo
+
+    def _ejecutar(self, trabajo, anteriores, funcion, args):
+        try:
+            for anterior in anteriores:
+                anterior.terminado.wait()
+            with self._lock:
+                if trabajo.cancelado:
+                    trabajo.estado = CANCELADO
+                    return
+                trabajo.estado = EN_CURSO
+            trabajo.inicio = time.monotonic()
+            _local.trabajo = trabajo
+            funcion(*args)
+            trabajo.estado = CANCELADO if trabajo.cancelado else TERMINADO
+        except Exception as e:
+            trabajo.error = e
+            trabajo.estado = FALLIDO
+            print(f"Error en el trabajo '{trabajo.descripcion}': {e}")
+        finally:
+            _local.trabajo = None
+            trabajo.fin = time.monotonic()
+            with self._lock:
+                self._trabajos.remove(trabajo)
+            trabajo.terminado.set()
+
+    def activos(self):
+        """Trabajos en curso y en cola, en orden de llegada"""
+        with self._lock:
+            return list(self._trabajos)
+
+    def cancelar(self, numero):
+        with self._lock:
+            for trabajo in self._trabajos:
+                if trabajo.numero == numero:
+                    trabajo.cancelar()
+
+    def cancelar_tipos(self, *tipos):
+        """Cancela los trabajos en curso o en cola de los tipos dados"""
+        with self._lock:
+            for trabajo in self._trabajos:
+                if trabajo.tipo in tipos:
+                    trabajo.cancelar()
+
+    def esperar(self, tipo, trabajo=None, intervalo=0.1):
+        """Espera a que no quede ningún trabajo del tipo; devuelve False si el último no terminó bien
+
+        Sirve para encadenar trabajos de distinto tipo sin saltarse la
+        sustitución de unico. Con trabajo (normalmente el que espera) se deja
+        de esperar, devolviendo False, en cuanto se cancela.
+        """
+        ultimo = None
+        while True:
+            with self._lock:
+                pendientes = [t for t in self._trabajos if t.tipo == tipo]
+            if not pendientes:
+                return ultimo is None or ultimo.estado == TERMINADO
+            ultimo = pendientes[-1]
+            while not ultimo.terminado.wait(intervalo):
+                if trabajo is not None and trabajo.cancelado:
+                    return False
+
+    def cerrar(self, espera=ESPERA_CIERRE):
+        """Cancela todos los trabajos y espera como mucho espera segundos a que terminen
+
+        Devuelve True si terminaron todos; así quien cierra sabe si puede
+        liberar los recursos que usaban (cache, índice...).
+        """
+        trabajos = self.activos()
+        for trabajo in trabajos:
+            trabajo.cancelar()
+        limite = time.monotonic() + espera
+        todos = all(trabajo.terminado.wait(max(0, limite - time.monotonic())) for trabajo in trabajos)
+        self._ejecutor.shutdown(wait=False)
+        return todos
+
+
+def describir_progreso(trabajo):
+    """Textos de progreso y tiempo restante de un trabajo para mostrarlos en la interfaz"""
+    if trabajo.total:
+        progreso = f"{trabajo.completados}/{trabajo.total} ({100 * trabajo.completados / trabajo.total:.0f}%)"
+    else:
+        progreso = str(trabajo.completados) if trabajo.completados else ""
+    eta = trabajo.eta()
+    if eta is None:
+        restante = ""
+    elif eta >= 60:
+        restante = f"{int(eta // 60)} min {int(eta % 60)} s"
+    else:
+        restante = f"{eta:.0f} s"
+    return progreso, restante
+
+
+def filas_panel(gestor):
+    """(iid, valores) de cada trabajo activo para el panel de trabajos, con las columnas de COLUMNAS_PANEL"""
+    filas = []
+    for trabajo in gestor.activos():
+        progreso, restante = describir_progreso(trabajo)
+        estado = "Cancelando..." if trabajo.cancelado else trabajo.estado
+        filas.append((str(trabajo.numero), (trabajo.descripcion, estado, progreso, restante)))
+    return filas
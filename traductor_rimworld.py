@@ -1,15 +1,33 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
+import tkinter.font as tkfont
 import os
 import xml.etree.ElementTree as ET
-import threading
-from deep_translator import GoogleTranslator
 import re
 import json
-import time
 import requests
 import shutil
 import webbrowser
+from traductor.motor import HILOS_POR_DEFECTO, crear_motor, normalizar_texto
+from traductor.enrutador import crear_backends, servicios_configurados
+from traductor.limitador import obtener_limitador
+from traductor.idiomas import idioma_destino_carpeta
+from traductor.extraccion import guardar_traducciones_xml
+from traductor.escaneo import (escanear_idioma, describir_proyecto, actualizar_archivo_proyecto, listar_idiomas,
+                               archivos_idioma)
+from traductor.pipeline import traducir_textos
+from traductor.resiliencia import describir_estadisticas
+from traductor.placeholders import PATRON_PLACEHOLDER, extraer_placeholders
+from traductor.indice import abrir_indice, leer_por_bloques
+from traductor.modelo import ModeloTextos, filas_de_registros
+from traductor.tabla_virtual import TablaVirtual
+from traductor.busqueda import (IndiceBusqueda, buscar_en_proyecto, titulo_grupo, resumir_resultados,
+                                describir_error_busqueda)
+from traductor.cola_ui import ColaUI, en_hilo_principal
+from traductor.trabajos import GestorTrabajos, trabajo_actual, filas_panel, COLUMNAS_PANEL
+
+INTERVALO_PANEL_TRABAJOS_MS = 500
+RETARDO_BUSQUEDA_MS = 150  # Espera tras la última tecla antes de filtrar
 try:
     from PIL import Image, ImageTk
     PIL_AVAILABLE = True
@@ -32,6 +50,20 @@ class EditorTematico:
         self.archivo_actual = ""
         self.textos_actuales = []
         self.traducciones = {}
+        self.modelo_proyecto = None  # Resumen por archivo de la carpeta de idioma
+        self.indice_proyecto = None  # Índice persistente del mod abierto
+        self._filtro_programado = None
+        self._id_pendiente = None  # Fila a seleccionar cuando termine de cargarse el archivo
+        
+        # Los hilos de trabajo actualizan la interfaz solo a través de esta cola
+        self.cola_ui = ColaUI(self.ventana, self._aplicar_fila, self._mostrar_status,
+                              generacion_actual=lambda: self.modelo_textos.generacion)
+        self.gestor_trabajos = GestorTrabajos()
+        
+        # Variables para traducción
+        self.hilos_traduccion = HILOS_POR_DEFECTO
+        self.servicios = servicios_configurados()
+        self.motor_traduccion = self._crear_motor_traduccion()
         
         # Variables para edición
         self.celda_editando = None
@@ -82,6 +114,14 @@ class EditorTematico:
             'error': '#dc3545'
         }
     
+    def _crear_motor_traduccion(self):
+        """Motor con los servicios de config.json ('servicios'), repartiendo si hay varios; si no, Google"""
+        try:
+            return crear_motor(crear_backends(self.servicios), max_hilos=self.hilos_traduccion)
+        except Exception as e:
+            print(f"Servicios de traducción no válidos en la configuración: {e}")
+            return crear_motor(max_hilos=self.hilos_traduccion)
+
     def configurar_ventana(self):
         self.ventana.configure(bg=self.colores['fondo_principal'])
         self.ventana.grid_rowconfigure(1, weight=1)
@@ -124,7 +164,7 @@ class EditorTematico:
         )
         
         # Actualizar botones
-        botones = ['btn_cargar', 'btn_traducir', 'btn_corregir', 'btn_guardar', 'btn_crear_idioma', 'btn_recargar_idiomas', 'btn_editar_about']
+        botones = ['btn_cargar', 'btn_traducir', 'btn_corregir', 'btn_guardar', 'btn_crear_idioma', 'btn_recargar_idiomas', 'btn_editar_about', 'btn_buscar_mod', 'btn_trabajos']
         for btn_name in botones:
             if hasattr(self, btn_name):
                 btn = getattr(self, btn_name)
@@ -217,6 +257,18 @@ class EditorTematico:
                                         command=self.recargar_idiomas)
         self.btn_recargar_idiomas.grid(row=0, column=5, padx=(0, 15), pady=3)
         
+        # Búsqueda en todos los archivos e idiomas del mod
+        self.btn_buscar_mod = tk.Button(self.frame_superior, text="🔎 BUSCAR EN MOD", bg=self.colores['acento'], 
+                                  fg='white', font=('Segoe UI', 9, 'bold'), relief='flat', width=15,
+                                  command=self.buscar_en_mod)
+        self.btn_buscar_mod.grid(row=0, column=6, columnspan=2, padx=(0, 15), pady=3, sticky='w')
+        
+        # Panel de trabajos en segundo plano
+        self.btn_trabajos = tk.Button(self.frame_superior, text="⏳ TRABAJOS", bg=self.colores['gris_boton'], 
+                                fg='white', font=('Segoe UI', 9, 'bold'), relief='flat', width=12,
+                                command=self.mostrar_trabajos)
+        self.btn_trabajos.grid(row=0, column=8, padx=(0, 15), pady=3, sticky='w')
+        
         # Fila 2: Archivo con botón Cargar al lado
         tk.Label(self.frame_superior, text="📄 ARCHIVO:", bg=self.colores['fondo_secundario'], 
                 fg=self.colores['texto_principal'], font=('Segoe UI', 9, 'bold')).grid(row=1, column=0, padx=(0, 5), pady=3)
@@ -241,7 +293,7 @@ class EditorTematico:
                                     highlightcolor=self.colores['acento'],
                                     highlightbackground=self.colores['borde'])
         self.entry_buscar.grid(row=1, column=4, padx=(0, 15), pady=3)
-        self.entry_buscar.bind('<KeyRelease>', self.filtrar_textos)
+        self.entry_buscar.bind('<KeyRelease>', self._programar_filtro)
         
         # Botones de acción principales
         self.btn_traducir = tk.Button(self.frame_superior, text="🤖 TRADUCIR", bg='#9b59b6', 
@@ -291,12 +343,15 @@ class EditorTematico:
         
         self.actualizar_estilo_tabla()
         
-        # Crear Treeview mejorado
-        self.tree_textos = ttk.Treeview(frame_tabla, 
-                                      columns=('id', 'original', 'traducido', 'estado'), 
-                                      show='headings',
-                                      style="Tema.Treeview",
-                                      selectmode='extended')
+        # Crear Treeview mejorado; es virtual: solo se materializan las filas visibles del modelo
+        self.modelo_textos = ModeloTextos()
+        self.indice_busqueda = IndiceBusqueda(self.modelo_textos)
+        self.tree_textos = TablaVirtual(ttk.Treeview(frame_tabla, 
+                                                     columns=('id', 'original', 'traducido', 'estado'), 
+                                                     show='headings',
+                                                     style="Tema.Treeview",
+                                                     selectmode='extended'),
+                                        self.modelo_textos)
         
         # Configurar columnas
         self.tree_textos.heading('id', text='🔑 ID', anchor='w')
@@ -363,7 +418,7 @@ class EditorTematico:
             return
         
         self.celda_editando = (item, columna)
-        self.entry_edicion = tk.Entry(self.tree_textos, 
+        self.entry_edicion = tk.Entry(self.tree_textos.widget, 
                                     font=('Segoe UI', 10),
                                     bg='#ffff99' if self.tema_oscuro else '#ffffcc',
                                     fg='black',
@@ -502,11 +557,21 @@ class EditorTematico:
             self.entry_ruta.insert(0, carpeta)
             self.actualizar_status("🔄 Cargando idiomas...")
             
-            threading.Thread(target=self._cargar_idiomas, daemon=True).start()
+            self.gestor_trabajos.lanzar('idiomas', "Cargar idiomas del mod", self._cargar_idiomas)
 
     def actualizar_status(self, mensaje):
+        """Actualiza la barra de estado; desde un hilo de trabajo pasa por la cola de la interfaz"""
+        if en_hilo_principal():
+            self._mostrar_status(mensaje)
+        else:
+            self.cola_ui.estado(mensaje)
+
+    def _mostrar_status(self, mensaje):
         self.status_bar.config(text=mensaje)
 
+    def _aplicar_fila(self, item, valores, generacion=None):
+        self.tree_textos.item(item, values=valores, generacion=generacion)
+
     def recargar_idiomas(self):
         """Recarga la lista de idiomas manualmente"""
         if not self.carpeta_mod:
@@ -514,7 +579,7 @@ class EditorTematico:
             return
         
         self.actualizar_status("🔄 Recargando idiomas...")
-        threading.Thread(target=self._cargar_idiomas, daemon=True).start()
+        self.gestor_trabajos.lanzar('idiomas', "Cargar idiomas del mod", self._cargar_idiomas)
 
     def _cargar_idiomas(self):
         """Carga automáticamente los idiomas cuando se selecciona una carpeta"""
@@ -524,33 +589,17 @@ class EditorTematico:
                 self.actualizar_status("❌ No se encontró la carpeta 'Languages'")
                 return
             
-            idiomas_encontrados = []
             try:
-                for item in os.listdir(carpeta_languages):
-                    ruta_completa = os.path.join(carpeta_languages, item)
-                    if os.path.isdir(ruta_completa):
-                        if self._tiene_archivos_xml(ruta_completa):
-                            idiomas_encontrados.append(item)
+                idiomas_encontrados = listar_idiomas(carpeta_languages)
             except Exception as e:
                 self.actualizar_status(f"❌ Error leyendo carpeta: {str(e)}")
                 return
             
-            self.ventana.after(0, self._actualizar_combobox_idiomas, idiomas_encontrados)
+            self.cola_ui.llamar(self._actualizar_combobox_idiomas, idiomas_encontrados)
             
         except Exception as e:
             self.actualizar_status(f"❌ Error: {str(e)}")
 
-    def _tiene_archivos_xml(self, carpeta):
-        """Verifica si una carpeta tiene archivos XML (incluyendo subcarpetas)"""
-        try:
-            for root, dirs, files in os.walk(carpeta):
-                for file in files:
-                    if file.lower().endswith('.xml'):
-                        return True
-            return False
-        except:
-            return False
-
     def _actualizar_combobox_idiomas(self, idiomas_encontrados):
         """Actualiza el combobox de idiomas manteniendo la selección actual si existe"""
         idioma_actual = self.combo_idiomas.get()
@@ -570,7 +619,7 @@ class EditorTematico:
                 self.actualizar_status(f"✅ {len(idiomas_encontrados)} idiomas cargados")
                 
                 # Cargar archivos del nuevo idioma seleccionado
-                threading.Thread(target=self._cargar_archivos_idioma, daemon=True).start()
+                self._lanzar_carga_idioma()
         else:
             self.combo_idiomas['values'] = []
             self.combo_idiomas.set('')
@@ -581,7 +630,11 @@ class EditorTematico:
         self.idioma_cargado = self.combo_idiomas.get()
         if self.idioma_cargado:
             self.actualizar_status(f"📁 Cargando archivos de {self.idioma_cargado}...")
-            threading.Thread(target=self._cargar_archivos_idioma, daemon=True).start()
+            self._lanzar_carga_idioma()
+
+    def _lanzar_carga_idioma(self):
+        # Una carga nueva sustituye a la anterior, que se cancela antes de tocar self.archivos_xml
+        self.gestor_trabajos.lanzar('idioma', f"Cargar archivos de {self.idioma_cargado}", self._cargar_archivos_idioma)
 
     def _cargar_archivos_idioma(self):
         """Carga todos los archivos XML del idioma seleccionado (incluyendo subcarpetas)"""
@@ -590,32 +643,47 @@ class EditorTematico:
                 return
                 
             carpeta_idioma = os.path.join(self.carpeta_mod, "Languages", self.idioma_cargado)
+            self.motor_traduccion.configurar_idiomas(destino=idioma_destino_carpeta(self.idioma_cargado))
             
             if not os.path.exists(carpeta_idioma):
                 self.actualizar_status(f"❌ No existe la carpeta {self.idioma_cargado}")
                 return
             
-            self.archivos_xml = []
+            archivos_xml = archivos_idioma(carpeta_idioma)
             
-            for root, dirs, files in os.walk(carpeta_idioma):
-                for file in files:
-                    if file.lower().endswith('.xml'):
-                        ruta_completa = os.path.join(root, file)
-                        ruta_relativa = os.path.relpath(ruta_completa, carpeta_idioma)
-                        self.archivos_xml.append({
-                            'ruta_completa': ruta_completa,
-                            'ruta_relativa': ruta_relativa,
-                            'nombre_archivo': file
-                        })
+            trabajo = trabajo_actual()
+            if trabajo and trabajo.cancelado:
+                return
             
-            self.archivos_xml.sort(key=lambda x: x['ruta_relativa'].lower())
+            self.archivos_xml = archivos_xml
             archivos_display = [archivo['ruta_relativa'] for archivo in self.archivos_xml]
             
-            self.ventana.after(0, self._actualizar_combobox_archivos, archivos_display)
+            self.cola_ui.llamar(self._actualizar_combobox_archivos, archivos_display)
+            self._escanear_proyecto(carpeta_idioma)
             
         except Exception as e:
             self.actualizar_status(f"❌ Error cargando archivos: {str(e)}")
 
+    def _obtener_indice(self):
+        """Abre (o reutiliza) el índice persistente del mod actual"""
+        self.indice_proyecto = abrir_indice(self.carpeta_mod, self.indice_proyecto)
+        return self.indice_proyecto
+
+    def _escanear_proyecto(self, carpeta_idioma):
+        """Analiza todos los archivos de la carpeta de idioma en paralelo"""
+        trabajo = trabajo_actual()
+        
+        def al_progresar(completados, total):
+            if trabajo:
+                trabajo.progresar(completados, total)
+            self.actualizar_status(f"🔍 Analizando proyecto... {completados}/{total} archivos")
+        
+        modelo = escanear_idioma(self.archivos_xml, carpeta_idioma, al_progresar, self._obtener_indice())
+        if trabajo and trabajo.cancelado:
+            return
+        self.modelo_proyecto = modelo
+        self.actualizar_status("📊 " + describir_proyecto(modelo))
+
     def _actualizar_combobox_archivos(self, archivos_display):
         if archivos_display:
             self.combo_archivos['values'] = archivos_display
@@ -645,89 +713,55 @@ class EditorTematico:
             return
         
         self.actualizar_status(f"📖 Cargando {os.path.basename(self.archivo_actual)}...")
-        threading.Thread(target=self._cargar_textos_archivo, daemon=True).start()
+        self.gestor_trabajos.lanzar('archivo', f"Cargar {archivo_relativo}", self._cargar_textos_archivo)
 
     def _cargar_textos_archivo(self):
         try:
-            self.ventana.after(0, self._limpiar_tabla)
-            self.textos_actuales = self.extraer_textos_xml(self.archivo_actual)
+            # Lo que se estaba traduciendo o corrigiendo era del archivo anterior
+            self.gestor_trabajos.cancelar_tipos('traduccion', 'correccion')
+            self.cola_ui.llamar(self._limpiar_tabla)
+            self.textos_actuales = []
             self.traducciones = {}
-            self.ventana.after(0, self._llenar_tabla)
             
+            # La tabla se llena por bloques mientras el archivo se sigue leyendo (o sale del índice)
+            trabajo = trabajo_actual()
+            for bloque in leer_por_bloques(self.archivo_actual, self._obtener_indice()):
+                if trabajo and trabajo.cancelado:
+                    return
+                self.textos_actuales.extend(bloque)
+                self.cola_ui.llamar(self._agregar_filas, bloque)
+            
+            self.cola_ui.llamar(self._finalizar_carga)
+            
+        except ET.ParseError as e:
+            self.actualizar_status(f"⚠️ Error en XML: {str(e)}")
         except Exception as e:
             self.actualizar_status(f"❌ Error cargando archivo: {str(e)}")
 
     def _limpiar_tabla(self):
-        for item in self.tree_textos.get_children():
-            self.tree_textos.delete(item)
+        self.tree_textos.limpiar()
 
-    def _llenar_tabla(self):
-        for texto_info in self.textos_actuales:
-            self.tree_textos.insert('', 'end', 
-                                  values=(texto_info['id'], texto_info['texto'], "", "⏳ Pendiente"))
+    def _agregar_filas(self, textos):
+        self.modelo_textos.agregar(filas_de_registros(textos, "⏳ Pendiente"))
         
+        if textos:
+            self.actualizar_status(f"📖 {len(self.modelo_textos)} textos leídos...")
+
+    def _finalizar_carga(self):
         self.actualizar_estadisticas()
         self.actualizar_status(f"✅ {len(self.textos_actuales)} textos cargados")
         self.auto_ajustar_columnas()
+        
+        if self._id_pendiente:
+            self._seleccionar_id(self._id_pendiente)
+            self._id_pendiente = None
 
     def auto_ajustar_columnas(self):
-        """Auto-ajusta el ancho de las columnas basado en el contenido"""
-        for col in self.tree_textos['columns']:
-            max_width = 200
-            for item in self.tree_textos.get_children():
-                valor = self.tree_textos.set(item, col)
-                if valor:
-                    ancho_texto = len(str(valor)) * 8
-                    max_width = max(max_width, min(ancho_texto, 800))
-            
-            self.tree_textos.column(col, width=max_width)
-
-    def extraer_textos_xml(self, ruta_archivo):
-        textos = []
-        try:
-            tree = ET.parse(ruta_archivo)
-            root = tree.getroot()
-            
-            if root.tag == "LanguageData":
-                for elem in root:
-                    if elem.text and elem.text.strip():
-                        textos.append({
-                            'id': elem.tag,
-                            'texto': elem.text.strip(),
-                            'elemento': elem,
-                            'tipo': 'keyed'
-                        })
-            else:
-                def extraer_recursivo(elemento, ruta_padre=""):
-                    id_actual = f"{ruta_padre}/{elemento.tag}" if ruta_padre else elemento.tag
-                    
-                    if elemento.text and elemento.text.strip():
-                        textos.append({
-                            'id': id_actual,
-                            'texto': elemento.text.strip(),
-                            'elemento': elemento,
-                            'tipo': 'elemento'
-                        })
-                    
-                    for attr, valor in elemento.attrib.items():
-                        if valor and valor.strip() and len(valor.strip()) > 1:
-                            textos.append({
-                                'id': f"{id_actual}@{attr}",
-                                'texto': valor.strip(),
-                                'elemento': elemento,
-                                'atributo': attr,
-                                'tipo': 'atributo'
-                            })
-                    
-                    for hijo in elemento:
-                        extraer_recursivo(hijo, id_actual)
-                
-                extraer_recursivo(root)
-                
-        except Exception as e:
-            self.actualizar_status(f"⚠️ Error en XML: {str(e)}")
-        
-        return textos
+        """Auto-ajusta el ancho de las columnas midiendo el texto más largo que el modelo lleva al día"""
+        fuente = ttk.Style().lookup("Tema.Treeview", "font")
+        fuente = tkfont.Font(font=fuente) if fuente else tkfont.nametofont('TkDefaultFont')
+        for indice, col in enumerate(self.tree_textos['columns']):
+            self.tree_textos.column(col, width=self.modelo_textos.ancho_sugerido(indice, fuente.measure))
 
     def traducir_seleccion(self):
         seleccionados = self.tree_textos.selection()
@@ -735,142 +769,118 @@ class EditorTematico:
             messagebox.showwarning("Advertencia", "Selecciona textos para traducir")
             return
         
-        threading.Thread(target=self._traducir_seleccion, args=(seleccionados,), daemon=True).start()
+        self.gestor_trabajos.lanzar('traduccion', f"Traducir {len(seleccionados)} textos", self._traducir_seleccion,
+                                    seleccionados, self.modelo_textos.generacion, unico=False)
 
-    def _traducir_seleccion(self, seleccionados):
+    def _traducir_seleccion(self, seleccionados, generacion):
         """Traduce los textos seleccionados respetando placeholders"""
         try:
+            # Si entretanto se carga otro archivo, sus filas y traducciones ya no son estas
+            traducciones = self.traducciones
             total = len(seleccionados)
             exitosos = 0
+            fallidos = 0
+            velocidad = 0.0
+            elecciones = {}  # Alternativa elegida por texto, para no preguntar por cada duplicado
+            trabajo = trabajo_actual()
             self.actualizar_status(f"🤖 Traduciendo {total} textos...")
             
-            for i, item in enumerate(seleccionados):
+            # Preparar todos los textos antes de enviarlos al motor concurrente
+            pendientes = []
+            for item in seleccionados:
                 valores = self.tree_textos.item(item, 'values')
-                id_texto = valores[0]
                 texto_original = valores[1]
                 
                 if texto_original and len(texto_original.strip()) > 1:
-                    try:
-                        # Extraer placeholders antes de traducir
-                        placeholders = self._extraer_placeholders(texto_original)
-                        
-                        # Crear texto temporal para traducción (sin placeholders)
-                        texto_para_traducir = self._reemplazar_placeholders_para_traduccion(texto_original)
+                    pendientes.append((item, valores))
+            
+            def al_progresar(completados, total_lote, textos_por_segundo):
+                nonlocal velocidad
+                velocidad = textos_por_segundo
+                if trabajo:
+                    trabajo.progresar(completados, total_lote)
+                self.actualizar_status(f"🤖 Traduciendo... {completados}/{total_lote} ({textos_por_segundo:.1f} textos/s)")
+            
+            self.motor_traduccion.configurar_hilos(self.hilos_traduccion)
+            espera_inicial = self.motor_traduccion.limitador.tiempo_espera
+            peticiones_iniciales = self.motor_traduccion.limitador.peticiones
+            # Los placeholders se protegen y restauran en el núcleo
+            resultados = traducir_textos([valores[1] for _, valores in pendientes], self.motor_traduccion,
+                                         al_progresar=al_progresar)
+            
+            # Los resultados llegan en el mismo orden que la selección
+            for indice, texto_traducido, error, _ in resultados:
+                if trabajo and trabajo.cancelado or self.modelo_textos.generacion != generacion:
+                    # Al dejar de consumir resultados el motor deja de enviar peticiones
+                    resultados.close()
+                    break
+                item, valores = pendientes[indice]
+                id_texto = valores[0]
+                texto_original = valores[1]
+                
+                if error or not texto_traducido:
+                    if error:
+                        print(f"Error traduciendo {id_texto}: {str(error)}")
+                    fallidos += 1
+                    continue
+                
+                try:
+                    if texto_traducido:
+                        placeholders = extraer_placeholders(texto_original)
                         
-                        if len(texto_para_traducir) > 4900:
-                            texto_para_traducir = texto_para_traducir[:4900]
+                        # Mostrar ventana de alternativas si hay múltiples opciones
+                        alternativas = [texto_traducido]
                         
-                        texto_traducido_temp = GoogleTranslator(source='auto', target='es').translate(texto_para_traducir)
+                        # Solo generar alternativas si no es un texto con placeholders complejos
+                        if len(placeholders) == 0:
+                            patron_original = self._analizar_patron_texto(texto_original)
+                            alternativas_extra = self._generar_alternativas_respetuosas(texto_original, texto_traducido, patron_original, placeholders)
+                            alternativas.extend(alternativas_extra)
                         
-                        if texto_traducido_temp:
-                            # Restaurar placeholders en la traducción
-                            texto_traducido = self._restaurar_placeholders(texto_traducido_temp, placeholders)
-                            
-                            # Mostrar ventana de alternativas si hay múltiples opciones
-                            alternativas = [texto_traducido]
-                            
-                            # Solo generar alternativas si no es un texto con placeholders complejos
-                            if len(placeholders) == 0:
-                                patron_original = self._analizar_patron_texto(texto_original)
-                                alternativas_extra = self._generar_alternativas_respetuosas(texto_original, texto_traducido, patron_original, placeholders)
-                                alternativas.extend(alternativas_extra)
-                            
-                            # Eliminar duplicados
-                            alternativas = list(dict.fromkeys(alternativas))
-                            
-                            # Mostrar ventana de alternativas si hay más de una opción
-                            if len(alternativas) > 1:
-                                texto_final = self._mostrar_ventana_alternativas_mejorada(alternativas, id_texto, texto_original)
-                            else:
-                                texto_final = alternativas[0] if alternativas else texto_traducido
-                            
-                            if texto_final:
-                                nuevos_valores = (valores[0], valores[1], texto_final, "✅ Traducido")
-                                self.tree_textos.item(item, values=nuevos_valores)
-                                self.traducciones[id_texto] = texto_final
-                                exitosos += 1
+                        # Eliminar duplicados
+                        alternativas = list(dict.fromkeys(alternativas))
                         
-                        time.sleep(0.2)
+                        # Mostrar ventana de alternativas si hay más de una opción
+                        clave_eleccion = normalizar_texto(texto_original)
+                        if len(alternativas) > 1 and clave_eleccion in elecciones:
+                            texto_final = elecciones[clave_eleccion]
+                        elif len(alternativas) > 1:
+                            # El diálogo se abre en el hilo principal; este hilo espera la elección
+                            texto_final = self.cola_ui.ejecutar(self._mostrar_ventana_alternativas_mejorada,
+                                                                alternativas, id_texto, texto_original)
+                            elecciones[clave_eleccion] = texto_final
+                        else:
+                            texto_final = alternativas[0] if alternativas else texto_traducido
                         
-                    except Exception as e:
-                        print(f"Error traduciendo {id_texto}: {str(e)}")
-                        continue
-            
-            self.actualizar_estadisticas()
-            self.actualizar_status(f"✅ {exitosos}/{total} textos traducidos")
+                        if texto_final:
+                            nuevos_valores = (valores[0], valores[1], texto_final, "✅ Traducido")
+                            self.cola_ui.fila(item, nuevos_valores, generacion)
+                            traducciones[id_texto] = texto_final
+                            exitosos += 1
+                    
+                except Exception as e:
+                    print(f"Error traduciendo {id_texto}: {str(e)}")
+                    continue
+            
+            espera = self.motor_traduccion.limitador.tiempo_espera - espera_inicial
+            peticiones = self.motor_traduccion.limitador.peticiones - peticiones_iniciales
+            resumen = resultados.resumen
+            duplicados = resumen['textos'] - resumen['unicos']
+            porcentaje_duplicados = 100 * duplicados / resumen['textos'] if resumen['textos'] else 0
+            self.cola_ui.llamar(self.actualizar_estadisticas)
+            self.cola_ui.llamar(self.auto_ajustar_columnas)
+            cancelado = "⛔ Traducción cancelada: " if trabajo and trabajo.cancelado else "✅ "
+            mensaje_final = f"{cancelado}{exitosos}/{total} textos traducidos en {peticiones} peticiones, {duplicados} duplicados ({porcentaje_duplicados:.0f}%) ({velocidad:.1f} textos/s, {espera:.1f} s esperando cuota)"
+            incidencias = describir_estadisticas(resumen['resiliencia'])
+            if incidencias:
+                mensaje_final += f", {incidencias}"
+            if fallidos:
+                mensaje_final += f" ⚠️ {fallidos} sin traducir"
+            self.actualizar_status(mensaje_final)
             
         except Exception as e:
             self.actualizar_status(f"❌ Error en traducción: {str(e)}")
 
-    def _extraer_placeholders(self, texto):
-        """Extrae placeholders como {0}, {1}, {name}, etc."""
-        placeholders = re.findall(r'\{[^}]+\}', texto)
-        return list(set(placeholders))  # Eliminar duplicados
-
-    def _reemplazar_placeholders_para_traduccion(self, texto):
-        """Reemplaza placeholders con texto descriptivo para mejor traducción"""
-        replacements = {
-            r'\{0\}': ' PRIMER_ELEMENTO ',
-            r'\{1\}': ' SEGUNDO_ELEMENTO ',
-            r'\{2\}': ' TERCER_ELEMENTO ',
-            r'\{3\}': ' CUARTO_ELEMENTO ',
-            r'\{name\}': ' NOMBRE ',
-            r'\{pawn\}': ' PERSONAJE ',
-            r'\{item\}': ' OBJETO ',
-            r'\{number\}': ' NUMERO ',
-            r'\{amount\}': ' CANTIDAD ',
-            r'\{gender\}': ' GENERO ',
-            r'\{faction\}': ' FACCIÓN ',
-            r'\{location\}': ' UBICACIÓN ',
-            r'\{time\}': ' TIEMPO ',
-            r'\{skill\}': ' HABILIDAD ',
-            r'\{bodypart\}': ' PARTE_CUERPO ',
-            r'\{animal\}': ' ANIMAL ',
-            r'\{weapon\}': ' ARMA ',
-            r'\{material\}': ' MATERIAL ',
-        }
-        
-        texto_limpio = texto
-        for patron, reemplazo in replacements.items():
-            texto_limpio = re.sub(patron, reemplazo, texto_limpio)
-        
-        # Para placeholders genéricos como {xyz}
-        texto_limpio = re.sub(r'\{[^}]+\}', ' ELEMENTO ', texto_limpio)
-        
-        return texto_limpio
-
-    def _restaurar_placeholders(self, texto_traducido, placeholders):
-        """Restaura los placeholders originales en el texto traducido"""
-        texto_con_placeholders = texto_traducido
-        
-        # Reemplazar los marcadores temporales con los placeholders originales
-        replacements_inversos = {
-            'PRIMER_ELEMENTO': '{0}',
-            'SEGUNDO_ELEMENTO': '{1}', 
-            'TERCER_ELEMENTO': '{2}',
-            'CUARTO_ELEMENTO': '{3}',
-            'NOMBRE': '{name}',
-            'PERSONAJE': '{pawn}',
-            'OBJETO': '{item}',
-            'NUMERO': '{number}',
-            'CANTIDAD': '{amount}',
-            'GENERO': '{gender}',
-            'FACCIÓN': '{faction}',
-            'UBICACIÓN': '{location}',
-            'TIEMPO': '{time}',
-            'HABILIDAD': '{skill}',
-            'PARTE_CUERPO': '{bodypart}',
-            'ANIMAL': '{animal}',
-            'ARMA': '{weapon}',
-            'MATERIAL': '{material}',
-            'ELEMENTO': placeholders[0] if placeholders else '{}'
-        }
-        
-        for temporal, original in replacements_inversos.items():
-            texto_con_placeholders = texto_con_placeholders.replace(temporal, original)
-        
-        return texto_con_placeholders
-
     def _analizar_patron_texto(self, texto):
         """Analiza el patrón del texto original para mantener la estructura"""
         patron = {
@@ -951,7 +961,6 @@ class EditorTematico:
                         
                         if len(partes_traducidas) == len(patron['partes']):
                             alternativa_guiones = '_'.join(partes_traducidas)
-                            alternativa_guiones = self._restaurar_placeholders(alternativa_guiones, placeholders)
                             if alternativa_guiones not in alternativas:
                                 alternativas.append(alternativa_guiones)
                     
@@ -962,7 +971,6 @@ class EditorTematico:
                             alternativa_camel = palabras_camel[0].lower()
                             for palabra in palabras_camel[1:]:
                                 alternativa_camel += palabra.capitalize()
-                            alternativa_camel = self._restaurar_placeholders(alternativa_camel, placeholders)
                             if alternativa_camel not in alternativas:
                                 alternativas.append(alternativa_camel)
             
@@ -997,7 +1005,7 @@ class EditorTematico:
 
     def _remover_placeholders_para_formato(self, texto):
         """Remueve placeholders temporalmente para procesamiento de formato"""
-        return re.sub(r'\{[^}]+\}', ' ', texto)
+        return PATRON_PLACEHOLDER.sub(' ', texto)
 
     def _limpiar_y_preparar_palabras(self, texto):
         """Limpia y prepara las palabras para generar alternativas"""
@@ -1123,47 +1131,223 @@ class EditorTematico:
 
     # ========== BÚSQUEDA INTELIGENTE ==========
 
-    def filtrar_textos(self, event):
+    def _programar_filtro(self, event=None):
+        """Filtra cuando se deja de teclear, no en cada pulsación"""
+        if self._filtro_programado:
+            self.ventana.after_cancel(self._filtro_programado)
+        self._filtro_programado = self.ventana.after(RETARDO_BUSQUEDA_MS, self.filtrar_textos)
+
+    def filtrar_textos(self, event=None):
         """Búsqueda inteligente que busca en todas las columnas"""
+        self._filtro_programado = None
         texto_buscar = self.entry_buscar.get().lower().strip()
         
-        # Mostrar todos los items primero
-        for item in self.tree_textos.get_children():
-            self.tree_textos.detach(item)
-        
         if not texto_buscar:
             # Si no hay texto de búsqueda, mostrar todos
-            for item in self.tree_textos.get_children(''):
-                self.tree_textos.reattach(item, '', 'end')
+            self.modelo_textos.mostrar()
         else:
-            # Búsqueda inteligente
-            for item in self.tree_textos.get_children(''):
-                valores = self.tree_textos.item(item, 'values')
-                encontrado = False
-                
-                # Buscar en todas las columnas
-                for valor in valores:
-                    if valor and texto_buscar in str(valor).lower():
-                        encontrado = True
-                        break
-                
-                # Búsqueda parcial en palabras
-                if not encontrado:
-                    for valor in valores:
-                        if valor:
-                            palabras = str(valor).lower().split()
-                            for palabra in palabras:
-                                if texto_buscar in palabra:
-                                    encontrado = True
-                                    break
-                        if encontrado:
-                            break
-                
-                if encontrado:
-                    self.tree_textos.attach(item, '', 'end')
+            # El índice de búsqueda cubre todas las filas del modelo, no solo las mostradas
+            self.modelo_textos.mostrar(self.indice_busqueda.buscar(texto_buscar))
         
         self.actualizar_estadisticas()
 
+    # ========== TRABAJOS EN SEGUNDO PLANO ==========
+
+    def mostrar_trabajos(self):
+        """Panel con los trabajos en curso y en cola, su progreso y tiempo restante"""
+        dialogo = tk.Toplevel(self.ventana)
+        dialogo.title("⏳ Trabajos en segundo plano")
+        dialogo.geometry("700x300")
+        dialogo.transient(self.ventana)
+        dialogo.configure(bg=self.colores['fondo_principal'])
+        
+        frame_principal = tk.Frame(dialogo, bg=self.colores['fondo_principal'], padx=20, pady=20)
+        frame_principal.pack(fill='both', expand=True)
+        
+        lista = ttk.Treeview(frame_principal, columns=[columna for columna, _, _ in COLUMNAS_PANEL],
+                             show='headings', style="Tema.Treeview", height=8)
+        for columna, titulo, ancho in COLUMNAS_PANEL:
+            lista.heading(columna, text=titulo)
+            lista.column(columna, width=ancho)
+        lista.pack(fill='both', expand=True)
+        
+        def cancelar():
+            for item in lista.selection():
+                self.gestor_trabajos.cancelar(int(item))
+        
+        tk.Button(frame_principal, text="⛔ CANCELAR", bg='#e74c3c', fg='white',
+                 font=('Segoe UI', 9, 'bold'), relief='flat', width=12,
+                 command=cancelar).pack(anchor='e', pady=(10, 0))
+        
+        def refrescar():
+            if not dialogo.winfo_exists():
+                return
+            seleccion = lista.selection()
+            lista.delete(*lista.get_children())
+            for iid, valores in filas_panel(self.gestor_trabajos):
+                lista.insert('', 'end', iid=iid, values=valores)
+            lista.selection_set([item for item in seleccion if lista.exists(item)])
+            dialogo.after(INTERVALO_PANEL_TRABAJOS_MS, refrescar)
+        
+        refrescar()
+
+    # ========== BÚSQUEDA EN TODO EL MOD ==========
+
+    def buscar_en_mod(self):
+        """Busca un texto o una expresión regular en todos los idiomas y archivos del mod"""
+        if not self.carpeta_mod:
+            messagebox.showwarning("Advertencia", "Primero selecciona una carpeta de mod")
+            return
+        
+        dialogo = tk.Toplevel(self.ventana)
+        dialogo.title("🔎 Buscar en todo el mod")
+        dialogo.geometry("900x600")
+        dialogo.transient(self.ventana)
+        dialogo.configure(bg=self.colores['fondo_principal'])
+        
+        frame_principal = tk.Frame(dialogo, bg=self.colores['fondo_principal'], padx=20, pady=20)
+        frame_principal.pack(fill='both', expand=True)
+        
+        frame_consulta = tk.Frame(frame_principal, bg=self.colores['fondo_principal'])
+        frame_consulta.pack(fill='x', pady=(0, 10))
+        
+        entry_consulta = tk.Entry(frame_consulta, bg=self.colores['fondo_terciario'], 
+                                  fg=self.colores['texto_principal'], font=('Segoe UI', 10), 
+                                  relief='flat', highlightthickness=1,
+                                  highlightcolor=self.colores['acento'],
+                                  highlightbackground=self.colores['borde'],
+                                  insertbackground=self.colores['texto_principal'])
+        entry_consulta.pack(side='left', fill='x', expand=True, padx=(0, 10))
+        
+        var_regex = tk.BooleanVar(value=False)
+        tk.Checkbutton(frame_consulta, text="Expresión regular", variable=var_regex,
+                      bg=self.colores['fondo_principal'], fg=self.colores['texto_principal'],
+                      selectcolor=self.colores['fondo_terciario'],
+                      activebackground=self.colores['fondo_principal'],
+                      font=('Segoe UI', 9)).pack(side='left', padx=(0, 10))
+        
+        btn_buscar = tk.Button(frame_consulta, text="🔍 BUSCAR", bg=self.colores['acento'], 
+                               fg='white', font=('Segoe UI', 9, 'bold'), relief='flat', width=10)
+        btn_buscar.pack(side='left')
+        
+        # Resultados agrupados por archivo; cada hijo es una clave con su texto
+        frame_resultados = tk.Frame(frame_principal, bg=self.colores['fondo_principal'])
+        frame_resultados.pack(fill='both', expand=True)
+        
+        arbol = ttk.Treeview(frame_resultados, columns=('texto',), style="Tema.Treeview")
+        arbol.heading('#0', text='Archivo / Clave')
+        arbol.heading('texto', text='Texto')
+        arbol.column('#0', width=350)
+        arbol.column('texto', width=500)
+        scroll = ttk.Scrollbar(frame_resultados, orient='vertical', command=arbol.yview,
+                               style="Tema.Vertical.TScrollbar")
+        arbol.configure(yscrollcommand=scroll.set)
+        arbol.pack(side='left', fill='both', expand=True)
+        scroll.pack(side='right', fill='y')
+        
+        label_resumen = tk.Label(frame_principal, text="Escribe un texto y pulsa Enter; clic en un resultado para abrirlo",
+                                 bg=self.colores['fondo_principal'], fg=self.colores['texto_secundario'],
+                                 font=('Segoe UI', 9))
+        label_resumen.pack(anchor='w', pady=(10, 0))
+        
+        resultados = {}  # iid del árbol -> registro
+        
+        def mostrar_resultados(agrupados):
+            if not dialogo.winfo_exists():
+                return
+            arbol.delete(*arbol.get_children())
+            resultados.clear()
+            for registros in agrupados.values():
+                padre = arbol.insert('', 'end', text=titulo_grupo(registros), open=True)
+                for registro in registros:
+                    resultados[arbol.insert(padre, 'end', text=registro['id'], values=(registro['texto'],))] = registro
+            label_resumen.config(text="🔎 " + resumir_resultados(agrupados))
+        
+        def mostrar_error(mensaje):
+            if dialogo.winfo_exists():
+                label_resumen.config(text=mensaje)
+        
+        def buscar(event=None):
+            consulta = entry_consulta.get().strip()
+            indice = self._obtener_indice()
+            if not consulta or not indice:
+                return
+            regex = var_regex.get()
+            label_resumen.config(text="🔍 Buscando...")
+            
+            def al_progresar(completados, total):
+                self.actualizar_status(f"🔍 Indexando mod... {completados}/{total} archivos")
+            
+            def trabajo():
+                try:
+                    agrupados = buscar_en_proyecto(indice, os.path.join(self.carpeta_mod, "Languages"),
+                                                   consulta, regex, al_progresar)
+                    self.cola_ui.llamar(mostrar_resultados, agrupados)
+                except Exception as e:
+                    self.cola_ui.llamar(mostrar_error, "⚠️ " + describir_error_busqueda(e))
+            
+            self.gestor_trabajos.lanzar('busqueda', f"Buscar \"{consulta}\" en el mod", trabajo)
+        
+        def abrir(event=None):
+            seleccion = arbol.selection()
+            if seleccion and seleccion[0] in resultados:
+                registro = resultados[seleccion[0]]
+                self.abrir_registro(registro['ruta'], registro['id'])
+        
+        btn_buscar.configure(command=buscar)
+        entry_consulta.bind('<Return>', buscar)
+        arbol.bind('<ButtonRelease-1>', abrir)
+        arbol.bind('<Return>', abrir)
+        entry_consulta.focus()
+
+    def abrir_registro(self, ruta, id_texto):
+        """Carga el archivo de un resultado, cambiando de idioma si hace falta, y selecciona su fila"""
+        if self.archivo_actual and \
+                os.path.normcase(os.path.abspath(ruta)) == os.path.normcase(os.path.abspath(self.archivo_actual)):
+            self._seleccionar_id(id_texto)
+            return
+        
+        idioma, _, ruta_relativa = os.path.relpath(ruta, os.path.join(self.carpeta_mod, "Languages")).partition(os.sep)
+        self._id_pendiente = id_texto
+        
+        # El estado de la ventana solo se cambia en el hilo principal
+        def elegir_idioma():
+            if idioma == self.idioma_cargado:
+                return False
+            self.idioma_cargado = idioma
+            self.combo_idiomas.set(idioma)
+            return True
+        
+        def elegir_archivo():
+            self.archivo_actual = ruta
+            self.combo_archivos.set(ruta_relativa)
+        
+        def cargar():
+            if self.cola_ui.ejecutar(elegir_idioma):
+                self._lanzar_carga_idioma()
+            # La carga del idioma va con su propia clave, así sustituye o es sustituida por la del
+            # combo; el archivo se abre cuando termine la última
+            if not self.gestor_trabajos.esperar('idioma', trabajo_actual()):
+                return
+            self.cola_ui.ejecutar(elegir_archivo)
+            self.actualizar_status(f"📖 Cargando {os.path.basename(ruta)}...")
+            self._cargar_textos_archivo()
+        
+        self.gestor_trabajos.lanzar('archivo', f"Abrir {ruta_relativa}", cargar)
+
+    def _seleccionar_id(self, id_texto):
+        """Selecciona y muestra la fila con ese id en el archivo cargado"""
+        for indice, fila in enumerate(self.modelo_textos.filas):
+            if fila[0] == id_texto:
+                if self.modelo_textos.posicion(indice) is None:
+                    # El filtro actual ocultaba la fila
+                    self.entry_buscar.delete(0, tk.END)
+                    self.modelo_textos.mostrar()
+                self.tree_textos.selection_set(str(indice))
+                self.tree_textos.ver(indice)
+                self.actualizar_estadisticas()
+                return
+
     # ========== CREAR NUEVOS IDIOMAS MEJORADO ==========
 
     def crear_nuevo_idioma(self):
@@ -1339,12 +1523,10 @@ class EditorTematico:
                 if not respuesta:
                     return
             
-            # Crear el nuevo idioma en un hilo separado
-            threading.Thread(
-                target=self._crear_estructura_idioma,
-                args=(ruta_nuevo_idioma, idioma_base, nombre_carpeta),
-                daemon=True
-            ).start()
+            # Crear el nuevo idioma en segundo plano
+            self.gestor_trabajos.lanzar('crear_idioma', f"Crear idioma {nombre_carpeta}",
+                                        self._crear_estructura_idioma,
+                                        ruta_nuevo_idioma, idioma_base, nombre_carpeta, unico=False)
             
             dialogo.destroy()
         
@@ -1410,11 +1592,11 @@ class EditorTematico:
             copiar_estructura_recursiva(ruta_base, ruta_nuevo)
             
             # Actualizar interfaz
-            self.ventana.after(0, self._actualizar_interfaz_despues_crear, 
+            self.cola_ui.llamar(self._actualizar_interfaz_despues_crear, 
                              nombre_idioma, archivos_creados, carpetas_creadas)
             
         except Exception as e:
-            self.ventana.after(0, messagebox.showerror, "Error", 
+            self.cola_ui.llamar(messagebox.showerror, "Error", 
                              f"No se pudo crear el idioma: {str(e)}")
 
     def _actualizar_interfaz_despues_crear(self, nombre_idioma, archivos_creados, carpetas_creadas):
@@ -1430,7 +1612,8 @@ class EditorTematico:
         # Recargar la lista de idiomas y seleccionar automáticamente el nuevo idioma
         def seleccionar_nuevo_idioma():
             # Recargar idiomas
-            threading.Thread(target=self._cargar_y_seleccionar_idioma, args=(nombre_idioma,), daemon=True).start()
+            self.gestor_trabajos.lanzar('idiomas', "Cargar idiomas del mod", self._cargar_y_seleccionar_idioma,
+                                        nombre_idioma)
         
         seleccionar_nuevo_idioma()
 
@@ -1442,14 +1625,10 @@ class EditorTematico:
                 return
             
             # Cargar lista actualizada de idiomas
-            idiomas_encontrados = []
-            for item in os.listdir(carpeta_languages):
-                ruta_completa = os.path.join(carpeta_languages, item)
-                if os.path.isdir(ruta_completa) and self._tiene_archivos_xml(ruta_completa):
-                    idiomas_encontrados.append(item)
+            idiomas_encontrados = listar_idiomas(carpeta_languages)
             
             # Actualizar combobox en el hilo principal
-            self.ventana.after(0, self._seleccionar_nuevo_idioma_en_interfaz, idiomas_encontrados, nombre_idioma)
+            self.cola_ui.llamar(self._seleccionar_nuevo_idioma_en_interfaz, idiomas_encontrados, nombre_idioma)
             
         except Exception as e:
             print(f"Error cargando nuevo idioma: {e}")
@@ -1466,7 +1645,7 @@ class EditorTematico:
                 self.actualizar_status(f"🔄 Cargando archivos de {nombre_idioma}...")
                 
                 # Cargar archivos del nuevo idioma
-                threading.Thread(target=self._cargar_archivos_idioma, daemon=True).start()
+                self._lanzar_carga_idioma()
             else:
                 # Si no se encuentra, seleccionar el primero
                 self.combo_idiomas.set(idiomas_encontrados[0])
@@ -2103,16 +2282,36 @@ class EditorTematico:
             messagebox.showwarning("Advertencia", "No hay texto para traducir")
             return
         
-        try:
-            texto_traducido = GoogleTranslator(source='auto', target='es').translate(texto_actual)
-            if texto_traducido:
-                text_widget.delete('1.0', tk.END)
-                text_widget.insert('1.0', texto_traducido)
-                messagebox.showinfo("Éxito", "Descripción traducida")
+        def aplicar(texto_traducido):
+            text_widget.delete('1.0', tk.END)
+            text_widget.insert('1.0', texto_traducido)
+        
+        self._traducir_en_segundo_plano(texto_actual, aplicar, "Descripción traducida",
+                                        "No se pudo traducir la descripción")
+
+    def _traducir_en_segundo_plano(self, texto, aplicar, exito=None, fallo="No se pudo traducir el texto"):
+        """Traduce un texto suelto en un trabajo y aplica el resultado en el hilo principal
+
+        Con reintentos y esperas de cuota una traducción puede tardar decenas
+        de segundos; así la ventana sigue respondiendo mientras tanto.
+        """
+        def terminar(texto_traducido, error):
+            if error is not None:
+                messagebox.showerror("Error", f"Error en traducción: {str(error)}")
+            elif not texto_traducido:
+                messagebox.showerror("Error", fallo)
             else:
-                messagebox.showerror("Error", "No se pudo traducir la descripción")
-        except Exception as e:
-            messagebox.showerror("Error", f"Error en traducción: {str(e)}")
+                aplicar(texto_traducido)
+                if exito:
+                    messagebox.showinfo("Éxito", exito)
+        
+        def traducir():
+            try:
+                self.cola_ui.llamar(terminar, self.motor_traduccion.traducir_texto(texto), None)
+            except Exception as e:
+                self.cola_ui.llamar(terminar, None, e)
+        
+        self.gestor_trabajos.lanzar('texto', "Traducir un texto", traducir, unico=False)
 
     def mostrar_workshop(self, workshop_id):
         """Muestra la página del workshop en una ventana integrada"""
@@ -2181,16 +2380,27 @@ class EditorTematico:
             messagebox.showwarning("Advertencia", "Selecciona textos para corregir")
             return
         
-        threading.Thread(target=self._corregir_ortografia, args=(seleccionados,), daemon=True).start()
+        self.gestor_trabajos.lanzar('correccion', f"Corregir {len(seleccionados)} textos", self._corregir_ortografia,
+                                    seleccionados, self.modelo_textos.generacion, unico=False)
 
-    def _corregir_ortografia(self, seleccionados):
+    def _corregir_ortografia(self, seleccionados, generacion):
         """Corrige ortografía usando servicio web gratuito"""
         try:
+            traducciones = self.traducciones
             total = len(seleccionados)
             corregidos = 0
+            limitador = obtener_limitador('languagetool')
+            espera_inicial = limitador.tiempo_espera
+            trabajo = trabajo_actual()
             self.actualizar_status(f"✏️ Corrigiendo ortografía en {total} textos...")
             
             for i, item in enumerate(seleccionados):
+                if self.modelo_textos.generacion != generacion:
+                    break
+                if trabajo:
+                    if trabajo.cancelado:
+                        break
+                    trabajo.progresar(i, total)
                 valores = list(self.tree_textos.item(item, 'values'))
                 texto_traducido = valores[2] if len(valores) > 2 else ""
                 
@@ -2199,22 +2409,22 @@ class EditorTematico:
                     if texto_corregido and texto_corregido != texto_traducido:
                         valores[2] = texto_corregido
                         valores[3] = "✅ Corregido"
-                        self.tree_textos.item(item, values=valores)
+                        self.cola_ui.fila(item, tuple(valores), generacion)
                         
                         id_texto = valores[0]
-                        self.traducciones[id_texto] = texto_corregido
+                        traducciones[id_texto] = texto_corregido
                         corregidos += 1
                 
                 # Actualizar progreso
                 if i % 5 == 0:
-                    self.ventana.after(0, self.actualizar_status, f"✏️ Corrigiendo... {i+1}/{total}")
-                    time.sleep(0.5)
+                    self.actualizar_status(f"✏️ Corrigiendo... {i+1}/{total}")
             
-            self.ventana.after(0, self.actualizar_estadisticas)
-            self.ventana.after(0, self.actualizar_status, f"✅ {corregidos} textos corregidos")
+            espera = limitador.tiempo_espera - espera_inicial
+            self.cola_ui.llamar(self.actualizar_estadisticas)
+            self.actualizar_status(f"✅ {corregidos} textos corregidos ({espera:.1f} s esperando cuota)")
             
         except Exception as e:
-            self.ventana.after(0, self.actualizar_status, f"❌ Error en corrección: {str(e)}")
+            self.actualizar_status(f"❌ Error en corrección: {str(e)}")
 
     def _corregir_texto_online(self, texto):
         """Usa servicio web gratuito para corrección ortográfica"""
@@ -2241,6 +2451,8 @@ class EditorTematico:
                 'enabledOnly': 'false'
             }
             
+            # Respetar la cuota de la API pública
+            obtener_limitador('languagetool').adquirir()
             response = requests.post(url, data=data, timeout=10)
             if response.status_code == 200:
                 result = response.json()
@@ -2300,30 +2512,10 @@ class EditorTematico:
             return
         
         try:
-            tree = ET.parse(self.archivo_actual)
-            root = tree.getroot()
-            
-            textos_guardados = 0
-            
-            for texto_info in self.textos_actuales:
-                id_texto = texto_info['id']
-                if id_texto in self.traducciones and self.traducciones[id_texto]:
-                    texto_traducido = self.traducciones[id_texto]
-                    
-                    if texto_info['tipo'] == 'keyed':
-                        for elem in root:
-                            if elem.tag == texto_info['id']:
-                                elem.text = texto_traducido
-                                textos_guardados += 1
-                                break
-                    elif texto_info['tipo'] == 'elemento':
-                        texto_info['elemento'].text = texto_traducido
-                        textos_guardados += 1
-                    elif texto_info['tipo'] == 'atributo':
-                        texto_info['elemento'].set(texto_info['atributo'], texto_traducido)
-                        textos_guardados += 1
-            
-            tree.write(self.archivo_actual, encoding='utf-8', xml_declaration=True)
+            textos_guardados = guardar_traducciones_xml(self.archivo_actual, self.traducciones)
+            if self.modelo_proyecto:
+                actualizar_archivo_proyecto(self.modelo_proyecto, self.archivo_actual, self._obtener_indice())
+                self.actualizar_estadisticas()
             self.actualizar_status(f"💾 {textos_guardados} traducciones guardadas")
             messagebox.showinfo("Éxito", f"Guardadas {textos_guardados} traducciones")
             
@@ -2331,22 +2523,29 @@ class EditorTematico:
             self.actualizar_status(f"❌ Error guardando: {str(e)}")
             messagebox.showerror("Error", f"No se pudo guardar: {str(e)}")
 
+    def cerrar_aplicacion(self):
+        """Cancela los trabajos en curso y cierra la ventana"""
+        # Los trabajos que esperan un diálogo no lo tendrán: terminan en lugar de bloquear la espera
+        self.cola_ui.cerrar()
+        if not self.gestor_trabajos.cerrar():
+            print("Algunos trabajos no terminaron a tiempo; se cierra igualmente")
+        if self.indice_proyecto:
+            self.indice_proyecto.cerrar()
+        self.motor_traduccion.cerrar()
+        self.ventana.destroy()
+
     def actualizar_estadisticas(self, event=None):
-        """Actualiza las estadísticas sin causar errores"""
+        """Muestra los contadores que el modelo mantiene al día, sin recorrer las filas"""
         try:
-            total = len(self.tree_textos.get_children())
-            traducidos = 0
-            corregidos = 0
-            
-            for item in self.tree_textos.get_children():
-                valores = self.tree_textos.item(item, 'values')
-                if len(valores) > 2 and valores[2] and valores[2].strip():
-                    traducidos += 1
-                if len(valores) > 3 and "Corregido" in str(valores[3]):
-                    corregidos += 1
+            contadores = self.modelo_textos.contadores
+            texto_estadisticas = (f"📊 Total: {contadores['total']} | Traducidos: {contadores['traducidos']} | "
+                                  f"Corregidos: {contadores['corregidos']}")
+            if self.modelo_proyecto:
+                totales = self.modelo_proyecto['totales']
+                texto_estadisticas += (f" | 📁 Proyecto: {totales['traducidos']}/{totales['claves']} traducidos "
+                                       f"en {totales['archivos']} archivos")
             
             # Actualizar el texto de forma segura
-            texto_estadisticas = f"📊 Total: {total} | Traducidos: {traducidos} | Corregidos: {corregidos}"
             if hasattr(self, 'label_estadisticas'):
                 self.label_estadisticas.config(text=texto_estadisticas)
                 
@@ -2355,4 +2554,5 @@ class EditorTematico:
 
 if __name__ == "__main__":
     app = EditorTematico()
+    app.ventana.protocol("WM_DELETE_WINDOW", app.cerrar_aplicacion)
     app.ventana.mainloop()
\ No newline at end of file